@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+scripts/bench_findscu_parser.py
+
+findscu -v -S 출력 파서 성능 측정 스크립트
+
+- 지정한 건수(기본 100,000건)의 가짜 Find Response 덤프를 생성
+- 예전 방식(정규식 블록 분할 + dict)과 nmdose.tasks.findscu_parser 의 단일 패스 파서를 비교
+- 처리량(responses/s, MB/s)과 결과 보관 메모리(tracemalloc)를 출력
+
+사용법:
+    python scripts/bench_findscu_parser.py [--responses N] [--repeat R]
+"""
+
+# ───── 표준 라이브러리 ─────
+import argparse
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# src 폴더를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(project_root))
+
+from nmdose.tasks.findscu_parser import parse_findscu_output
+
+
+STUDY_LINES = [
+    "I: (0008,0005) CS [ISO_IR 100]                             #  10, 1 SpecificCharacterSet",
+    "I: (0008,0020) DA [2024{m:02d}{d:02d}]                               #   8, 1 StudyDate",
+    "I: (0008,0030) TM [0930{s:02d}]                                 #   6, 1 StudyTime",
+    "I: (0008,0050) SH [A{i:09d}]                              #  10, 1 AccessionNumber",
+    "I: (0008,0052) CS [STUDY]                                  #   6, 1 QueryRetrieveLevel",
+    "I: (0008,0061) CS [PT\\CT]                                  #   6, 2 ModalitiesInStudy",
+    "I: (0008,1030) LO [PET-CT WHOLE BODY]                      #  18, 1 StudyDescription",
+    "I: (0010,0010) PN [HONG^GILDONG{i}]                       #  20, 1 PatientName",
+    "I: (0010,0020) LO [P{i:08d}]                               #  10, 1 PatientID",
+    "I: (0020,000d) UI [1.2.410.200010.{i}]                    #  26, 1 StudyInstanceUID",
+    "I: (0020,1206) IS [3]                                      #   2, 1 NumberOfStudyRelatedSeries",
+    "I: (0020,1208) IS [{n}]                                    #   4, 1 NumberOfStudyRelatedInstances",
+]
+
+
+def make_dump(responses: int) -> str:
+    """responses 건의 Find Response 블록을 가진 findscu 출력 생성"""
+    out = [
+        "I: Requesting Association",
+        "I: Association Accepted (Max Send PDV: 16372)",
+        "I: Sending Find Request (MsgID 1)",
+    ]
+    for i in range(1, responses + 1):
+        out.append("I: ---------------------------")
+        out.append(f"I: Find Response: {i} (Pending)")
+        out.append("I: ")
+        out.append("I: # Dicom-Data-Set")
+        out.append("I: # Used TransferSyntax: Little Endian Explicit")
+        for line in STUDY_LINES:
+            out.append(line.format(i=i, m=i % 12 + 1, d=i % 28 + 1, s=i % 60, n=100 + i % 900))
+    out.append("I: Received Final Find Response (Success)")
+    out.append("I: Releasing Association")
+    return "\n".join(out) + "\n"
+
+
+# 비교 기준: 예전 scripts/findscu_preview.py 의 블록 분할 정규식 파서
+_LEGACY_SPLIT = re.compile(r"I: *-+[\r\n]+I: Find Response:.*")
+_LEGACY_TAG = re.compile(r'\(([0-9A-Fa-f]{4},[0-9A-Fa-f]{4})\)\s+\w{2}\s+\[([^\]]*)\]')
+
+
+def legacy_parse(raw_output: str) -> list[dict[str, str]]:
+    parsed = []
+    for block in _LEGACY_SPLIT.split(raw_output)[1:]:
+        attrs: dict[str, str] = {}
+        for tag, val in _LEGACY_TAG.findall(block):
+            attrs[tag.upper()] = val.strip()
+        parsed.append(attrs)
+    return parsed
+
+
+def bench(name: str, fn, dump: str, repeat: int) -> list:
+    best = float("inf")
+    result = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(dump)
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    kept = fn(dump)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+
+    mb = len(dump.encode("utf-8")) / 1e6
+    print(f"{name:<12} {best:8.3f}s  {len(result) / best:12,.0f} responses/s  "
+          f"{mb / best:8.1f} MB/s  결과 보관 {retained / 1e6:8.1f} MB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="findscu 출력 파서 벤치마크")
+    parser.add_argument("--responses", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    dump = make_dump(args.responses)
+    print(f"▶ 입력: {args.responses:,} responses, {len(dump) / 1e6:.1f} MB")
+
+    legacy = bench("legacy", legacy_parse, dump, args.repeat)
+    current = bench("single-pass", parse_findscu_output, dump, args.repeat)
+
+    assert len(legacy) == len(current) == args.responses
+    assert all(dict(c) == l for c, l in zip(current, legacy)), "파서 결과가 서로 다릅니다"
+    print("✔ 두 파서의 결과가 일치합니다")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""
+scripts/dose_extract.py
+
+dosePACS 로 받은 선량 SR(RDSR) 파일에서 DLP/CTDIvol 등을 추출해 dosepacs.dose_statistics 에 기록하는 배치
+
+- retrieve_to_dose.received_dir 아래 파일을 워커 프로세스 extract_workers 개로 나눠 읽습니다.
+- 이미 추출된 SOPInstanceUID 는 건너뛰므로 매일 다시 실행해도 새로 받은 객체만 추가됩니다.
+- --force 는 기존 행도 다시 추출해 갱신합니다 (추출 규칙/EXTRACTED_BY 버전을 올렸을 때).
+
+사용법:
+    python scripts/dose_extract.py [--dir DIR] [--workers N] [--force]
+"""
+
+# ───── 표준 라이브러리 ─────
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# src 폴더를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(project_root))
+
+from nmdose.config_loader.retrieve_options_loader import get_retrieve_config, resolve_project_path
+from nmdose.tasks.dose_extract import EXTRACTED_BY, extract_dose_statistics
+from nmdose.utils.db_pool import close_all_pools, db_connection
+
+
+def main():
+    cfg = get_retrieve_config().retrieve_to_dose
+    parser = argparse.ArgumentParser(description="선량 SR → dosepacs.dose_statistics 추출")
+    parser.add_argument("--dir", default=cfg.received_dir, help="수신 파일 디렉터리 (기본: received_dir 설정)")
+    parser.add_argument("--workers", type=int, default=cfg.extract_workers, help="워커 프로세스 수 (0 = CPU 수)")
+    parser.add_argument("--extracted-by", default=EXTRACTED_BY, help="행에 남길 추출기 이름/버전")
+    parser.add_argument("--force", action="store_true", help="이미 추출된 객체도 다시 추출해 갱신")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s ▶ %(message)s")
+
+    root = resolve_project_path(args.dir)
+    try:
+        with db_connection() as conn:
+            counts = extract_dose_statistics(conn, root, workers=args.workers,
+                                             batch_size=cfg.extract_batch_size,
+                                             extracted_by=args.extracted_by, force=args.force)
+    finally:
+        close_all_pools()
+    print(f"▶ 선량 SR 추출: 기록 {counts['written']}건, 이미 추출 {counts['skipped']}건, "
+          f"선량 SR 아님 {counts['ignored']}건, 읽기 실패 {counts['error']}건 ({root})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+scripts/dose_retrieve.py
+
+선량 Series 만 dosePACS 로 가져오는 배치 (SERIES 수준 C-FIND + 선택적 C-MOVE)
+
+- 날짜 범위의 Study 를 모달리티별 STUDY 수준 C-FIND 로 찾은 뒤,
+  Study 마다 retrieve_to_dose 조건(Dose SR, Dose Report 등)에 맞는 Series 만 C-MOVE 합니다.
+- pet_enable_single_axial_first_image 가 켜져 있으면 axial PT Series 마다 첫 영상 한 장만 C-MOVE 합니다.
+- calling/목적지는 dosePACS, 조회 대상은 RUNNING_MODE(.env 포함)가 "1" 이면 simulation PACS, 아니면 clinical PACS
+- STUDY 수준 C-FIND 는 findscus, C-MOVE 는 movescus 에 find_move.py 와 같은 형식으로 기록합니다 (AuditWriter).
+  movescus 에는 Study UID 와 옮긴 SeriesInstanceUID 를 함께 남기며, calling AET 가 dosePACS 이므로
+  research AET 로 거르는 RetrievedIndex 는 선량 수신만 한 Study 를 이미 받은 것으로 보지 않습니다.
+
+사용법:
+    python scripts/dose_retrieve.py --date-range 20250101-20250107 [--modality CT PT]
+    python scripts/dose_retrieve.py --study-uid 1.2.3 [--study-uid 1.2.4]
+"""
+
+# ───── 표준 라이브러리 ─────
+import argparse
+from datetime import datetime
+import logging
+import sys
+from pathlib import Path
+
+# src 폴더를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(project_root))
+
+from nmdose.config_loader.dicom_nodes_loader import get_nodes_config
+from nmdose.config_loader.retrieve_options_loader import get_retrieve_config
+from nmdose.dimse import get_dimse_backend
+from nmdose.env.init import init_app_environment
+from nmdose.tasks.dose_retrieve import retrieve_for_dose
+from nmdose.tasks.move_worker import make_move_event
+from nmdose.utils.audit_writer import AuditWriter
+from nmdose.utils.date_utils import parse_end_date, parse_start_date
+from nmdose.utils.db_pool import close_all_pools, db_connection
+from nmdose.utils.text_utils import sanitize_event
+from nmdose.utils.transcript_index import summarize_transcript
+
+
+def find_study_uids(backend, audit: AuditWriter, calling, called,
+                    date_range: str, modality: str) -> tuple[int, list[str]]:
+    """
+    STUDY 수준 스트리밍 C-FIND 로 StudyInstanceUID 를 모으고(중복 제거) findscus 에 기록합니다.
+    반환: (find_id, [StudyInstanceUID, ...])
+    """
+    ts_start = datetime.now()
+    event_find = {
+        "ts": ts_start,
+        "calling_aet": calling.aet,
+        "called_aet": called.aet,
+        "peer_host": called.ip,
+        "peer_port": called.port,
+        "query_retrieve_level": "STUDY",
+        "start_date": parse_start_date(date_range),
+        "end_date":   parse_end_date(date_range),
+        "modalities_in_study": modality,
+        "result_count": 0,
+        "duration_ms": 0,
+        "status": "RUNNING",
+        "error_detail": None,
+    }
+    find_id = audit.begin_find(sanitize_event(event_find))
+
+    uids: dict[str, None] = {}   # 순서를 유지하는 중복 제거
+    stream = backend.iter_find(calling, called, {
+        "QueryRetrieveLevel": "STUDY",
+        "StudyDate": date_range,
+        "ModalitiesInStudy": modality,
+        "StudyInstanceUID": "",
+    })
+    for attrs in stream:
+        uid = (attrs.get("0020,000D") or "").replace("\x00", "")
+        if uid:
+            uids.setdefault(uid)
+
+    status = stream.status
+    event_find.update({
+        "result_count": stream.count,
+        "duration_ms": int((datetime.now() - ts_start).total_seconds() * 1000),
+        "status": status,
+        "error_detail": None if status == "SUCCESS" else summarize_transcript("\n".join(stream.tail)),
+    })
+    audit.finish_find(find_id, sanitize_event(event_find))
+    print(f"  C-FIND {modality} {date_range}: {stream.count}건 → {status}")
+    return find_id, list(uids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="선량 Series 선택 수신 (dosePACS)")
+    parser.add_argument("--date-range", help="조회할 StudyDate 범위 (YYYYMMDD-YYYYMMDD)")
+    parser.add_argument("--modality", nargs="+", default=["CT", "PT"], help="조회할 ModalitiesInStudy")
+    parser.add_argument("--study-uid", action="append", default=[], help="C-FIND 없이 처리할 Study (반복 가능)")
+    args = parser.parse_args()
+    if not args.date_range and not args.study_uid:
+        parser.error("--date-range 또는 --study-uid 중 하나는 필요합니다.")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s ▶ %(message)s")
+
+    called = init_app_environment().source_pacs()
+    calling = get_nodes_config().dose
+    cfg = get_retrieve_config().retrieve_to_dose
+    backend = get_dimse_backend()
+
+    moved = failed = 0
+    try:
+        with db_connection() as conn, AuditWriter(conn) as audit:
+            targets = [(uid, "", None) for uid in args.study_uid]
+            for modality in args.modality if args.date_range else []:
+                find_id, uids = find_study_uids(backend, audit, calling, called, args.date_range, modality)
+                targets.extend((uid, modality, find_id) for uid in uids)
+            for study_uid, modality, find_id in targets:
+                for series, outcome in retrieve_for_dose(backend, calling, called, study_uid, cfg, modality):
+                    audit.add_move(make_move_event(outcome, calling, called, find_id,
+                                                   study_uid=series.study_uid, series_uid=series.series_uid))
+                    if outcome.result.status == "SUCCESS":
+                        moved += 1
+                    else:
+                        failed += 1
+    finally:
+        backend.close()
+        close_all_pools()
+    print(f"▶ 선량 Series/PET 첫 영상 C-MOVE: 성공 {moved}건, 실패 {failed}건 → {calling.aet}")
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,19 @@
 run_findscu.py
 
 - findscu 실행 결과와 PDU 덤프를 콘솔에 출력
-- audit_events 테이블에 C-FIND/C-MOVE 이벤트를 기록
-- PDU 덤프(stdout, stderr)는 modality별 파일로 저장
+- findscus/movescus 테이블에 C-FIND/C-MOVE 이벤트를 배치로 기록 (AuditWriter)
+- PDU 덤프(stdout, stderr)는 배치별 gzip 세그먼트에 비동기로 기록 (scripts/read_batch_log.py 로 조회)
+- 상태 줄/DIMSE 상태 코드는 SQLite FTS5 색인에 기록 (scripts/search_transcripts.py 로 검색),
+  감사 테이블의 error_detail 에는 실패 요약 한 줄만 남김
 - 추출된 StudyInstanceUID 리스트를 다음 단계인 movescu로 전달
+- Study 별 결과는 retrieve_ledger 장부에 남기고, 실패한 Study 만 다음 실행에서 재시도 (--resume-only)
 """
 
-import re
-import subprocess
+import argparse
 import sys
-import psycopg2
 import json
+from dataclasses import dataclass
+from queue import Empty, SimpleQueue
 from pathlib import Path
 
 # src 폴더를 sys.path에 추가
@@ -22,127 +25,55 @@ sys.path.insert(0, str(project_root))
 
 from datetime import datetime, date
 
-from nmdose import (
-    get_config,
-    get_pacs_config,
-    get_retrieve_config,
-    get_schedule_config,
-    get_db_config,
+from nmdose.config_loader.retrieve_options_loader import get_retrieve_config, resolve_project_path
+from nmdose.env.init import init_app_environment
+from nmdose.utils.date_utils import (
     make_batch_date_range,
+    make_batch_date_ranges,
+    batch_slot_deadline,
+    iter_windows_in_slot,
     parse_start_date,
     parse_end_date,
-    sanitize_event
 )
+from nmdose.utils.text_utils import sanitize_event
+from nmdose.dimse import get_dimse_backend
+from nmdose.utils.audit_writer import AuditWriter
+from nmdose.utils.db_pool import close_all_pools, db_connection
+from nmdose.utils.log_sink import SegmentLogSink
+from nmdose.utils.metrics import observe_move, registry as metrics_registry
+from nmdose.utils.profiler import Profiler, activate, profiled, save_profile, span
+from nmdose.utils.transcript_index import TranscriptIndex, summarize_transcript
+from nmdose.tasks.move_scheduler import MoveScheduler, get_move_workers
+from nmdose.tasks.find_splitter import SplittingFinder
+from nmdose.tasks.retrieved_index import RetrievedIndex
+from nmdose.tasks.retrieve_ledger import RetrieveLedger
+from nmdose.tasks.move_queue import MoveQueue
+from nmdose.tasks.move_worker import make_move_event
 
 # ─── 환경 초기화 ────────────────────────────────────────────────────────────
 def init_environment():
-    CONFIG     = get_config()
-    PACS    = get_pacs_config()
-    RETRIEVE_CONFIG    = get_retrieve_config()
-    SCHEDULE_CONFIG   = get_schedule_config()
-    db_conf = get_db_config().rpacs
-    conn = psycopg2.connect(
-        dbname=db_conf.database,
-        user=db_conf.user,
-        password=db_conf.user,
-        host=db_conf.host,
-        port=db_conf.port
-    )
-    log_dir = Path(r"C:\nmdose\logs\batch")
-    log_dir.mkdir(parents=True, exist_ok=True)
-    return CONFIG, PACS, RETRIEVE_CONFIG, SCHEDULE_CONFIG, conn, log_dir
-
-# ─── PACS 선택 ──────────────────────────────────────────────────────────────
-def select_pacs(CONFIG, PACS):
-    if CONFIG.running_mode.lower() == "simulation":
-        return PACS.research, PACS.simulation
-    else:
-        return PACS.research, PACS.clinical
-
-# ─── 서브프로세스 실행 ──────────────────────────────────────────────────────
-def run_process(cmd: list[str]) -> tuple[str, str]:
-    try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        std_combined_text = result.stdout or "" + result.stderr or ""
-        status = "SUCCESS"
-    except subprocess.CalledProcessError as e:
-        std_combined_text = e.stdout or "" + e.stderr or ""
-        status = "FAILURE"
-    return std_combined_text, status
-
-# ─── 로그 파일, 저장 ──────────────────────────────────────────────────────────
-def save_logs(log_dir, mode, modality: str, ts_start: datetime, std_combined_text, uid):
-    ts_str = ts_start.strftime("%Y%m%d_%H%M%S")
-    sanitized_text = std_combined_text.replace("\x00", "")
-    clean_uid = uid.replace("\x00", "")
-    std_combined_file = log_dir / f"{mode}_std_combined_{modality}_{ts_str}_{clean_uid}.log"
-    std_combined_file.write_text(sanitized_text, encoding="utf-8")
-    print(f"  STD_Combined → {std_combined_file}")
-
-
-def insert_findscus(conn, event) -> int:
-    sql = """
-    INSERT INTO findscus
-      (ts, calling_aet, called_aet,
-       peer_host, peer_port,
-       query_retrieve_level,
-       start_date, end_date,
-       modalities_in_study,
-       result_count, duration_ms,
-       status, error_detail)
-    VALUES (
-      %s, %s, %s,
-      %s, %s,
-      %s,
-      %s, %s,
-      %s,
-      %s, %s,
-      %s, %s
-    )
-    RETURNING find_id
     """
-    params = (
-        event["ts"],
-        event["calling_aet"],
-        event["called_aet"],
-        event["peer_host"],
-        event["peer_port"],
-        event["query_retrieve_level"],
-        event["start_date"],
-        event["end_date"],
-        event["modalities_in_study"],
-        event["result_count"],
-        event["duration_ms"],
-        event["status"],
-        event["error_detail"],
+    .env 를 로드한 뒤 (calling, called) 엔드포인트, retrieve_to_research 설정, 로그 세그먼트 sink 를 준비합니다.
+    called 는 RUNNING_MODE 가 "1" 이면 simulation PACS, 아니면 clinical PACS 입니다.
+    """
+    env = init_app_environment()
+    source, target = env.endpoints()
+    retrieve_cfg = get_retrieve_config().retrieve_to_research
+    log_sink = SegmentLogSink(
+        env.log_dir, prefix="find_move",
+        max_segment_bytes=retrieve_cfg.log_segment_mb * 1024 * 1024,
     )
-    with conn.cursor() as cur:
-        cur.execute(sql, params)
-        find_id = cur.fetchone()[0]
-    conn.commit()
-    return find_id
+    return source, target, retrieve_cfg, log_sink
 
 
-def insert_movescus (conn, event):
-    with conn.cursor() as cur:
-        cur.execute("""
-            INSERT INTO movescus
-              (find_id, ts, calling_aet, called_aet, peer_host, peer_port, pending_count, duration_ms, status, error_detail, study_instance_uid)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            event["find_id"],
-            event["ts"],
-            event["calling_aet"],
-            event["called_aet"],
-            event["peer_host"],
-            event["peer_port"],
-            event["pending_count"],
-            event["duration_ms"],
-            event["status"],
-            event["error_detail"],
-            event["study_instance_uid"],
-        ))
-    conn.commit()    
+def plan_windows(retrieve_cfg) -> tuple[list[str], datetime | None]:
+    """
+    처리할 날짜 창 목록과 배치 시간대 종료 시각.
+    catch-up 모드면 남은 창 전부, 아니면 다음 창 하나만 돌려줍니다.
+    """
+    date_ranges = make_batch_date_ranges() if retrieve_cfg.batch_catch_up else [make_batch_date_range()]
+    return date_ranges, batch_slot_deadline(cfg=retrieve_cfg)
+
 
 def update_batch_status(conn, process_name: str, last_date: date):
     """
@@ -161,48 +92,98 @@ def update_batch_status(conn, process_name: str, last_date: date):
     conn.commit()
 
 
-def run_retrieve():
+@dataclass
+class RetrieveRun:
+    """한 번의 실행 동안 공유하는 DIMSE/DB 객체 묶음"""
+    source: object
+    target: object
+    finder: SplittingFinder
+    scheduler: MoveScheduler
+    audit: AuditWriter
+    retrieved: RetrievedIndex
+    ledger: RetrieveLedger
+    log_sink: SegmentLogSink
+    transcripts: TranscriptIndex
+    queue: MoveQueue | None = None   # move_dispatch == "queue" 이면 C-MOVE 대신 큐에 등록
 
-    batch_success = 1
 
-    # 1) 환경 초기화
-    CONFIG, PACS, RETRIEVE_CONFIG, SCHEDULE_CONFIG, conn, log_dir = init_environment()
-    print(f"▶ Running mode: {CONFIG.running_mode}")
-    source, target = select_pacs(CONFIG, PACS)
-
-    print(target)
-    date_range     = make_batch_date_range()
-    modalities     = RETRIEVE_CONFIG.clinical_to_research.modalities
+@profiled("record_move")
+def record_move(run: RetrieveRun, outcome, modality: str, find_id, attempt: int = 1) -> bool:
+    """
+    C-MOVE 결과 한 건을 로그 세그먼트, movescus, 장부, 색인에 반영하고 성공 여부를 돌려줍니다.
+    attempt: 이 Study 의 몇 번째 시도인지 (resume 은 장부의 attempts + 1)
+    """
+    clean_uid = outcome.uid
+    move_result = outcome.result
+    print(f"▶ C-MOVE: {clean_uid} → {move_result.status} ({outcome.duration_ms}ms)")
+
+    with span("log_sink.write"):
+        run.log_sink.write("movescu", clean_uid, modality, outcome.ts_start, move_result.transcript)
+    observe_move(outcome, run.target.aet, modality)
+
+    event_move = make_move_event(outcome, run.source, run.target, find_id, attempt)
+    with span("audit.add_move"):
+        move_id = run.audit.add_move(event_move)
+    with span("transcripts.add"):
+        run.transcripts.add("movescu", clean_uid, move_result.transcript, move_result.status,
+                            find_id=find_id, move_id=move_id, modality=modality, ts=outcome.ts_start)
+
+    success = move_result.status == "SUCCESS"
+    with span("db.ledger"):
+        run.ledger.mark(clean_uid, success, event_move["error_detail"])
+    if success:
+        run.retrieved.add(clean_uid)
+    return success
+
+
+def resume_ledger(run: RetrieveRun) -> None:
+    """장부에서 PENDING / FAILED 인 Study 만 다시 C-MOVE 합니다 (C-FIND 재조회 없음)."""
+    entries = run.ledger.retryable()
+    if not entries:
+        return
+    print(f"\n=== Resume: 장부의 미완료 Study {len(entries)}건 재시도 ===")
+
+    by_uid = {}
+    for entry in entries:
+        if entry.study_instance_uid in run.retrieved:   # 장부 기록 전에 이미 받은 Study
+            run.ledger.mark(entry.study_instance_uid, True)
+            continue
+        by_uid[entry.study_instance_uid] = entry
+
+    done = 0
+    for outcome in run.scheduler.run(list(by_uid)):
+        entry = by_uid[outcome.uid]
+        done += record_move(run, outcome, entry.modality or "resume", entry.find_id, entry.attempts + 1)
+    run.audit.flush()
+    print(f"▶ Resume 완료: {done}/{len(by_uid)}건 성공")
+
+
+def retrieve_window(run: RetrieveRun, date_range, modalities) -> bool:
+    """
+    한 날짜 창(date_range)에 대해 모달리티별 스트리밍 C-FIND → C-MOVE 를 수행합니다.
+    이미 받은 UID(run.retrieved)는 C-MOVE 를 예약하지 않고, 나머지는 장부에 등록한 뒤 결과를 기록합니다.
+    반환: 모든 C-FIND 가 성공했고 창 안에 결과가 정해지지 않은 Study 가 없으면 True
+          (실패한 C-MOVE 는 장부에 FAILED 로 남아 다음 실행의 resume 단계에서 재시도)
+          queue 모드에서는 등록된 작업이 move_jobs 에 남아 워커가 처리하므로 C-FIND 성공 여부만 봅니다.
+    """
+    source, target = run.source, run.target
+    window = (parse_start_date(date_range), parse_end_date(date_range))
+    find_success = True
 
-    all_uids = []
-    # 2) C-FIND (모달리티별)
+    # C-FIND (모달리티별)
     for modality in modalities:
-        print(f"\n=== Modality: {modality} ===")
-
-        cmd = [
-            "findscu", "-v", "-S",
-            "-aet", source.aet, "-aec", target.aet,
-            target.ip, str(target.port),
-            "-k", "QueryRetrieveLevel=STUDY",
-            "-k", f"StudyDate={date_range}",
-            "-k", f"ModalitiesInStudy={modality}",
-            "-k", "StudyInstanceUID="
-        ]
-        print("▶ C-FIND:", " ".join(cmd))
-    
-        ts_start = datetime.now()
-        std_combined_text, status = run_process(cmd)
-        ts_end = datetime.now()
-        duration_ms = int((ts_end - ts_start).total_seconds() * 1000)
-
-        save_logs(log_dir, "findscu", modality, ts_start, std_combined_text, "no_uid")
+        print(f"\n=== Modality: {modality} ({date_range}) ===")
 
-        # UID 추출
-        uids = re.findall(r'\(0020,000d\) UI \[([^\]]+)\]', std_combined_text)
-        print(f"  Found {len(uids)} UIDs")
-        all_uids.extend(uids)
+        find_keys = {
+            "QueryRetrieveLevel": "STUDY",
+            "StudyDate": date_range,
+            "ModalitiesInStudy": modality,
+            "StudyInstanceUID": "",
+        }
+        print("▶ C-FIND:", find_keys)
 
-        # C-FIND 이벤트 DB 기록
+        # C-FIND 이벤트를 먼저 등록해 find_id 확보 (결과 건수/소요 시간은 조회가 끝난 뒤 갱신)
+        ts_start = datetime.now()
         event_find = {
             "ts": ts_start,
             "calling_aet": source.aet,
@@ -210,72 +191,195 @@ def run_retrieve():
             "peer_host": target.ip,
             "peer_port": target.port,
             "query_retrieve_level": "STUDY",
-            "start_date": parse_start_date(date_range),
-            "end_date":   parse_end_date(date_range),
+            "start_date": window[0],
+            "end_date":   window[1],
             "modalities_in_study": modality,
-            "result_count": len(uids),
+            "result_count": 0,
+            "duration_ms": 0,
+            "status": "RUNNING",
+            "error_detail": None,
+        }
+        sanitize_event(event_find)
+        with span("audit.begin_find"):
+            find_id = run.audit.begin_find(event_find)
+
+        # 스트리밍 C-FIND: 응답이 도착하는 대로 UID 를 C-MOVE 스케줄러에 넘김
+        # (응답 상한/지연 예산에 걸리면 finder 가 날짜 → 시간 범위로 나눠 재조회)
+        with span(f"modality.{modality}"), \
+                run.log_sink.open_text("findscu", "no_uid", modality, ts_start) as transcript:
+            stream = run.finder.iter_find(find_keys, transcript=transcript)
+            skipped = 0
+            # stream_uids() 는 스케줄러의 feeder 스레드에서 돌므로 DB(run.audit.conn)에 직접 쓰지 않고
+            # 장부 등록할 UID 만 넘기며, 등록은 호출 스레드가 record_move 직전에 같은 커넥션으로 수행
+            registrations: SimpleQueue = SimpleQueue()
+
+            def register_pending() -> None:
+                while True:
+                    try:
+                        uid = registrations.get_nowait()
+                    except Empty:
+                        return
+                    run.ledger.register(uid, window, modality, find_id)
+
+            def stream_uids():
+                nonlocal skipped
+                seen = set()
+                for attrs in stream:
+                    uid = attrs.get("0020,000D", "").replace("\x00", "")
+                    if not uid or uid in seen:
+                        continue
+                    seen.add(uid)
+                    if uid in run.retrieved:   # 이전 실행에서 이미 받은 Study
+                        skipped += 1
+                        continue
+                    if run.queue is None:
+                        registrations.put(uid)
+                    yield uid
+
+            if run.queue is not None:
+                queued = 0
+                for uid in stream_uids():
+                    run.queue.enqueue(run.audit.conn, uid, find_id, modality)
+                    queued += 1
+                print(f"  ▶ move_jobs 큐에 {queued}건 등록")
+            else:
+                for outcome in run.scheduler.run(stream_uids()):
+                    register_pending()   # outcome.uid 는 예약 전에 이미 registrations 에 들어 있음
+                    record_move(run, outcome, modality, find_id)
+                register_pending()
+
+        ts_end = datetime.now()
+        duration_ms = int((ts_end - ts_start).total_seconds() * 1000)
+        status = stream.status
+        print(f"  Found {stream.count} responses → {status} ({duration_ms}ms), "
+              f"이미 수신 {skipped}건 건너뜀, log → {run.log_sink.segment_path}")
+
+        # C-FIND 이벤트 결과 갱신 (error_detail 은 실패 시 한 줄 요약만, 상태 줄은 transcript 색인에)
+        tail_text = "\n".join(stream.tail)
+        event_find.update({
+            "result_count": stream.count,
             "duration_ms": duration_ms,
             "status": status,
-            "error_detail": std_combined_text.strip() or None,
-        }
+            "error_detail": None if status == "SUCCESS" else summarize_transcript(tail_text),
+        })
         sanitize_event(event_find)
-        find_id = insert_findscus(conn, event_find)
-
-        # 3) 이 모달리티에서 나온 UID만 바로 MOVE 처리
-        unique_uids = list(dict.fromkeys(uids))
-        for uid in unique_uids:
-            clean_uid = uid.replace("\x00", "")
-            move_cmd = [
-                "movescu", "-v",
-                "-aet", source.aet, "-aec", target.aet,
-                target.ip, str(target.port),
-                "-k", "QueryRetrieveLevel=STUDY",
-                "-k", f"StudyInstanceUID={clean_uid}"
-            ]
-            print("▶ C-MOVE:", " ".join(move_cmd))
-
-            ts_mv_start = datetime.now()
-            mv_std_combined_text, mv_status = run_process(move_cmd)
-            ts_mv_end = datetime.now()
-            mv_duration = int((ts_mv_end - ts_mv_start).total_seconds() * 1000)
-
-            save_logs(log_dir, "movescu", modality, ts_mv_start, mv_std_combined_text, clean_uid)
-            pending_count = mv_std_combined_text.lower().count("pending")
-
-            event_move = {
-                "find_id": find_id,
-                "ts": ts_mv_start,
-                "calling_aet": source.aet,
-                "called_aet":  target.aet,
-                "peer_host":   target.ip,
-                "peer_port":   target.port,
-                "pending_count": pending_count,
-                "duration_ms": mv_duration,
-                "status": mv_status,
-                "error_detail": mv_std_combined_text.strip() or None,
-                "study_instance_uid": clean_uid,
-            }
-            sanitize_event(event_move)
-            insert_movescus(conn, event_move)
-
-            batch_success = batch_success * (1 if status == "SUCCESS" and mv_status == "SUCCESS" else 0)
-
-    
-
-
-
-    if batch_success == 1:
-        # date_range 가 "YYYYMMDD-YYYYMMDD" 이므로 끝 날짜를 꺼내서 저장
-        last_date = parse_end_date(date_range)
-        update_batch_status(conn, "findscu", last_date)
-        print(f"▶ Batch 전체 성공: last_processed_date → {last_date}")
-    else:
-        print("⚠️ Batch 중 일부 실패 발생: batch_status 갱신 생략")
-     
-
-    # 4) 모든 모달리티 처리 후에야 커넥션을 닫습니다.
-    conn.close()    
+        run.audit.finish_find(find_id, event_find)
+        run.transcripts.add("findscu", "no_uid", tail_text, status,
+                            find_id=find_id, modality=modality, ts=ts_start)
+
+        find_success = find_success and status == "SUCCESS"
+
+    if run.queue is not None:
+        return find_success
+    return find_success and run.ledger.pending_in_window(window) == 0
 
-if __name__ == "__main__":
-    run_retrieve()
 
+def run_retrieve(resume_only: bool = False):
+    profiler = Profiler("find_move")
+    # 실행 전체가 공유 커넥션 풀(db_pool)의 커넥션 하나를 빌려 쓰고, 끝나면 반납
+    try:
+        with db_connection() as conn:
+            with activate(profiler):
+                retrieve_cfg = _retrieve(conn, resume_only)
+
+            # 6) 단계별 소요 시간 요약: 콘솔, 실행별 JSON, (선택) profile_runs 집계 행
+            print("\n▶ 단계별 소요 시간\n" + profiler.render_text(min_ms=10))
+            if retrieve_cfg.profile_dir:
+                print(f"▶ profile → {profiler.dump(resolve_project_path(retrieve_cfg.profile_dir))}")
+            if retrieve_cfg.profile_persist:
+                print(f"▶ profile_runs.run_id = {save_profile(conn, profiler)}")
+    finally:
+        close_all_pools()
+    if retrieve_cfg.metrics_textfile:
+        metrics_registry.write_textfile(resolve_project_path(retrieve_cfg.metrics_textfile))
+
+
+def _retrieve(conn, resume_only: bool):
+    """run_retrieve 본체 (활성 프로파일러 아래에서 실행). 반환: retrieve_to_research 설정"""
+
+    # 1) 환경 초기화
+    with span("init_environment"):
+        source, target, retrieve_cfg, log_sink = init_environment()
+    print(f"▶ C-FIND/C-MOVE 대상: {target.aet} ({target.ip}:{target.port})")
+
+    backend = transcripts = None
+    try:
+        modalities     = retrieve_cfg.modalities
+        backend        = get_dimse_backend()
+        scheduler      = MoveScheduler(
+            backend, source, target,
+            max_workers=get_move_workers(retrieve_cfg, target),
+            slow_threshold_ms=retrieve_cfg.move_slow_threshold_sec * 1000,
+        )
+        finder         = SplittingFinder(
+            backend, source, target,
+            max_results=retrieve_cfg.find_max_results,
+            latency_budget_sec=retrieve_cfg.find_latency_budget_sec,
+            min_time_slot_min=retrieve_cfg.find_min_time_slot_min,
+        )
+        audit = AuditWriter(
+            conn,
+            batch_size=retrieve_cfg.audit_batch_size,
+            flush_interval_sec=retrieve_cfg.audit_flush_interval_sec,
+        )
+        ledger = RetrieveLedger(conn, max_attempts=retrieve_cfg.retrieve_max_attempts)
+        with span("db.ensure_tables"):
+            ledger.ensure_table()
+
+        # 2) 처리할 날짜 창 계획: catch-up 모드면 배치 시간대 안에서 남은 창을 연속 처리
+        date_ranges, deadline = plan_windows(retrieve_cfg)
+        print(f"▶ 남은 날짜 창 {len(date_ranges)}개, 배치 시간대 종료: {deadline or '시간대 밖 (1개만 처리)'}")
+
+        # 이미 research 로 C-MOVE 에 성공한 UID 색인 (처리할 창과 겹치는 기록만 한 번 로드)
+        with span("db.retrieved_index"):
+            retrieved = RetrievedIndex.load(conn, since=parse_start_date(date_ranges[0]),
+                                            calling_aet=source.aet)
+        queue = None
+        if retrieve_cfg.move_dispatch == "queue":
+            queue = MoveQueue(called_aet=target.aet, lease_sec=retrieve_cfg.move_queue_lease_sec,
+                              max_attempts=retrieve_cfg.retrieve_max_attempts)
+            MoveQueue.ensure_table(conn)
+            print("▶ move_dispatch=queue: C-MOVE 는 scripts/move_worker.py 가 수행")
+        transcripts = TranscriptIndex(resolve_project_path(retrieve_cfg.transcript_index))
+        run = RetrieveRun(source, target, finder, scheduler, audit, retrieved, ledger, log_sink,
+                          transcripts, queue)
+
+        # 3) 이전 실행에서 실패/미완료로 남은 Study 만 먼저 재시도 (queue 모드는 큐가 재시도 담당)
+        if queue is None:
+            with span("resume"):
+                resume_ledger(run)
+
+        # 4) 창별 C-FIND → C-MOVE, 완료된 창마다 batch_status 체크포인트
+        windows = [] if resume_only else date_ranges
+        for date_range in iter_windows_in_slot(windows, deadline):
+            with span("window"):
+                ok = retrieve_window(run, date_range, modalities)
+
+            # batch_status 가 감사 로그/장부보다 앞서 나가지 않도록 남은 이벤트를 먼저 기록
+            audit.flush()
+
+            if not ok:
+                print(f"⚠️ {date_range} C-FIND 실패 또는 미완료 Study 존재: batch_status 갱신 생략, 다음 실행에서 재시도")
+                break
+
+            # date_range 가 "YYYYMMDD-YYYYMMDD" 이므로 끝 날짜를 꺼내서 저장
+            last_date = parse_end_date(date_range)
+            with span("db.batch_status"):
+                update_batch_status(conn, "findscu", last_date)
+            print(f"▶ {date_range} 완료: last_processed_date → {last_date}")
+    finally:
+        # 5) 예외로 끝나도 log-sink 스레드에 남은 레코드와 세그먼트 .idx 를 기록하도록 항상 닫습니다
+        #    (커넥션은 run_retrieve 가 반납).
+        with span("close"):
+            if backend is not None:
+                backend.close()
+            log_sink.close()
+            if transcripts is not None:
+                transcripts.close()
+    return retrieve_cfg
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="C-FIND → C-MOVE 배치 수신")
+    arg_parser.add_argument("--resume-only", action="store_true",
+                            help="새 날짜 창은 조회하지 않고 장부의 실패/미완료 Study 만 재시도")
+    run_retrieve(resume_only=arg_parser.parse_args().resume_only)
@@ -3,52 +3,16 @@
 import sys
 from pathlib import Path
 from datetime import datetime
-import subprocess
-import re
 
 # 환경 초기화 로직 호출 (DB는 사용하지 않으므로 init_environment에서 DB 연결은 반환되지 않습니다)
 from nmdose.env.init import init_environment
+from nmdose.dimse import get_dimse_backend
+from nmdose.tasks.preview import STANDARD_STUDY_TAGS, build_findscu_keys
 
 
 def get_standard_study_tags() -> list[str]:
     """Study 조회 시 포함할 DICOM 태그 목록"""
-    return [
-        "0008,0005", "0008,0020", "0008,0030", "0008,0050", "0010,0010",
-        "0010,0020", "0020,000D", "0008,0061", "0008,0062", "0008,1030",
-        "0020,1206", "0020,1208",
-    ]
-
-
-def build_findscu_command(calling, called, modality, date_range, tags) -> list[str]:
-    """C-FIND 명령어 빌드"""
-    cmd = [
-        "findscu", "-v", "-S",
-        "-aet", calling.aet, "-aec", called.aet,
-        called.ip, str(called.port),
-        "-k", "QueryRetrieveLevel=STUDY",
-        "-k", f"StudyDate={date_range}",
-        "-k", f"ModalitiesInStudy={modality}",
-    ]
-    for tag in tags:
-        cmd += ["-k", f"{tag}="]
-    return cmd
-
-
-def parse_findscu_output(raw_output: str) -> list[dict[str, str]]:
-    """findscu 출력 파싱"""
-    split_pattern = re.compile(r"I: *-+[\r\n]+I: Find Response:.*")
-    blocks = split_pattern.split(raw_output)
-    response_blocks = blocks[1:]
-
-    tag_pattern = re.compile(r'\(([0-9A-Fa-f]{4},[0-9A-Fa-f]{4})\)\s+\w{2}\s+\[([^\]]*)\]')
-    parsed = []
-    for block in response_blocks:
-        matches = tag_pattern.findall(block)
-        attrs: dict[str, str] = {}
-        for tag, val in matches:
-            attrs[tag.upper()] = val.strip()
-        parsed.append(attrs)
-    return parsed
+    return list(STANDARD_STUDY_TAGS)
 
 
 def print_study_attributes(idx: int, attrs: dict[str, str]):
@@ -78,31 +42,30 @@ def print_study_attributes(idx: int, attrs: dict[str, str]):
         print(f"[DEBUG] Response #{idx} → {tag.replace(',', '_')}: {attrs.get(tag)}")
 
 
-def run_findscu_preview(modality, calling, called, date_range, standard_tags):
-    """단일 modality에 대해 findscu 실행 및 결과 파싱"""
+def run_findscu_preview(modality, calling, called, date_range, standard_tags, backend):
+    """단일 modality에 대해 C-FIND 실행 및 결과 파싱"""
     print(f"\n=== Modality: {modality} ===")
-    cmd = build_findscu_command(calling, called, modality, date_range, standard_tags)
-    print("▶ Running C-FIND:")
-    print("  " + " ".join(cmd))
+    keys = build_findscu_keys(modality, date_range, standard_tags)
+    print(f"▶ Running C-FIND ({backend.name}):")
+    print(f"  {keys}")
 
-    result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace')
-    stdout = (result.stdout or "") + (result.stderr or "")
-    responses = parse_findscu_output(stdout)
+    # 응답이 도착하는 대로 바로 출력 (전체 출력을 모아두지 않음)
+    stream = backend.iter_find(calling, called, keys)
+    for idx, attrs in enumerate(stream, 1):
+        print_study_attributes(idx, attrs)
 
-    if not responses:
+    if stream.count == 0:
         print("⚠ 아무 응답 블록도 파싱되지 않았습니다.")
-        return
-
-    for idx, attrs in enumerate(responses, 1):
-        print_study_attributes(idx, attrs)
 
 
 def main():
     # 환경 초기화 (DB 연결은 이 스크립트에서 사용하지 않으므로 제외)
     calling, called, modalities, date_range, log_dir = init_environment()
     tags = get_standard_study_tags()
+    backend = get_dimse_backend()
     for modality in modalities:
-        run_findscu_preview(modality, calling, called, date_range, tags)
+        run_findscu_preview(modality, calling, called, date_range, tags, backend)
+    backend.close()
     # DB 연결이 없으므로 close 호출 제거
 
 
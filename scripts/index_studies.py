@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+scripts/index_studies.py
+
+researchPACS 수신 파일의 DICOM 헤더만 읽어 rpacs.study_metadata 를 채우는 배치
+
+- retrieve_to_research.received_dir 아래 파일을 워커 프로세스 index_workers 개로 나눠 헤더만 읽습니다.
+- 기본은 증분 모드: index_manifest 에 기록된 mtime/크기와 같은 파일은 건너뛰고 새로 받은 파일만 읽습니다.
+- --full 은 목록을 비우고 전부 다시 읽어 모든 Study 를 다시 집계합니다.
+
+사용법:
+    python scripts/index_studies.py [--dir DIR] [--workers N] [--full]
+"""
+
+# ───── 표준 라이브러리 ─────
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# src 폴더를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(project_root))
+
+from nmdose.config_loader.retrieve_options_loader import get_retrieve_config, resolve_project_path
+from nmdose.tasks.study_indexer import FileManifest, index_studies
+from nmdose.utils.db_pool import close_all_pools, db_connection
+
+
+def main():
+    cfg = get_retrieve_config().retrieve_to_research
+    parser = argparse.ArgumentParser(description="DICOM 헤더 → rpacs.study_metadata 색인")
+    parser.add_argument("--dir", default=cfg.received_dir, help="수신 파일 디렉터리 (기본: received_dir 설정)")
+    parser.add_argument("--workers", type=int, default=cfg.index_workers, help="워커 프로세스 수 (0 = CPU 수)")
+    parser.add_argument("--full", action="store_true", help="증분 목록을 무시하고 전부 다시 읽기")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s ▶ %(message)s")
+
+    root = resolve_project_path(args.dir)
+    try:
+        with FileManifest(resolve_project_path(cfg.index_manifest)) as manifest, db_connection() as conn:
+            counts = index_studies(conn, root, manifest, workers=args.workers, incremental=not args.full)
+    finally:
+        close_all_pools()
+    print(f"▶ Study 색인: 파일 {counts['files']}개 중 {counts['read']}개 읽음 "
+          f"(DICOM 아님 {counts['not_dicom']}개) → study_metadata {counts['studies']}건 갱신 ({root})")
+
+
+if __name__ == "__main__":
+    main()
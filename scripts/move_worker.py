@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+scripts/move_worker.py
+
+move_jobs 큐의 C-MOVE 작업을 처리하는 워커 프로세스
+
+- retrieve_options.yaml 의 move_dispatch 가 "queue" 이면 find_move.py 는 UID 를 큐에 등록만 하고,
+  실제 C-MOVE 는 이 워커가 수행합니다. 여러 호스트에서 동시에 실행할 수 있습니다.
+- .env 를 로드한 뒤 RUNNING_MODE 가 "1" 이면 simulation PACS, 아니면 clinical PACS 에서 research 로 이동
+  (find_move.py 와 같은 기준이어야 같은 called_aet 의 작업을 가져감)
+
+사용법:
+    python scripts/move_worker.py [--workers N] [--drain] [--worker-id ID]
+"""
+
+# ───── 표준 라이브러리 ─────
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# src 폴더를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(project_root))
+
+from nmdose.config_loader.retrieve_options_loader import get_retrieve_config, resolve_project_path
+from nmdose.dimse import get_dimse_backend
+from nmdose.env.init import init_app_environment
+from nmdose.tasks.move_queue import MoveQueue
+from nmdose.tasks.move_scheduler import get_move_workers
+from nmdose.tasks.move_worker import run_worker
+from nmdose.utils.audit_writer import AuditWriter
+from nmdose.utils.db_pool import db_connection
+from nmdose.utils.metrics import registry as metrics_registry
+from nmdose.utils.transcript_index import TranscriptIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="move_jobs 큐 C-MOVE 워커")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="프로세스 안의 동시 C-MOVE 수 (기본: move_workers 설정)")
+    parser.add_argument("--drain", action="store_true", help="큐가 비면 종료")
+    parser.add_argument("--worker-id", default=None, help="워커 ID (기본: 호스트명:PID)")
+    parser.add_argument("--poll", type=float, default=5.0, help="큐가 비었을 때 재확인 간격(초)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s ▶ %(message)s")
+
+    calling, called = init_app_environment().endpoints()
+    cfg = get_retrieve_config().retrieve_to_research
+
+    queue = MoveQueue(called_aet=called.aet, lease_sec=cfg.move_queue_lease_sec,
+                      max_attempts=cfg.retrieve_max_attempts, worker_id=args.worker_id)
+    backend = get_dimse_backend()
+    transcripts = TranscriptIndex(resolve_project_path(cfg.transcript_index))
+    try:
+        with db_connection() as claim_conn, db_connection() as conn:
+            MoveQueue.ensure_table(conn)
+            audit = AuditWriter(conn, batch_size=cfg.audit_batch_size,
+                                flush_interval_sec=cfg.audit_flush_interval_sec)
+            run_worker(
+                backend, calling, called, queue, claim_conn, conn, audit,
+                max_workers=args.workers or get_move_workers(cfg, called),
+                slow_threshold_ms=cfg.move_slow_threshold_sec * 1000,
+                poll_interval=args.poll,
+                drain=args.drain,
+                transcripts=transcripts,
+            )
+    except KeyboardInterrupt:
+        print("▶ 워커 중단")
+    finally:
+        backend.close()
+        transcripts.close()
+        if cfg.metrics_textfile:
+            metrics_registry.write_textfile(resolve_project_path(cfg.metrics_textfile))
+
+
+if __name__ == "__main__":
+    main()
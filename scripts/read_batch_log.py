@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+scripts/read_batch_log.py
+
+find_move.py 가 남긴 gzip 로그 세그먼트에서 transcript 를 꺼내 보는 스크립트
+
+- --uid      : StudyInstanceUID 의 레코드를 모든 세그먼트에서 찾아 출력 (색인 사용)
+- --segment + --offset : 세그먼트의 특정 오프셋 레코드 하나만 출력
+- --segment + --list   : 세그먼트의 레코드 목록(오프셋, kind, uid, ts, seq) 출력
+
+사용법:
+    python scripts/read_batch_log.py --uid 1.2.410... [--kind movescu] [--dir logs/batch]
+    python scripts/read_batch_log.py --segment logs/batch/find_move_..._0001.log.gz --offset 1234
+    python scripts/read_batch_log.py --segment logs/batch/find_move_..._0001.log.gz --list
+"""
+
+# ───── 표준 라이브러리 ─────
+import argparse
+import sys
+from pathlib import Path
+
+# src 폴더를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(project_root))
+
+from nmdose.config_loader.retrieve_options_loader import get_retrieve_config, resolve_project_path
+from nmdose.utils.log_sink import find_records, iter_index, iter_records, read_record
+
+
+def default_log_dir() -> Path:
+    """retrieve_options.yaml 의 log_dir (상대 경로는 프로젝트 루트 기준)"""
+    return resolve_project_path(get_retrieve_config().retrieve_to_research.log_dir)
+
+
+def print_record(record) -> None:
+    print(f"===== {record.kind} {record.modality} {record.uid} {record.ts} "
+          f"(seq {record.seq}, {record.segment.name}:{record.offset}) =====")
+    print(record.text, end="" if record.text.endswith("\n") else "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gzip 로그 세그먼트 조회")
+    parser.add_argument("--uid", help="찾을 StudyInstanceUID")
+    parser.add_argument("--kind", choices=["findscu", "movescu"], help="로그 종류 필터")
+    parser.add_argument("--dir", type=Path, default=None, help="세그먼트 디렉터리 (기본: log_dir 설정)")
+    parser.add_argument("--segment", type=Path, help="세그먼트 파일")
+    parser.add_argument("--offset", type=int, help="세그먼트 안의 레코드 오프셋")
+    parser.add_argument("--list", action="store_true", help="세그먼트의 레코드 목록 출력")
+    args = parser.parse_args()
+
+    if args.segment and args.offset is not None:
+        print_record(read_record(args.segment, args.offset))
+    elif args.segment and args.list:
+        index = Path(str(args.segment) + ".idx")
+        if index.is_file():
+            for offset, kind, uid, ts, seq in iter_index(args.segment):
+                print(f"{offset}\t{kind}\t{uid}\t{ts}\t{seq}")
+        else:
+            for record in iter_records(args.segment):
+                print(f"{record.offset}\t{record.kind}\t{record.uid}\t{record.ts}\t{record.seq}")
+    elif args.uid:
+        records = find_records(args.dir or default_log_dir(), args.uid, args.kind)
+        if not records:
+            print(f"⚠ {args.uid} 의 로그를 찾지 못했습니다", file=sys.stderr)
+            sys.exit(1)
+        for record in records:
+            print_record(record)
+    else:
+        parser.error("--uid 또는 --segment 와 --offset/--list 중 하나를 지정하세요")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+scripts/search_transcripts.py
+
+find_move.py / move_worker.py 가 남긴 transcript 색인(SQLite FTS5) 조회 스크립트
+
+- --uid      : StudyInstanceUID 의 C-MOVE 상태 줄
+- --find-id  : C-FIND 세션 하나와 그에 딸린 C-MOVE 들
+- --move-id  : movescus.move_id 한 건
+- 검색어     : 입력 전체를 한 구(phrase)로 찾는 FTS5 검색 (예: Refused, C-MOVE-RSP, 'E: Failed')
+- --raw      : 검색어를 FTS5 질의 문법 그대로 사용 (예: 'codes:0xA701', 'status:FAILURE AND timeout')
+
+원문 전체가 필요하면 scripts/read_batch_log.py --uid 로 로그 세그먼트에서 꺼냅니다.
+
+사용법:
+    python scripts/search_transcripts.py --uid 1.2.410...
+    python scripts/search_transcripts.py "E: Failed" [--kind movescu] [--limit 20]
+    python scripts/search_transcripts.py --raw "status:FAILURE AND refused"
+"""
+
+# ───── 표준 라이브러리 ─────
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+# src 폴더를 sys.path에 추가
+project_root = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(project_root))
+
+from nmdose.config_loader.retrieve_options_loader import get_retrieve_config, resolve_project_path
+from nmdose.utils.transcript_index import TranscriptIndex
+
+
+def print_hit(hit) -> None:
+    print(f"===== {hit.kind} {hit.modality or ''} {hit.uid or ''} {hit.ts or ''} "
+          f"(find_id={hit.find_id}, move_id={hit.move_id}) → {hit.status} {hit.codes} =====")
+    if hit.body:
+        print(hit.body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="transcript 색인 조회")
+    parser.add_argument("query", nargs="?", help="검색어 (기본: 입력 전체를 한 구로 검색)")
+    parser.add_argument("--raw", action="store_true",
+                        help="검색어를 FTS5 질의 문법(column:값, AND/OR/NOT, \"구\") 그대로 사용")
+    parser.add_argument("--uid", help="StudyInstanceUID")
+    parser.add_argument("--find-id", type=int, help="findscus.find_id")
+    parser.add_argument("--move-id", type=int, help="movescus.move_id")
+    parser.add_argument("--kind", choices=["findscu", "movescu"], help="검색어 조회 시 로그 종류 필터")
+    parser.add_argument("--limit", type=int, default=50, help="검색어 조회 최대 건수")
+    parser.add_argument("--index", type=Path, default=None, help="색인 파일 (기본: transcript_index 설정)")
+    args = parser.parse_args()
+
+    path = args.index or resolve_project_path(get_retrieve_config().retrieve_to_research.transcript_index)
+    with TranscriptIndex(path) as index:
+        if args.uid:
+            hits = index.by_uid(args.uid)
+        elif args.find_id is not None:
+            hits = index.by_find_id(args.find_id)
+        elif args.move_id is not None:
+            hits = index.by_move_id(args.move_id)
+        elif args.query:
+            try:
+                hits = index.search(args.query, limit=args.limit, kind=args.kind, raw=args.raw)
+            except sqlite3.OperationalError as e:
+                parser.error(f"FTS5 검색어를 해석할 수 없습니다 ({e}). "
+                             "문자열 그대로 찾으려면 --raw 없이, 질의 문법은 예: --raw 'codes:0xA701'")
+        else:
+            parser.error("검색어 또는 --uid / --find-id / --move-id 중 하나를 지정하세요")
+
+    if not hits:
+        print("⚠ 일치하는 항목이 없습니다", file=sys.stderr)
+        sys.exit(1)
+    for hit in hits:
+        print_hit(hit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# src/nmdose/_lazy.py
+
+"""
+_lazy.py
+
+패키지 __init__ 의 공개 이름을 처음 사용할 때 해당 하위 모듈을 import 하도록 하는 도우미입니다 (PEP 562).
+
+`from nmdose.utils import sanitize_event` 처럼 가벼운 함수 하나만 쓰는 경우에도
+psycopg2, yaml, dateutil 이나 설정 로더까지 함께 import 되는 것을 막습니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from typing import Any, Callable
+
+
+def lazy_exports(package: str, exports: dict[str, str],
+                 namespace: dict[str, Any]) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    {공개 이름: 하위 모듈 이름} 으로 모듈 수준 __getattr__ / __dir__ 를 만들어 돌려줍니다.
+    한 번 꺼낸 값은 namespace(패키지 globals)에 저장되므로 이후에는 일반 속성 조회와 같습니다.
+    """
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        # importlib.import_module 대신 __import__ 를 써야 -X importtime 출력에도 나타남
+        module = __import__(f"{package}.{module_name}", fromlist=[name])
+        value = getattr(module, name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,5 @@
+# src/nmdose/api/__init__.py
+
+"""
+FastAPI 라우터 패키지
+"""
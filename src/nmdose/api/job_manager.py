@@ -0,0 +1,195 @@
+# src/nmdose/api/job_manager.py
+
+"""
+job_manager.py
+
+FastAPI 서버 안에서 C-FIND 미리보기 같은 오래 걸리는 작업을 실행하는 작업 관리자입니다.
+
+- 작업은 크기가 정해진 ThreadPoolExecutor(max_workers)에서 실행되므로 요청마다 인터프리터를 새로 띄우지 않고,
+  동시에 몰린 요청도 max_workers 개까지만 실행됩니다 (나머지는 QUEUED).
+- 같은 key 의 작업이 아직 끝나지 않았으면 새로 만들지 않고 기존 작업을 돌려줍니다 (버튼 연타 방지).
+- 작업 함수는 job.publish() 로 진행 이벤트를 남기고 job.cancelled 를 확인해 스스로 멈춥니다.
+  시작 전 작업은 cancel() 즉시 CANCELLED 가 됩니다.
+- 이벤트는 작업마다 순번(seq)을 붙여 보관하므로 SSE 재접속 시 Last-Event-ID 이후만 다시 보낼 수 있습니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable
+import logging
+import threading
+import uuid
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+SUCCEEDED = "SUCCEEDED"
+FAILED = "FAILED"
+CANCELLED = "CANCELLED"
+
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class Job:
+    """작업 한 건의 상태, 진행 이벤트, 결과"""
+
+    MAX_EVENTS = 5000   # 보관할 최근 이벤트 수 (오래된 것부터 버림)
+
+    def __init__(self, kind: str, key: str | None = None, params: dict | None = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.key = key
+        self.params = params or {}
+        self.state = QUEUED
+        self.created_at = datetime.now()
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self.progress: dict[str, Any] = {}
+        self.result: Any = None
+        self.error: str | None = None
+
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._events: deque[tuple[int, str, dict]] = deque(maxlen=self.MAX_EVENTS)
+        self._seq = 0
+        self._future: Future | None = None
+
+    # ───── 작업 함수에서 사용 ─────
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def publish(self, event: str, **data) -> None:
+        """진행 이벤트 한 건 기록 (SSE 로 전달됨)"""
+        with self._lock:
+            self._seq += 1
+            self._events.append((self._seq, event, data))
+
+    def update_progress(self, **values) -> None:
+        with self._lock:
+            self.progress.update(values)
+
+    # ───── 조회 ─────
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def events_since(self, seq: int = 0) -> list[tuple[int, str, dict]]:
+        """seq 이후의 이벤트 목록 [(seq, event, data), ...]"""
+        with self._lock:
+            return [item for item in self._events if item[0] > seq]
+
+    def snapshot(self) -> dict[str, Any]:
+        """GET /api/jobs/{id} 응답용 상태"""
+        with self._lock:
+            return {
+                "id": self.id,
+                "kind": self.kind,
+                "state": self.state,
+                "params": self.params,
+                "created_at": self.created_at.isoformat(),
+                "started_at": self.started_at.isoformat() if self.started_at else None,
+                "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+                "progress": dict(self.progress),
+                "result": self.result,
+                "error": self.error,
+                "last_event": self._seq,
+            }
+
+    def _finish(self, state: str, result: Any = None, error: str | None = None) -> None:
+        self.state = state
+        self.result = result
+        self.error = error
+        self.finished_at = datetime.now()
+        self.publish("end", state=state, error=error)
+
+
+class JobManager:
+    """작업 등록/실행/취소 관리자 (스레드 안전)"""
+
+    def __init__(self, max_workers: int = 2, keep_finished: int = 100):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="job")
+        self._jobs: dict[str, Job] = {}
+        self._active_keys: dict[str, str] = {}   # key → 실행 중인 job id
+        self._keep_finished = keep_finished
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn: Callable[[Job], Any], key: str | None = None,
+               params: dict | None = None) -> tuple[Job, bool]:
+        """
+        fn(job) 을 실행할 작업을 등록합니다.
+        반환: (job, created) — 같은 key 의 작업이 이미 진행 중이면 (기존 job, False)
+        """
+        with self._lock:
+            if key is not None and key in self._active_keys:
+                return self._jobs[self._active_keys[key]], False
+            job = Job(kind, key, params)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._active_keys[key] = job.id
+            self._prune()
+        job._future = self._executor.submit(self._run, job, fn)
+        log.info(f"▶ 작업 등록: {kind} {job.id}")
+        return job, True
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> list[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Job | None:
+        """작업 취소 요청. 시작 전이면 바로 CANCELLED, 실행 중이면 작업 함수가 확인하고 멈춥니다."""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+        job.publish("cancel_requested")      # "end" 보다 먼저 기록되도록 플래그 설정 전에 발행
+        job._cancel.set()
+        if job._future is not None and job._future.cancel():
+            job._finish(CANCELLED)
+            self._release_key(job)
+        return job
+
+    def shutdown(self) -> None:
+        """진행 중인 작업에 취소를 요청하고 실행기를 닫습니다 (서버 종료 시)."""
+        for job in self.list():
+            if not job.finished:
+                self.cancel(job.id)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ───── 내부 ─────
+    def _run(self, job: Job, fn: Callable[[Job], Any]) -> None:
+        if job.cancelled:
+            job._finish(CANCELLED)
+            self._release_key(job)
+            return
+        job.state = RUNNING
+        job.started_at = datetime.now()
+        job.publish("start")
+        try:
+            result = fn(job)
+        except Exception as e:
+            log.exception(f"❌ 작업 실패: {job.kind} {job.id}")
+            job._finish(FAILED, error=str(e))
+        else:
+            job._finish(CANCELLED if job.cancelled else SUCCEEDED, result)
+        finally:
+            self._release_key(job)
+        log.info(f"▶ 작업 종료: {job.kind} {job.id} → {job.state}")
+
+    def _release_key(self, job: Job) -> None:
+        with self._lock:
+            if job.key is not None and self._active_keys.get(job.key) == job.id:
+                del self._active_keys[job.key]
+
+    def _prune(self) -> None:
+        """끝난 작업은 최근 keep_finished 건만 남김 (호출자가 _lock 보유)"""
+        finished = [j for j in self._jobs.values() if j.finished]
+        for job in finished[:-self._keep_finished or None]:
+            del self._jobs[job.id]
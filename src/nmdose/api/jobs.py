@@ -0,0 +1,132 @@
+# src/nmdose/api/jobs.py
+
+"""
+jobs.py
+
+대시보드용 작업 API 라우터입니다.
+
+- POST /api/start-findscu       : C-FIND 미리보기 작업 시작 (진행 중이면 같은 작업 id 반환)
+- GET  /api/jobs                : 작업 목록
+- GET  /api/jobs/{id}           : 작업 상태/진행/결과
+- POST /api/jobs/{id}/cancel    : 작업 취소
+- GET  /api/jobs/{id}/events    : 진행 이벤트 SSE 스트림 (Study 단위, Last-Event-ID 재접속 지원)
+
+JobManager 와 DIMSE 백엔드는 서버 lifespan 에서 만들어 app.state 에 둡니다 (nmdose.main).
+"""
+
+# ───── 표준 라이브러리 ─────
+import asyncio
+import json
+import logging
+
+# ───── 서드파티 라이브러리 ─────
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+# ───── 내부 모듈 ─────
+from nmdose.api.job_manager import Job, JobManager
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+router = APIRouter()
+
+SSE_POLL_SEC = 0.25        # 이벤트 확인 주기
+SSE_KEEPALIVE_SEC = 15.0   # 이벤트가 없을 때 연결 유지용 주석 전송 주기
+
+
+def _manager(request: Request) -> JobManager:
+    return request.app.state.jobs
+
+
+def _job_or_404(request: Request, job_id: str) -> Job:
+    job = _manager(request).get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job
+
+
+def preview_job(backend, env):
+    """C-FIND 미리보기 작업 함수 (JobManager 스레드에서 실행)"""
+    from nmdose.tasks.preview import run_preview
+
+    def run(job: Job):
+        calling, called = env.endpoints()
+        modalities = list(env.modalities)
+        date_range = env.date_range()
+        job.update_progress(date_range=date_range, modalities=modalities, studies=0)
+        job.publish("plan", calling=calling.aet, called=called.aet,
+                    date_range=date_range, modalities=modalities)
+
+        total = 0
+
+        def on_study(modality: str, idx: int, study: dict) -> None:
+            nonlocal total
+            total += 1
+            job.update_progress(modality=modality, studies=total)
+            job.publish("study", modality=modality, index=idx, **study)
+
+        counts = run_preview(backend, calling, called, modalities, date_range,
+                             on_study=on_study, should_stop=lambda: job.cancelled)
+        return {"date_range": date_range, "counts": counts, "studies": total}
+
+    return run
+
+
+@router.post("/api/start-findscu")
+async def start_findscu(request: Request):
+    log.info("▶ /api/start-findscu 호출됨")
+    state = request.app.state
+    job, created = _manager(request).submit(
+        "findscu_preview", preview_job(state.backend, state.env), key="findscu_preview",
+    )
+    return {"status": "started" if created else "running", "job_id": job.id, "created": created}
+
+
+@router.get("/api/jobs")
+async def list_jobs(request: Request):
+    return [job.snapshot() for job in _manager(request).list()]
+
+
+@router.get("/api/jobs/{job_id}")
+async def get_job(request: Request, job_id: str):
+    return _job_or_404(request, job_id).snapshot()
+
+
+@router.post("/api/jobs/{job_id}/cancel")
+async def cancel_job(request: Request, job_id: str):
+    _job_or_404(request, job_id)
+    return _manager(request).cancel(job_id).snapshot()
+
+
+def _sse(seq: int, event: str, data: dict) -> str:
+    return f"id: {seq}\nevent: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.get("/api/jobs/{job_id}/events")
+async def job_events(request: Request, job_id: str):
+    job = _job_or_404(request, job_id)
+    last_seen = int(request.headers.get("last-event-id") or 0)
+
+    async def stream():
+        nonlocal last_seen
+        idle = 0.0
+        while True:
+            events = job.events_since(last_seen)
+            for seq, event, data in events:
+                last_seen = seq
+                yield _sse(seq, event, data)
+            if job.finished and not job.events_since(last_seen):
+                return
+            if await request.is_disconnected():
+                return
+            if events:
+                idle = 0.0
+            elif idle >= SSE_KEEPALIVE_SEC:
+                idle = 0.0
+                yield ": keepalive\n\n"
+            await asyncio.sleep(SSE_POLL_SEC)
+            idle += SSE_POLL_SEC
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -0,0 +1,27 @@
+# src/nmdose/api/metrics.py
+
+"""
+metrics.py
+
+Prometheus 수집용 GET /metrics 라우터입니다.
+
+값은 nmdose.utils.metrics 의 프로세스 전역 레지스트리에서 읽으므로,
+서버 안에서 실행된 C-FIND 미리보기/C-MOVE 와 서버의 Association 풀만 보입니다.
+배치 스크립트(find_move.py, move_worker.py)는 retrieve_to_research.metrics_textfile 로 따로 남깁니다.
+"""
+
+# ───── 서드파티 라이브러리 ─────
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+# ───── 내부 모듈 ─────
+from nmdose.utils.metrics import registry
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics")
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,33 @@
+# src/nmdose/api/moves.py
+
+"""
+moves.py
+
+C-MOVE 진행 상황 조회 API 라우터입니다.
+
+- GET /api/moves        : 진행 중(active)과 최근 완료(recent) C-MOVE 의 sub-operation 건수
+- GET /api/moves/{uid}  : StudyInstanceUID 한 건의 진행 상황
+
+값은 nmdose.dimse.progress 의 진행 버스에서 읽으므로 같은 프로세스에서 실행된 C-MOVE 만 보입니다.
+"""
+
+# ───── 서드파티 라이브러리 ─────
+from fastapi import APIRouter, HTTPException
+
+# ───── 내부 모듈 ─────
+from nmdose.dimse.progress import progress_bus
+
+router = APIRouter()
+
+
+@router.get("/api/moves")
+async def list_moves():
+    return {"active": progress_bus.active(), "recent": progress_bus.recent()}
+
+
+@router.get("/api/moves/{uid}")
+async def get_move(uid: str):
+    progress = progress_bus.get(uid)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"C-MOVE 진행 정보가 없습니다: {uid}")
+    return progress
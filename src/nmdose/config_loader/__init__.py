@@ -0,0 +1,34 @@
+# src/nmdose/config_loader/__init__.py
+
+"""
+설정 로더 패키지
+
+공개 이름은 처음 사용할 때 해당 모듈을 import 합니다 (nmdose._lazy).
+"""
+
+from nmdose._lazy import lazy_exports
+
+_EXPORTS = {
+    "get_retrieve_config":      "retrieve_options_loader",
+    "resolve_project_path":     "retrieve_options_loader",
+    "RetrieveOptions":          "retrieve_options_loader",
+    "RetrieveToResearchConfig": "retrieve_options_loader",
+    "RetrieveToDoseConfig":     "retrieve_options_loader",
+
+    "get_db_config":            "database",
+    "DBConfig":                 "database",
+    "DatabaseSettings":         "database",
+
+    "get_nodes_config":         "dicom_nodes_loader",
+    "DicomEndpoint":            "dicom_nodes_loader",
+    "DicomNodes":               "dicom_nodes_loader",
+
+    "init_dotenv":              "dotenv_loader",
+
+    "registry":                 "registry",
+    "ConfigRegistry":           "registry",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
@@ -8,7 +8,8 @@ database.py
 from pathlib import Path
 import yaml
 from dataclasses import dataclass
-from typing import Optional
+
+from nmdose.config_loader.registry import registry
 
 @dataclass(frozen=True)
 class DBConfig:
@@ -19,11 +20,15 @@ class DBConfig:
       user     (str): 사용자 이름
       host     (str): 호스트 주소
       port     (int): 포트 번호
+      pool_min (int): 커넥션 풀이 유지할 최소 연결 수
+      pool_max (int): 커넥션 풀의 최대 연결 수
     """
     database: str
     user: str
     host: str
     port: int
+    pool_min: int = 1
+    pool_max: int = 10
 
 @dataclass(frozen=True)
 class DatabaseSettings:
@@ -36,13 +41,10 @@ class DatabaseSettings:
     rpacs_admin: DBConfig
     rpacs: DBConfig
 
-# 모듈 수준 캐시 (파일 I/O 최소화)
-_db_cache: Optional[DatabaseSettings] = None
-
 def get_db_config(base_path: str = None) -> DatabaseSettings:
     """
     config/database.yaml 파일을 읽어 DatabaseSettings 객체로 반환합니다.
-    반복 호출 시 캐시된 객체를 재사용합니다.
+    파싱 결과는 설정 레지스트리에 캐시되며, 파일이 바뀌면 다음 확인 주기에 다시 읽습니다.
 
     Args:
       base_path (str, optional): database.yaml이 있는 디렉터리 경로.
@@ -57,47 +59,51 @@ def get_db_config(base_path: str = None) -> DatabaseSettings:
       KeyError: 필수 키가 누락되었을 때.
       ValueError: 값이 올바른 타입/포맷이 아닐 때.
     """
-    global _db_cache
-    if _db_cache is None:
-        # config 폴더 경로 결정
-        if base_path:
-            cfg_dir = Path(base_path)
-        else:
-            cfg_dir = Path(__file__).parents[3] / "config"
-        cfg_file = cfg_dir / "database.yaml"
-
-        if not cfg_file.is_file():
-            raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {cfg_file}")
-
-        data = yaml.safe_load(cfg_file.read_text(encoding="utf-8-sig"))
-
-        # rpacs_admin 설정 파싱
-        try:
-            adm = data["rpacs_admin"]
-            rpacs_admin_cfg = DBConfig(
-                database=adm["database"],
-                user=adm["user"],
-                host=adm["host"],
-                port=int(adm["port"])
-            )
-        except KeyError as e:
-            raise KeyError(f"database.yaml의 'rpacs_admin' 설정이 잘못되었습니다: {e}")
-
-        # rpacs(통합 DB) 애플리케이션 설정 파싱
-        try:
-            rp = data["rpacs"]
-            rpacs_cfg = DBConfig(
-                database=rp["database"],
-                user=rp["user"],
-                host=rp["host"],
-                port=int(rp["port"])
-            )
-        except KeyError as e:
-            raise KeyError(f"database.yaml의 'rpacs' 설정이 잘못되었습니다: {e}")
-
-        _db_cache = DatabaseSettings(
-            rpacs_admin=rpacs_admin_cfg,
-            rpacs=rpacs_cfg
+    # config 폴더 경로 결정
+    if base_path:
+        cfg_dir = Path(base_path)
+    else:
+        cfg_dir = Path(__file__).parents[3] / "config"
+    cfg_file = cfg_dir / "database.yaml"
+
+    if not cfg_file.is_file():
+        raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {cfg_file}")
+
+    return registry.get(cfg_file, _parse_db_settings)
+
+
+def _parse_db_settings(cfg_file: Path) -> DatabaseSettings:
+    data = yaml.safe_load(cfg_file.read_text(encoding="utf-8-sig"))
+
+    # rpacs_admin 설정 파싱
+    try:
+        adm = data["rpacs_admin"]
+        rpacs_admin_cfg = DBConfig(
+            database=adm["database"],
+            user=adm["user"],
+            host=adm["host"],
+            port=int(adm["port"]),
+            pool_min=int(adm.get("pool_min", 1)),
+            pool_max=int(adm.get("pool_max", 10)),
+        )
+    except KeyError as e:
+        raise KeyError(f"database.yaml의 'rpacs_admin' 설정이 잘못되었습니다: {e}")
+
+    # rpacs(통합 DB) 애플리케이션 설정 파싱
+    try:
+        rp = data["rpacs"]
+        rpacs_cfg = DBConfig(
+            database=rp["database"],
+            user=rp["user"],
+            host=rp["host"],
+            port=int(rp["port"]),
+            pool_min=int(rp.get("pool_min", 1)),
+            pool_max=int(rp.get("pool_max", 10)),
         )
+    except KeyError as e:
+        raise KeyError(f"database.yaml의 'rpacs' 설정이 잘못되었습니다: {e}")
 
-    return _db_cache
+    return DatabaseSettings(
+        rpacs_admin=rpacs_admin_cfg,
+        rpacs=rpacs_cfg
+    )
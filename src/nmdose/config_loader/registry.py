@@ -0,0 +1,133 @@
+# src/nmdose/config_loader/registry.py
+
+"""
+registry.py
+
+설정 파일(YAML)을 파싱한 결과를 파일별로 캐시하고, 파일이 바뀌면 다시 읽는 설정 레지스트리입니다.
+
+- get() 은 캐시된 객체를 바로 돌려주고, 마지막 확인 후 check_interval 초가 지났을 때만
+  os.stat 으로 (mtime, size) 를 비교합니다. 바뀌었으면 다시 파싱합니다.
+- 다시 파싱하다 실패하면(편집 중인 YAML 등) 이전 값을 그대로 쓰고 경고만 남깁니다.
+  처음 읽을 때의 실패는 그대로 예외를 발생시킵니다.
+- subscribe() 로 등록한 콜백은 파일 내용이 바뀌어 새 값이 로드될 때 (new, old) 로 호출됩니다.
+
+장시간 실행되는 FastAPI 서버도 재시작 없이 modality, DICOM 노드 변경을 반영하고,
+배치 스크립트는 호출마다 YAML 을 다시 파싱하지 않습니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+import logging
+import os
+import threading
+import time
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+Subscriber = Callable[[Any, Any], None]
+
+
+@dataclass
+class _Entry:
+    parser: Callable[[Path], Any]
+    value: Any = None
+    stamp: tuple[int, int] | None = None   # (mtime_ns, size)
+    checked_at: float = 0.0
+    loaded: bool = False
+    subscribers: list[Subscriber] = field(default_factory=list)
+
+
+class ConfigRegistry:
+    """파일 경로별 파싱 결과 캐시 (스레드 안전)"""
+
+    def __init__(self, check_interval: float = 2.0, clock: Callable[[], float] = time.monotonic):
+        self.check_interval = check_interval
+        self._clock = clock
+        self._entries: dict[Path, _Entry] = {}
+        self._lock = threading.RLock()
+
+    def get(self, path: Path | str, parser: Callable[[Path], Any]) -> Any:
+        """
+        path 를 parser 로 읽은 결과를 돌려줍니다.
+        check_interval 이 지났고 파일의 (mtime, size) 가 바뀌었으면 다시 읽고 구독자에게 알립니다.
+        """
+        path = Path(path).resolve()
+        notify = None
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                entry = self._entries[path] = _Entry(parser)
+            entry.parser = parser
+
+            now = self._clock()
+            if entry.loaded and now - entry.checked_at < self.check_interval:
+                return entry.value
+
+            stamp = self._stat(path)
+            if not entry.loaded:
+                entry.value = parser(path)     # 첫 로드 실패는 호출자에게 그대로 전달
+                entry.stamp, entry.checked_at, entry.loaded = stamp, now, True
+                return entry.value
+
+            entry.checked_at = now
+            if entry.stamp == stamp:
+                return entry.value
+
+            try:
+                value = parser(path)
+            except Exception as e:
+                log.warning(f"⚠ 설정 파일 다시 읽기 실패, 이전 값 유지: {path} ({e})")
+                return entry.value
+            old, entry.value, entry.stamp = entry.value, value, stamp
+            log.info(f"설정 파일 변경 반영: {path}")
+            notify = (list(entry.subscribers), value, old)
+
+        # 콜백은 잠금 밖에서 호출 (콜백 안에서 get() 을 다시 불러도 되도록)
+        callbacks, value, old = notify
+        for callback in callbacks:
+            try:
+                callback(value, old)
+            except Exception:
+                log.exception(f"❌ 설정 변경 구독자 실행 실패: {callback!r}")
+        return value
+
+    def subscribe(self, path: Path | str, callback: Subscriber) -> Callable[[], None]:
+        """path 의 설정이 바뀔 때 callback(new, old) 를 호출하도록 등록하고, 해제 함수를 돌려줍니다."""
+        path = Path(path).resolve()
+        with self._lock:
+            entry = self._entries.setdefault(path, _Entry(parser=lambda p: None))
+            entry.subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in entry.subscribers:
+                    entry.subscribers.remove(callback)
+        return unsubscribe
+
+    def invalidate(self, path: Path | str | None = None) -> None:
+        """다음 get() 에서 파일 상태를 바로 다시 확인하도록 합니다 (path 생략 시 전체)."""
+        with self._lock:
+            entries = self._entries.values() if path is None else [self._entries.get(Path(path).resolve())]
+            for entry in entries:
+                if entry is not None:
+                    entry.checked_at = float("-inf")
+
+    def clear(self) -> None:
+        """캐시를 모두 비웁니다 (구독자 포함). 주로 테스트용."""
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _stat(path: Path) -> tuple[int, int] | None:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+
+# 프로세스 전역 레지스트리 (NMDOSE_CONFIG_CHECK_SEC 로 확인 주기 조정)
+registry = ConfigRegistry(check_interval=float(os.getenv("NMDOSE_CONFIG_CHECK_SEC", "2")))
@@ -1,10 +1,19 @@
 # src/nmdose/config_loader/retrieve_options_loader.py
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 import yaml
 
+from nmdose.config_loader.registry import registry
+
 CONFIG_FILE = Path(__file__).resolve().parents[3] / "config" / "retrieve_options.yaml"
+PROJECT_ROOT = CONFIG_FILE.parents[1]
+
+
+def resolve_project_path(path: str | Path) -> Path:
+    """설정의 경로 값 → 절대 경로 (상대 경로는 프로젝트 루트 기준)"""
+    path = Path(path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
 
 @dataclass
 class RetrieveToResearchConfig:
@@ -23,6 +32,36 @@ class RetrieveToResearchConfig:
     daily_end_time: str
     daily_time_interval: int
 
+    batch_catch_up: bool = True          # 한 번 실행에서 배치 시간대 안에 들어가는 만큼 여러 창을 연속 처리
+
+    dimse_backend: str = "subprocess"   # "subprocess"(findscu/movescu) 또는 "pynetdicom"
+    association_pool_size: int = 4       # pynetdicom: 엔드포인트별 최대 Association 수 (0이면 풀 미사용)
+    association_idle_timeout: int = 300  # pynetdicom: 유휴 Association 정리 기준(초)
+
+    move_workers: dict[str, int] = field(default_factory=lambda: {"default": 1})  # AET별 C-MOVE 동시 실행 수
+    move_slow_threshold_sec: int = 120   # 이보다 오래 걸린 C-MOVE 는 PACS 지연으로 보고 동시 실행 수 축소
+    retrieve_max_attempts: int = 5       # Study 별 C-MOVE 최대 시도 횟수 (넘으면 장부에 GAVE_UP)
+    move_dispatch: str = "inline"        # "inline"(find_move.py 가 직접 C-MOVE) 또는 "queue"(move_jobs + move_worker.py)
+    move_queue_lease_sec: int = 1800     # queue: 워커가 가져간 작업의 lease 시간(초). 만료되면 다른 워커가 재시도
+
+    find_max_results: int = 0            # C-FIND 응답이 이 건수에 도달하면 범위를 나눠 재조회 (0 = 사용 안 함)
+    find_latency_budget_sec: float = 0   # C-FIND 가 이 시간(초)을 넘기면 범위를 나눠 재조회 (0 = 사용 안 함)
+    find_min_time_slot_min: int = 60     # 하루 안에서 StudyTime 으로 나눌 때의 최소 구간(분)
+
+    log_dir: str = "logs/batch"          # findscu/movescu 로그 세그먼트 디렉터리 (상대 경로는 프로젝트 루트 기준)
+    log_segment_mb: int = 64             # 로그 세그먼트 파일 교체 크기(MB, 압축 후)
+    transcript_index: str = "logs/transcripts.sqlite3"  # 상태 줄/DIMSE 오류 코드 전문 검색 색인 (SQLite FTS5)
+    metrics_textfile: str = ""           # 배치 종료 시 메트릭을 저장할 node_exporter textfile 경로 ("" = 저장 안 함)
+    profile_dir: str = "logs/profile"    # 실행별 단계 소요 시간 JSON(flame-style) 저장 위치 ("" = 저장 안 함)
+    profile_persist: bool = False        # 실행별 단계 누적 시간을 profile_runs 테이블에도 기록
+
+    received_dir: str = "data/research"  # researchPACS 수신 파일 디렉터리 (상대 경로는 프로젝트 루트 기준)
+    index_manifest: str = "logs/study_index.sqlite3"  # Study 색인기의 파일별 mtime/크기/헤더 목록 (SQLite)
+    index_workers: int = 0               # 헤더 읽기 워커 프로세스 수 (0 = CPU 수)
+
+    audit_batch_size: int = 500          # findscus/movescus 감사 로그를 모아서 기록할 건수
+    audit_flush_interval_sec: float = 5  # 건수가 차지 않아도 이 시간(초)이 지나면 기록
+
 @dataclass
 class RetrieveToDoseConfig:
     ct_enable_modalities_in_series: bool
@@ -36,13 +75,17 @@ class RetrieveToDoseConfig:
 
     pet_enable_single_axial_first_image: bool
 
+    received_dir: str = "data/dosepacs"  # dosePACS 수신 파일 디렉터리 (상대 경로는 프로젝트 루트 기준)
+    extract_workers: int = 0             # 선량 SR 추출 워커 프로세스 수 (0 = CPU 수)
+    extract_batch_size: int = 500        # dose_statistics 에 한 번에 UPSERT 할 행 수
+
 @dataclass
 class RetrieveOptions:
     retrieve_to_research: RetrieveToResearchConfig
     retrieve_to_dose: RetrieveToDoseConfig
 
 
-def get_retrieve_config(path: Path = CONFIG_FILE) -> RetrieveOptions:
+def _parse_retrieve_options(path: Path) -> RetrieveOptions:
     with open(path, encoding="utf-8") as f:
         raw = yaml.safe_load(f)
 
@@ -50,3 +93,11 @@ def get_retrieve_config(path: Path = CONFIG_FILE) -> RetrieveOptions:
         retrieve_to_research=RetrieveToResearchConfig(**raw["retrieve_to_research"]),
         retrieve_to_dose=RetrieveToDoseConfig(**raw["retrieve_to_dose"]),
     )
+
+
+def get_retrieve_config(path: Path = CONFIG_FILE) -> RetrieveOptions:
+    """
+    retrieve_options.yaml 을 RetrieveOptions 로 반환합니다.
+    파싱 결과는 설정 레지스트리에 캐시되며, 파일이 바뀌면 다음 확인 주기에 다시 읽습니다.
+    """
+    return registry.get(path, _parse_retrieve_options)
@@ -0,0 +1,26 @@
+# src/nmdose/dimse/__init__.py
+
+"""
+C-FIND / C-MOVE 를 수행하는 DIMSE 백엔드 패키지
+"""
+
+from .backends import FindResult, FindStream, MoveResult
+from .backends import SubprocessBackend, PynetdicomBackend
+from .backends import get_dimse_backend
+from .pool import AssociationPool, AssociationError
+from .progress import MoveProgress, ProgressBus, progress_bus
+
+
+__all__ = [
+    "FindResult",
+    "FindStream",
+    "MoveResult",
+    "SubprocessBackend",
+    "PynetdicomBackend",
+    "get_dimse_backend",
+    "AssociationPool",
+    "AssociationError",
+    "MoveProgress",
+    "ProgressBus",
+    "progress_bus",
+]
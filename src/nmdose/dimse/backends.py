@@ -0,0 +1,548 @@
+# src/nmdose/dimse/backends.py
+
+"""
+backends.py
+
+C-FIND / C-MOVE 를 수행하는 DIMSE 백엔드 모듈입니다.
+
+- SubprocessBackend : 기존 방식대로 DCMTK findscu/movescu 프로세스를 실행하고 출력 텍스트를 파싱
+- PynetdicomBackend : pynetdicom 으로 프로세스 생성 없이 직접 Association 을 맺고
+                      응답 Identifier 를 구조화된 형태로 바로 반환
+
+두 백엔드는 같은 인터페이스(find/move)를 가지며,
+retrieve_options.yaml 의 retrieve_to_research.dimse_backend 값으로 선택합니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, TextIO
+import logging
+import re
+import subprocess
+import threading
+import time
+
+# ───── 내부 모듈 ─────
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+from nmdose.dimse.pool import AssociationError, AssociationPool, make_ssl_context
+from nmdose.tasks.findscu_parser import StudyRecord, iter_findscu_responses, parse_findscu_output
+from nmdose.utils.metrics import CFIND_RESPONSES, CFIND_SECONDS
+from nmdose.utils.profiler import add_time
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+# DIMSE 상태 코드
+STATUS_SUCCESS = 0x0000
+STATUS_PENDING = (0xFF00, 0xFF01)
+STATUS_WARNING = 0xB000
+
+
+@dataclass
+class FindResult:
+    """
+    C-FIND 한 번의 결과.
+    Attributes:
+      responses  (list[StudyRecord]): 응답별 {"GGGG,EEEE": 값} 레코드
+      status     (str): "SUCCESS" 또는 "FAILURE"
+      transcript (str): 로그/감사 기록용 텍스트
+    """
+    responses: list[StudyRecord]
+    status: str
+    transcript: str = ""
+
+
+@dataclass
+class MoveResult:
+    """
+    C-MOVE 한 번의 결과.
+    Attributes:
+      status        (str): "SUCCESS" 또는 "FAILURE"
+      pending_count (int): 받은 PENDING 응답 건수
+      remaining     (int | None): 마지막 응답의 남은 sub-operation 수 (모르면 None)
+      completed     (int): 완료된 sub-operation 수
+      failed        (int): 실패한 sub-operation 수
+      warning       (int): 경고 sub-operation 수
+      transcript    (str): 로그/감사 기록용 텍스트
+    """
+    status: str
+    pending_count: int = 0
+    remaining: int | None = None
+    completed: int = 0
+    failed: int = 0
+    warning: int = 0
+    transcript: str = ""
+
+
+def _find_modality(keys: dict[str, str]) -> str:
+    return keys.get("ModalitiesInStudy") or keys.get("Modality") or ""
+
+
+def observe_find(endpoint: str, modality: str, status: str, seconds: float, count: int) -> None:
+    """C-FIND 한 건을 메트릭에 반영 (nmdose.utils.metrics)"""
+    CFIND_SECONDS.labels(endpoint, modality, status).observe(seconds)
+    if count:
+        CFIND_RESPONSES.labels(endpoint, modality).inc(count)
+
+
+class FindStream:
+    """
+    C-FIND 응답을 도착하는 대로 하나씩 돌려주는 이터레이터.
+    끝까지 소비한 뒤 status, count, tail(마지막 로그 몇 줄)을 확인할 수 있습니다.
+    endpoint 를 주면 소비가 끝날 때(중단 포함) 응답 수와 소요 시간을 메트릭/프로파일(cfind.stream)에 남깁니다.
+    소요 시간은 응답을 받아 오는 데 걸린 시간의 합이며, 소비자가 yield 사이에서 기다린 시간은 포함하지 않습니다.
+    """
+
+    TAIL_LINES = 50
+
+    def __init__(self, producer: Callable[["FindStream"], Iterator[StudyRecord]],
+                 endpoint: str | None = None, modality: str = ""):
+        self.status = "PENDING"
+        self.count = 0
+        self.tail: deque[str] = deque(maxlen=self.TAIL_LINES)
+        self._producer = producer
+        self._endpoint = endpoint
+        self._modality = modality
+
+    def __iter__(self) -> Iterator[StudyRecord]:
+        if self._endpoint is None:
+            yield from self._iter_responses()
+            return
+        # 소비자(C-MOVE 스케줄러 feeder 등)가 yield 사이에서 기다린 시간은 빼고,
+        # 다음 응답을 받아 오는 데 걸린 시간만 더해 C-FIND 소요 시간으로 기록
+        busy = 0.0
+        responses = self._iter_responses()
+        try:
+            while True:
+                t0 = time.perf_counter()
+                try:
+                    attrs = next(responses)
+                except StopIteration:
+                    return
+                finally:
+                    busy += time.perf_counter() - t0
+                yield attrs
+        finally:
+            t0 = time.perf_counter()
+            responses.close()
+            busy += time.perf_counter() - t0
+            add_time("cfind.stream", busy)
+            observe_find(self._endpoint, self._modality, self.status, busy, self.count)
+
+    def _iter_responses(self) -> Iterator[StudyRecord]:
+        responses = self._producer(self)
+        try:
+            for attrs in responses:
+                self.count += 1
+                yield attrs
+        finally:
+            responses.close()   # 중간에 멈춰도 producer 의 정리(status 결정)를 먼저 끝냄
+
+
+MoveProgressCallback = Callable[["MoveResult"], None]
+
+# movescu -d 가 C-MOVE-RSP 마다 덤프하는 sub-operation 건수 줄 (e.g. "D: Remaining Suboperations : 12")
+_SUBOP_COUNT = re.compile(r"(Remaining|Completed|Failed|Warning) Suboperations\s*:\s*(\d+)", re.IGNORECASE)
+
+
+def parse_movescu_line(line: str, result: "MoveResult") -> bool:
+    """
+    movescu 출력 한 줄을 result 에 반영하고, 진행 상황이 바뀌었으면 True 를 돌려줍니다.
+    - "Move Response 3 (Pending)" 류의 응답 줄 → pending_count
+    - "Remaining Suboperations : 12" 류의 덤프 줄 → remaining/completed/failed/warning
+    """
+    match = _SUBOP_COUNT.search(line)
+    if match:
+        setattr(result, match.group(1).lower(), int(match.group(2)))
+        return True
+    lowered = line.lower()
+    if "move response" in lowered and "pending" in lowered:
+        result.pending_count += 1
+        return True
+    return False
+
+
+def _key_args(keys: dict[str, str]) -> list[str]:
+    """{키워드/태그: 값} → findscu/movescu 의 -k 인자 리스트"""
+    args: list[str] = []
+    for key, value in keys.items():
+        args += ["-k", f"{key}={value}"]
+    return args
+
+
+class SubprocessBackend:
+    """DCMTK findscu/movescu 를 호출 건마다 서브프로세스로 실행하는 백엔드"""
+
+    name = "subprocess"
+
+    def _run(self, cmd: list[str]) -> tuple[str, str]:
+        log.debug("▶ 실행: %s", " ".join(cmd))
+        try:
+            result = subprocess.run(cmd, check=True, capture_output=True,
+                                    text=True, encoding="utf-8", errors="replace")
+            std_text = (result.stdout or "") + (result.stderr or "")
+            status = "SUCCESS"
+        except subprocess.CalledProcessError as e:
+            std_text = (e.stdout or "") + (e.stderr or "")
+            status = "FAILURE"
+        except OSError as e:
+            std_text = str(e)
+            status = "FAILURE"
+        return std_text, status
+
+    def find(self, calling: DicomEndpoint, called: DicomEndpoint,
+             keys: dict[str, str]) -> FindResult:
+        cmd = [
+            "findscu", "-v", "-S",
+            "-aet", calling.aet, "-aec", called.aet,
+            called.ip, str(called.port),
+        ] + _key_args(keys)
+        t0 = time.perf_counter()
+        std_text, status = self._run(cmd)
+        result = FindResult(parse_findscu_output(std_text), status, std_text)
+        observe_find(called.aet, _find_modality(keys), status, time.perf_counter() - t0,
+                     len(result.responses))
+        return result
+
+    def iter_find(self, calling: DicomEndpoint, called: DicomEndpoint,
+                  keys: dict[str, str], transcript: TextIO | None = None) -> FindStream:
+        """
+        findscu 의 출력 파이프를 줄 단위로 읽으며 응답을 하나씩 돌려주는 스트리밍 C-FIND.
+        transcript 를 주면 읽은 줄을 그대로 기록합니다 (메모리에는 tail 몇 줄만 유지).
+        """
+        cmd = [
+            "findscu", "-v", "-S",
+            "-aet", calling.aet, "-aec", called.aet,
+            called.ip, str(called.port),
+        ] + _key_args(keys)
+
+        def produce(stream: FindStream) -> Iterator[StudyRecord]:
+            log.debug("▶ 실행(stream): %s", " ".join(cmd))
+            try:
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                        text=True, encoding="utf-8", errors="replace", bufsize=1)
+            except OSError as e:
+                stream.tail.append(str(e))
+                stream.status = "FAILURE"
+                return
+
+            def lines() -> Iterator[str]:
+                for line in proc.stdout:
+                    stream.tail.append(line.rstrip("\n"))
+                    if transcript is not None:
+                        transcript.write(line.replace("\x00", ""))
+                    yield line
+
+            try:
+                yield from iter_findscu_responses(lines())
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                proc.stdout.close()
+                returncode = proc.wait()
+                stream.status = "SUCCESS" if returncode == 0 else "FAILURE"
+
+        return FindStream(produce, called.aet, _find_modality(keys))
+
+    def move(self, calling: DicomEndpoint, called: DicomEndpoint,
+             keys: dict[str, str], on_progress: MoveProgressCallback | None = None) -> MoveResult:
+        """
+        movescu 출력을 줄 단위로 읽으며 C-MOVE-RSP 의 sub-operation 건수를 갱신합니다.
+        -d 로 실행해야 movescu 가 응답마다 Remaining/Completed/Failed/Warning 건수를 출력합니다.
+        -d 는 PDU·데이터셋 덤프까지 쏟아내므로, transcript 에는 -v 수준 줄(I:/W:/E: 등)과
+        건수가 읽힌 D: 줄만 남깁니다.
+        """
+        cmd = [
+            "movescu", "-v", "-d",
+            "-aet", calling.aet, "-aec", called.aet,
+            called.ip, str(called.port),
+        ] + _key_args(keys)
+        log.debug("▶ 실행(stream): %s", " ".join(cmd))
+        result = MoveResult(status="FAILURE")
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    text=True, encoding="utf-8", errors="replace", bufsize=1)
+        except OSError as e:
+            result.transcript = str(e)
+            return result
+
+        lines: list[str] = []
+        try:
+            for line in proc.stdout:
+                changed = parse_movescu_line(line, result)
+                if changed or not line.startswith("D:"):
+                    lines.append(line)
+                if changed and on_progress is not None:
+                    on_progress(result)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            returncode = proc.wait()
+        result.status = "SUCCESS" if returncode == 0 else "FAILURE"
+        result.transcript = "".join(lines)
+        return result
+
+    def close(self) -> None:
+        pass
+
+
+def dataset_to_record(ds) -> StudyRecord:
+    """pydicom Dataset → StudyRecord (findscu 출력 파싱 결과와 같은 형태)"""
+    def pairs():
+        for elem in ds:
+            value = elem.value
+            if value is None:
+                text = ""
+            elif elem.VM > 1:
+                text = "\\".join(str(v) for v in value)
+            else:
+                text = str(value)
+            yield f"{elem.tag.group:04X},{elem.tag.element:04X}", text.strip()
+
+    return StudyRecord.from_pairs(pairs())
+
+
+def build_identifier(keys: dict[str, str]):
+    """{키워드 또는 "GGGG,EEEE": 값} → C-FIND/C-MOVE Identifier Dataset"""
+    from pydicom.dataset import Dataset
+    from pydicom.datadict import dictionary_VR, tag_for_keyword
+    from pydicom.tag import Tag
+
+    ds = Dataset()
+    for key, value in keys.items():
+        if "," in key:
+            group, element = (int(part, 16) for part in key.split(","))
+            tag = Tag(group, element)
+        else:
+            tag_value = tag_for_keyword(key)
+            if tag_value is None:
+                raise KeyError(f"알 수 없는 DICOM 키워드: {key}")
+            tag = Tag(tag_value)
+        ds.add_new(tag, dictionary_VR(tag), value if value != "" else None)
+    return ds
+
+
+class PynetdicomBackend:
+    """
+    pynetdicom 으로 프로세스 내에서 C-FIND/C-MOVE 를 수행하는 백엔드.
+    pool_size > 0 이면 엔드포인트별 AssociationPool 에서 Association 을 빌려 재사용합니다.
+    """
+
+    name = "pynetdicom"
+
+    def __init__(self, acse_timeout: float = 30, dimse_timeout: float = 60,
+                 network_timeout: float = 60, pool_size: int = 0,
+                 idle_timeout: float = 300):
+        try:
+            import pynetdicom  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "pynetdicom 백엔드를 사용하려면 'pip install nmdose[dimse]' 로 pynetdicom 을 설치해야 합니다."
+            ) from e
+        self.acse_timeout = acse_timeout
+        self.dimse_timeout = dimse_timeout
+        self.network_timeout = network_timeout
+        self.pool = (
+            AssociationPool(self, max_size=pool_size, idle_timeout=idle_timeout)
+            if pool_size > 0 else None
+        )
+        self._aes: dict[str, object] = {}
+        self._ae_lock = threading.Lock()
+
+    def _make_ae(self, calling: DicomEndpoint, contexts):
+        """calling AET 별 AE 객체를 한 번만 만들어 재사용"""
+        from pynetdicom import AE
+
+        with self._ae_lock:
+            ae = self._aes.get(calling.aet)
+            if ae is None:
+                ae = AE(ae_title=calling.aet)
+                ae.acse_timeout = self.acse_timeout
+                ae.dimse_timeout = self.dimse_timeout
+                ae.network_timeout = self.network_timeout
+                for context in contexts:
+                    ae.add_requested_context(context)
+                self._aes[calling.aet] = ae
+        return ae
+
+    def associate(self, calling: DicomEndpoint, called: DicomEndpoint, tls_args=None):
+        """called 엔드포인트와 C-FIND/C-MOVE/C-ECHO 컨텍스트로 Association 을 맺어 반환"""
+        from pynetdicom.sop_class import (
+            StudyRootQueryRetrieveInformationModelFind,
+            StudyRootQueryRetrieveInformationModelMove,
+            Verification,
+        )
+
+        ae = self._make_ae(calling, [
+            StudyRootQueryRetrieveInformationModelFind,
+            StudyRootQueryRetrieveInformationModelMove,
+            Verification,
+        ])
+        if tls_args is None and called.enable_tls:
+            tls_args = (make_ssl_context(called), called.ip)
+        return ae.associate(called.ip, called.port, ae_title=called.aet, tls_args=tls_args)
+
+    def find_on(self, assoc, keys: dict[str, str]) -> FindResult:
+        """이미 맺어진 Association 위에서 C-FIND 수행"""
+        from pynetdicom.sop_class import StudyRootQueryRetrieveInformationModelFind
+
+        identifier = build_identifier(keys)
+        responses: list[StudyRecord] = []
+        lines: list[str] = []
+        status = "FAILURE"
+        for rsp_status, rsp_identifier in assoc.send_c_find(
+            identifier, StudyRootQueryRetrieveInformationModelFind
+        ):
+            if not rsp_status:
+                lines.append("E: C-FIND 응답 없음 (timeout/abort)")
+                status = "FAILURE"
+                break
+            code = rsp_status.Status
+            lines.append(f"I: Find Response: {len(lines) + 1} (0x{code:04X})")
+            if code in STATUS_PENDING:
+                if rsp_identifier is not None:
+                    responses.append(dataset_to_record(rsp_identifier))
+            else:
+                status = "SUCCESS" if code == STATUS_SUCCESS else "FAILURE"
+        return FindResult(responses, status, "\n".join(lines))
+
+    def iter_find_on(self, assoc, keys: dict[str, str], stream: FindStream) -> Iterator[StudyRecord]:
+        """이미 맺어진 Association 위에서 C-FIND 응답을 도착하는 대로 돌려줌"""
+        from pynetdicom.sop_class import StudyRootQueryRetrieveInformationModelFind
+
+        stream.status = "FAILURE"
+        for rsp_status, rsp_identifier in assoc.send_c_find(
+            build_identifier(keys), StudyRootQueryRetrieveInformationModelFind
+        ):
+            if not rsp_status:
+                stream.tail.append("E: C-FIND 응답 없음 (timeout/abort)")
+                stream.status = "FAILURE"
+                break
+            code = rsp_status.Status
+            stream.tail.append(f"I: Find Response: {stream.count + 1} (0x{code:04X})")
+            if code in STATUS_PENDING:
+                if rsp_identifier is not None:
+                    yield dataset_to_record(rsp_identifier)
+            else:
+                stream.status = "SUCCESS" if code == STATUS_SUCCESS else "FAILURE"
+
+    def move_on(self, assoc, calling: DicomEndpoint, keys: dict[str, str],
+                on_progress: MoveProgressCallback | None = None) -> MoveResult:
+        """
+        이미 맺어진 Association 위에서 C-MOVE 수행 (Move Destination = calling AET).
+        응답마다 sub-operation 건수를 갱신하고 on_progress(result) 를 호출합니다.
+        """
+        from pynetdicom.sop_class import StudyRootQueryRetrieveInformationModelMove
+
+        identifier = build_identifier(keys)
+        result = MoveResult(status="FAILURE")
+        lines: list[str] = []
+        for rsp_status, _ in assoc.send_c_move(
+            identifier, calling.aet, StudyRootQueryRetrieveInformationModelMove
+        ):
+            if not rsp_status:
+                lines.append("E: C-MOVE 응답 없음 (timeout/abort)")
+                result.status = "FAILURE"
+                break
+            code = rsp_status.Status
+            remaining = rsp_status.get("NumberOfRemainingSuboperations")
+            result.remaining = int(remaining) if remaining is not None else None
+            result.completed = int(rsp_status.get("NumberOfCompletedSuboperations", result.completed) or 0)
+            result.failed = int(rsp_status.get("NumberOfFailedSuboperations", result.failed) or 0)
+            result.warning = int(rsp_status.get("NumberOfWarningSuboperations", result.warning) or 0)
+            lines.append(
+                f"I: Move Response: 0x{code:04X} (remaining={result.remaining}, "
+                f"completed={result.completed}, failed={result.failed}, warning={result.warning})"
+            )
+            if code in STATUS_PENDING:
+                result.pending_count += 1
+                if on_progress is not None:
+                    on_progress(result)
+            else:
+                result.status = "SUCCESS" if code in (STATUS_SUCCESS, STATUS_WARNING) else "FAILURE"
+        result.transcript = "\n".join(lines)
+        return result
+
+    @contextmanager
+    def _association(self, calling: DicomEndpoint, called: DicomEndpoint):
+        """풀이 있으면 빌려오고, 없으면 호출 1건용 Association 을 맺었다가 해제"""
+        if self.pool is not None:
+            with self.pool.borrow(calling, called) as assoc:
+                yield assoc
+            return
+
+        assoc = self.associate(calling, called)
+        if not assoc.is_established:
+            raise AssociationError(f"Association 실패: {called.aet}@{called.ip}:{called.port}")
+        try:
+            yield assoc
+        finally:
+            assoc.release()
+
+    def find(self, calling: DicomEndpoint, called: DicomEndpoint,
+             keys: dict[str, str]) -> FindResult:
+        t0 = time.perf_counter()
+        try:
+            with self._association(calling, called) as assoc:
+                result = self.find_on(assoc, keys)
+        except AssociationError as e:
+            result = FindResult([], "FAILURE", f"E: {e}")
+        observe_find(called.aet, _find_modality(keys), result.status, time.perf_counter() - t0,
+                     len(result.responses))
+        return result
+
+    def iter_find(self, calling: DicomEndpoint, called: DicomEndpoint,
+                  keys: dict[str, str], transcript: TextIO | None = None) -> FindStream:
+        """응답 Identifier 를 도착하는 대로 하나씩 돌려주는 스트리밍 C-FIND"""
+
+        def produce(stream: FindStream) -> Iterator[StudyRecord]:
+            try:
+                with self._association(calling, called) as assoc:
+                    yield from self.iter_find_on(assoc, keys, stream)
+            except AssociationError as e:
+                stream.tail.append(f"E: {e}")
+                stream.status = "FAILURE"
+            if transcript is not None:
+                transcript.write("\n".join(stream.tail) + "\n")
+
+        return FindStream(produce, called.aet, _find_modality(keys))
+
+    def move(self, calling: DicomEndpoint, called: DicomEndpoint,
+             keys: dict[str, str], on_progress: MoveProgressCallback | None = None) -> MoveResult:
+        try:
+            with self._association(calling, called) as assoc:
+                return self.move_on(assoc, calling, keys, on_progress)
+        except AssociationError as e:
+            return MoveResult(status="FAILURE", transcript=f"E: {e}")
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+
+
+_BACKENDS = {
+    SubprocessBackend.name: SubprocessBackend,
+    PynetdicomBackend.name: PynetdicomBackend,
+}
+
+
+def get_dimse_backend(name: str | None = None):
+    """
+    이름에 해당하는 DIMSE 백엔드 인스턴스를 반환합니다.
+    name 을 생략하면 retrieve_options.yaml 의 retrieve_to_research.dimse_backend 값을 사용합니다.
+    """
+    from nmdose.config_loader.retrieve_options_loader import get_retrieve_config
+    cfg = get_retrieve_config().retrieve_to_research
+    if name is None:
+        name = cfg.dimse_backend
+
+    if name not in _BACKENDS:
+        raise ValueError(f"지원하지 않는 DIMSE 백엔드입니다: '{name}' (선택값: {', '.join(_BACKENDS)})")
+    log.info(f"▶ DIMSE 백엔드: {name}")
+    if name == PynetdicomBackend.name:
+        return PynetdicomBackend(pool_size=cfg.association_pool_size,
+                                 idle_timeout=cfg.association_idle_timeout)
+    return _BACKENDS[name]()
@@ -0,0 +1,221 @@
+# src/nmdose/dimse/pool.py
+
+"""
+pool.py
+
+(calling, called) DicomEndpoint 쌍마다 오래 유지되는 pynetdicom Association 을 관리하는 풀입니다.
+
+- max_size       : 엔드포인트별 동시에 열 수 있는 최대 Association 수 (초과 시 반납될 때까지 대기)
+- idle_timeout   : 이 시간(초) 이상 쉬던 Association 은 빌려주기 전에 정리
+- health_check   : health_check_interval(초) 이상 쉬던 Association 은 C-ECHO 로 상태 확인
+- TLS 세션 재사용 : enable_tls 엔드포인트는 SSLContext 와 마지막 TLS 세션을 보관했다가
+                   재연결 시 session resumption 으로 전체 핸드셰이크를 생략
+"""
+
+# ───── 표준 라이브러리 ─────
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+import logging
+import ssl
+import threading
+import time
+
+# ───── 내부 모듈 ─────
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+from nmdose.utils.metrics import track_pool
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+
+def make_ssl_context(endpoint: DicomEndpoint) -> ssl.SSLContext:
+    """enable_tls 엔드포인트용 클라이언트 SSLContext 생성 (상대 경로는 프로젝트 루트 기준)"""
+    context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+    if endpoint.cert_file:
+        cert_file = PROJECT_ROOT / endpoint.cert_file
+        key_file = PROJECT_ROOT / endpoint.key_file if endpoint.key_file else None
+        context.load_cert_chain(str(cert_file), str(key_file) if key_file else None)
+    return context
+
+
+class AssociationError(ConnectionError):
+    """Association 을 맺지 못했을 때 발생하는 예외"""
+
+
+class _SessionCachingContext:
+    """
+    SSLContext 를 감싸 wrap_socket 시 마지막 TLS 세션을 넘겨주는 래퍼.
+    pynetdicom 은 tls_args 의 context.wrap_socket() 만 호출하므로 duck typing 으로 충분합니다.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.session = None
+
+    def wrap_socket(self, sock, server_side=False, server_hostname=None):
+        return self.context.wrap_socket(
+            sock, server_side=server_side, server_hostname=server_hostname,
+            session=self.session,
+        )
+
+    def remember(self, assoc) -> None:
+        """맺어진 Association 의 TLS 세션을 다음 연결용으로 저장"""
+        try:
+            session = assoc.dul.socket.socket.session
+        except AttributeError:
+            return
+        if session is not None:
+            self.session = session
+
+
+class _Slot:
+    """엔드포인트 쌍 하나의 유휴 Association 목록과 사용 중 개수"""
+
+    def __init__(self):
+        self.idle: deque = deque()   # (assoc, 마지막 사용 시각)
+        self.in_use = 0
+
+
+class AssociationPool:
+    """(calling, called) 엔드포인트 쌍별 Association 풀"""
+
+    def __init__(self, backend, max_size: int = 4, idle_timeout: float = 300,
+                 health_check_interval: float = 30, acquire_timeout: float | None = None):
+        self.backend = backend
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+
+        self._slots: dict[tuple[DicomEndpoint, DicomEndpoint], _Slot] = {}
+        self._tls: dict[DicomEndpoint, _SessionCachingContext] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        track_pool(self)   # /metrics 의 nmdose_association_pool_* (약한 참조)
+
+    # ─── 내부 도우미 ─────────────────────────────────────────────────────────
+    def _tls_args(self, called: DicomEndpoint):
+        if not called.enable_tls:
+            return None
+        ctx = self._tls.get(called)
+        if ctx is None:
+            ctx = self._tls[called] = _SessionCachingContext(make_ssl_context(called))
+        return ctx, called.ip
+
+    def _open(self, calling: DicomEndpoint, called: DicomEndpoint):
+        tls_args = self._tls_args(called)
+        assoc = self.backend.associate(calling, called, tls_args=tls_args)
+        if not assoc.is_established:
+            raise AssociationError(f"Association 실패: {called.aet}@{called.ip}:{called.port}")
+        if tls_args:
+            tls_args[0].remember(assoc)
+        log.debug(f"▶ 새 Association: {calling.aet} → {called.aet}")
+        return assoc
+
+    def _healthy(self, assoc, last_used: float, now: float) -> bool:
+        if not assoc.is_established:
+            return False
+        if now - last_used > self.idle_timeout:
+            return False
+        if now - last_used > self.health_check_interval:
+            status = assoc.send_c_echo()
+            return bool(status) and status.Status == 0x0000
+        return True
+
+    @staticmethod
+    def _discard(assoc) -> None:
+        try:
+            if assoc.is_established:
+                assoc.release()
+            else:
+                assoc.abort()
+        except Exception as e:   # 이미 끊긴 연결 정리 중 오류는 무시
+            log.debug(f"Association 정리 중 오류 무시: {e}")
+
+    def _acquire(self, calling: DicomEndpoint, called: DicomEndpoint):
+        key = (calling, called)
+        deadline = None if self.acquire_timeout is None else time.monotonic() + self.acquire_timeout
+        stale = []
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("닫힌 AssociationPool 입니다.")
+            slot = self._slots.setdefault(key, _Slot())
+            while True:
+                if slot.idle:
+                    assoc, last_used = slot.idle.pop()
+                    slot.in_use += 1
+                    break
+                if slot.in_use < self.max_size:
+                    assoc = None
+                    slot.in_use += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise AssociationError(f"Association 대기 시간 초과: {called.aet}")
+                self._cond.wait(remaining)
+
+        # 네트워크 I/O 는 잠금 밖에서 수행
+        try:
+            while assoc is not None and not self._healthy(assoc, last_used, time.monotonic()):
+                stale.append(assoc)
+                with self._cond:
+                    assoc, last_used = slot.idle.pop() if slot.idle else (None, 0.0)
+            for old in stale:
+                self._discard(old)
+            if assoc is None:
+                assoc = self._open(calling, called)
+            return assoc
+        except BaseException:
+            with self._cond:
+                slot.in_use -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, calling: DicomEndpoint, called: DicomEndpoint, assoc, reusable: bool) -> None:
+        key = (calling, called)
+        keep = reusable and assoc.is_established
+        with self._cond:
+            slot = self._slots[key]
+            slot.in_use -= 1
+            if keep and not self._closed:
+                slot.idle.append((assoc, time.monotonic()))
+                assoc = None
+            self._cond.notify()
+        if assoc is not None:
+            self._discard(assoc)
+
+    # ─── 공개 API ───────────────────────────────────────────────────────────
+    @contextmanager
+    def borrow(self, calling: DicomEndpoint, called: DicomEndpoint):
+        """
+        Association 을 빌려 with 블록 동안 사용하고 반납합니다.
+        블록 안에서 예외가 나면 해당 Association 은 풀에 돌려놓지 않고 정리합니다.
+        """
+        assoc = self._acquire(calling, called)
+        reusable = False
+        try:
+            yield assoc
+            reusable = True
+        finally:
+            self._release(calling, called, assoc, reusable)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """엔드포인트별 {"idle": n, "in_use": n} 사용 현황"""
+        with self._cond:
+            return {
+                f"{calling.aet}->{called.aet}": {"idle": len(slot.idle), "in_use": slot.in_use}
+                for (calling, called), slot in self._slots.items()
+            }
+
+    def close(self) -> None:
+        """유휴 Association 을 모두 정리하고, 이후 반납되는 Association 도 닫습니다."""
+        with self._cond:
+            self._closed = True
+            idle = [assoc for slot in self._slots.values() for assoc, _ in slot.idle]
+            for slot in self._slots.values():
+                slot.idle.clear()
+        for assoc in idle:
+            self._discard(assoc)
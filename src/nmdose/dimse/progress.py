@@ -0,0 +1,147 @@
+# src/nmdose/dimse/progress.py
+
+"""
+progress.py
+
+진행 중인 C-MOVE 의 sub-operation 진행 상황을 모아 두는 메모리 내 진행 버스입니다.
+
+- 백엔드는 C-MOVE-RSP 를 받을 때마다 Remaining/Completed/Failed/Warning 건수를 MoveResult 에 갱신하고
+  on_progress 콜백을 호출합니다. MoveScheduler 가 이를 ProgressBus 에 전달합니다.
+- API(GET /api/moves)와 메트릭은 active()/recent() 스냅샷을 읽거나 subscribe() 로 변경을 받습니다.
+- 모든 메서드는 스레드 안전하며, 갱신은 dict 조회와 정수 대입 정도라 C-MOVE 루프에서 호출해도 부담이 없습니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable
+import logging
+import threading
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class MoveProgress:
+    """
+    C-MOVE 한 건의 진행 상황.
+    Attributes:
+      uid        (str): StudyInstanceUID
+      called_aet (str): C-MOVE 를 요청한 PACS AET
+      status     (str): "PENDING" / "SUCCESS" / "FAILURE"
+      responses  (int): 받은 C-MOVE-RSP 수
+      remaining  (int | None): 남은 sub-operation 수 (PACS 가 알려주지 않으면 None)
+      completed  (int): 완료된 sub-operation 수
+      failed     (int): 실패한 sub-operation 수
+      warning    (int): 경고 sub-operation 수
+    """
+    uid: str
+    called_aet: str
+    status: str = "PENDING"
+    responses: int = 0
+    remaining: int | None = None
+    completed: int = 0
+    failed: int = 0
+    warning: int = 0
+    started_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def total(self) -> int | None:
+        """전체 sub-operation 수 (remaining 을 모르면 None)"""
+        if self.remaining is None:
+            return None
+        return self.remaining + self.completed + self.failed + self.warning
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["total"] = self.total
+        data["started_at"] = self.started_at.isoformat()
+        data["updated_at"] = self.updated_at.isoformat()
+        return data
+
+
+ProgressListener = Callable[[str, MoveProgress], None]
+
+
+class ProgressBus:
+    """진행 중/최근 완료된 C-MOVE 진행 상황 저장소"""
+
+    def __init__(self, keep_finished: int = 200):
+        self._active: dict[str, MoveProgress] = {}
+        self._recent: deque[MoveProgress] = deque(maxlen=keep_finished)
+        self._listeners: list[ProgressListener] = []
+        self._lock = threading.Lock()
+
+    # ───── 백엔드/스케줄러에서 호출 ─────
+    def start(self, uid: str, called_aet: str) -> MoveProgress:
+        progress = MoveProgress(uid, called_aet)
+        with self._lock:
+            self._active[uid] = progress
+        self._emit("start", progress)
+        return progress
+
+    def update(self, uid: str, result) -> None:
+        """result(MoveResult) 의 현재 sub-operation 건수를 반영"""
+        with self._lock:
+            progress = self._active.get(uid)
+            if progress is None:
+                return
+            progress.responses = result.pending_count
+            progress.remaining = result.remaining
+            progress.completed = result.completed
+            progress.failed = result.failed
+            progress.warning = result.warning
+            progress.updated_at = datetime.now()
+        self._emit("update", progress)
+
+    def finish(self, uid: str, result) -> None:
+        """최종 결과를 반영하고 진행 중 목록에서 최근 완료 목록으로 옮김"""
+        self.update(uid, result)
+        with self._lock:
+            progress = self._active.pop(uid, None)
+            if progress is None:
+                return
+            progress.status = result.status
+            progress.remaining = 0 if result.status == "SUCCESS" else progress.remaining
+            self._recent.append(progress)
+        self._emit("finish", progress)
+
+    # ───── 조회/구독 ─────
+    def active(self) -> list[dict]:
+        with self._lock:
+            return [p.as_dict() for p in self._active.values()]
+
+    def recent(self) -> list[dict]:
+        with self._lock:
+            return [p.as_dict() for p in reversed(self._recent)]
+
+    def get(self, uid: str) -> dict | None:
+        with self._lock:
+            progress = self._active.get(uid) or next(
+                (p for p in reversed(self._recent) if p.uid == uid), None)
+            return progress.as_dict() if progress else None
+
+    def subscribe(self, listener: ProgressListener) -> Callable[[], None]:
+        """listener(event, progress) 를 등록하고 해제 함수를 돌려줍니다. event: start/update/finish"""
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+        return unsubscribe
+
+    def _emit(self, event: str, progress: MoveProgress) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(event, progress)
+            except Exception:
+                log.exception(f"❌ C-MOVE 진행 구독자 실행 실패: {listener!r}")
+
+
+# 프로세스 전역 진행 버스 (스케줄러 기본값, API 가 읽음)
+progress_bus = ProgressBus()
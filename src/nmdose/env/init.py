@@ -2,19 +2,64 @@
 
 # ───── 표준 라이브러리 ─────
 import os
+from dataclasses import dataclass
 from pathlib import Path
 import logging
 
 # ───── 내부 모듈 ─────
 from nmdose.config_loader.dotenv_loader import init_dotenv
-from nmdose.config_loader.retrieve_options_loader import get_retrieve_config
-from nmdose.config_loader.dicom_nodes_loader import get_nodes_config
-from nmdose.utils.date_utils import make_batch_date_range
+from nmdose.config_loader.retrieve_options_loader import get_retrieve_config, resolve_project_path
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint, get_nodes_config
 
 # ───── 로거 객체 생성 ─────
 log = logging.getLogger(__name__)
 
 
+@dataclass
+class AppEnvironment:
+    """
+    서버/스크립트가 공유하는 실행 환경.
+    PACS 엔드포인트와 modality 는 설정 레지스트리에서 매번 꺼내므로 설정 파일 변경이 바로 반영되고,
+    날짜 범위는 batch_status(DB)를 읽어야 하므로 필요할 때 date_range() 로 계산합니다.
+    Attributes:
+      log_dir (Path): 로그 세그먼트 디렉터리
+    """
+    log_dir: Path
+
+    def source_pacs(self) -> DicomEndpoint:
+        """조회/C-MOVE 대상 PACS — RUNNING_MODE 가 "1" 이면 simulation PACS, 아니면 clinical PACS"""
+        pacs = get_nodes_config()
+        return pacs.simulation if os.getenv("RUNNING_MODE") == "1" else pacs.clinical
+
+    def endpoints(self) -> tuple[DicomEndpoint, DicomEndpoint]:
+        """(calling, called) — calling 은 research PACS, called 는 source_pacs()"""
+        return get_nodes_config().research, self.source_pacs()
+
+    @property
+    def modalities(self) -> list[str]:
+        return get_retrieve_config().retrieve_to_research.modalities
+
+    def date_range(self) -> str:
+        """지금 시점의 StudyDate 범위 (batch_status 의 마지막 처리일 기준)"""
+        from nmdose.utils.date_utils import make_batch_date_range
+        return make_batch_date_range()
+
+
+def init_app_environment() -> AppEnvironment:
+    """
+    .env 를 로드하고 로그 디렉터리를 준비합니다. DB 에는 접속하지 않습니다.
+    """
+    # .env 파일부터 로드 (환경변수 우선)
+    init_dotenv()
+    log.info(f"▶ ENV RUNNING_MODE = {os.getenv('RUNNING_MODE')}")
+
+    # 로그 디렉터리 생성
+    log_dir = resolve_project_path(get_retrieve_config().retrieve_to_research.log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log.info(f"Log 디렉터리: {log_dir}")
+    return AppEnvironment(log_dir)
+
+
 def init_environment():
     """
     설정 파일을 로드하고, PACS 엔드포인트, 조회 파라미터 및 로그 디렉터리를 초기화합니다.
@@ -26,30 +71,13 @@ def init_environment():
       date_range: StudyDate 범위 문자열
       log_dir: 로그 파일을 저장할 디렉터리 경로
     """
-    # .env 파일부터 로드 (환경변수 우선)
-    init_dotenv()
-
-    # PACS 및 retrieve 설정 로드
-    PACS             = get_nodes_config()
-    RETRIEVE_OPTIONS = get_retrieve_config()
-
-    # PACS 엔드포인트 선택 (RUNNING_MODE env var 기반)
-    rm = os.getenv("RUNNING_MODE")
-    log.info(f"▶ ENV RUNNING_MODE = {rm}")
-    if rm == "1":
-        calling, called = PACS.research, PACS.simulation
-    else:
-        calling, called = PACS.research, PACS.clinical
+    env = init_app_environment()
+    calling, called = env.endpoints()
 
     # 조회할 modalities 및 날짜 범위
-    modalities = RETRIEVE_OPTIONS.retrieve_to_research.modalities
-    date_range = make_batch_date_range()
+    modalities = env.modalities
+    date_range = env.date_range()
     log.info(f"조회할 Modalities: {modalities}")
     log.info(f"StudyDate 범위: {date_range}")
 
-    # 로그 디렉터리 생성
-    log_dir = Path(r"C:\nmdose\logs\batch")
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log.info(f"Log 디렉터리 생성됨: {log_dir}")
-
-    return calling, called, modalities, date_range, log_dir
+    return calling, called, modalities, date_range, env.log_dir
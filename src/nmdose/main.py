@@ -1,28 +1,59 @@
 # src/nmdose/main.py
 
 # ───── 표준 라이브러리 ─────
-import sys
+import asyncio
 import logging
-import subprocess
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # ───── 서드파티 라이브러리 ─────
-from fastapi import FastAPI, Request, BackgroundTasks
+from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
 # ───── 내부 모듈 ─────
-from nmdose.env.init import init_environment
+from nmdose.api.jobs import router as jobs_router
+from nmdose.api.metrics import router as metrics_router
+from nmdose.api.moves import router as moves_router
 
 # ───── 로거 객체 생성 ─────
 log = logging.getLogger(__name__)
 
 
-# 1) 애플리케이션 환경 초기화 (PACS 정보, 날짜범위, 로그경로 등)
-CALLING, CALLED, MODALITIES, DATE_RANGE, LOG_DIR = init_environment()
+# 동시에 실행할 서버 작업 수 (C-FIND 미리보기 등)
+JOB_WORKERS = 2
+
+
+# 1) 애플리케이션 환경 초기화는 import 시점이 아니라 서버 시작(lifespan) 시점에 수행
+#    (설정/DB 접근 없이 import 가 끝나야 uvicorn 이 바로 포트를 열 수 있음)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from nmdose.config_loader.registry import registry
+    from nmdose.config_loader.retrieve_options_loader import CONFIG_FILE
+    from nmdose.api.job_manager import JobManager
+    from nmdose.dimse import get_dimse_backend
+    from nmdose.env.init import init_app_environment
+
+    app.state.env = init_app_environment()
+    app.state.backend = get_dimse_backend()      # 작업들이 함께 쓰는 DIMSE 백엔드 (Association 풀 공유)
+    app.state.jobs = JobManager(max_workers=JOB_WORKERS)
+    unsubscribe = registry.subscribe(
+        CONFIG_FILE,
+        lambda new, old: log.info(f"▶ retrieve_options.yaml 변경 반영: "
+                                  f"modalities={new.retrieve_to_research.modalities}"),
+    )
+    calling, called = app.state.env.endpoints()
+    log.info(f"▶ 서버 시작: calling={calling.aet}, called={called.aet}")
+    try:
+        yield
+    finally:
+        unsubscribe()
+        app.state.jobs.shutdown()
+        app.state.backend.close()
+
 
 # 2) FastAPI 앱 및 템플릿 엔진 설정
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 BASE_DIR = Path(__file__).resolve().parent
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 
@@ -32,17 +63,18 @@ async def dashboard(request: Request):
     log.debug("▶ 대시보드 호출됨")
     return templates.TemplateResponse("dashboard.html", {"request": request})
 
-# 4) 백엔드 처리: findscu_preview.py 실행 함수 (동기)
-def run_findscu(calling=CALLING, called=CALLED):
-    log.info(f"▶ findscu_preview.py 실행 시작: calling={calling.aet}, called={called.aet}")
-    project_root = Path(__file__).resolve().parents[2]
-    script_path = project_root / "scripts" / "findscu_preview.py"
-    subprocess.run([sys.executable, str(script_path)], check=True)
-    log.info("▶ findscu_preview.py 실행 완료")
-
-# 5) 라우터: API 호출 시 findscu 백그라운드 실행
-@app.post("/api/start-findscu")
-async def start_findscu(background_tasks: BackgroundTasks):
-    log.info("▶ /api/start-findscu 호출됨")
-    background_tasks.add_task(run_findscu)
-    return {"status": "started"}
+# 4) 라우터: 작업 API (POST /api/start-findscu, /api/jobs/...)
+app.include_router(jobs_router)
+
+# 4.1) 라우터: C-MOVE 진행 상황 (GET /api/moves, /api/moves/{uid})
+app.include_router(moves_router)
+
+# 4.2) 라우터: Prometheus 메트릭 (GET /metrics)
+app.include_router(metrics_router)
+
+# 5) 라우터: 현재 시점의 조회 날짜 범위 (batch_status 를 요청마다 읽으므로 서버 수명 동안 고정되지 않음)
+@app.get("/api/date-range")
+async def date_range(request: Request):
+    env = request.app.state.env
+    value = await asyncio.to_thread(env.date_range)
+    return {"date_range": value, "modalities": env.modalities}
@@ -0,0 +1,45 @@
+# src/nmdose/tasks/__init__.py
+
+"""
+C-FIND / C-MOVE 배치 작업 패키지
+
+공개 이름은 처음 사용할 때 해당 모듈을 import 합니다 (nmdose._lazy).
+"""
+
+from nmdose._lazy import lazy_exports
+
+_EXPORTS = {
+    "StudyRecord":            "findscu_parser",
+    "parse_findscu_output":   "findscu_parser",
+    "iter_findscu_responses": "findscu_parser",
+
+    "QuerySegment":           "find_splitter",
+    "SplittingFinder":        "find_splitter",
+
+    "MoveScheduler":          "move_scheduler",
+    "MoveOutcome":            "move_scheduler",
+    "get_move_workers":       "move_scheduler",
+
+    "RetrievedIndex":         "retrieved_index",
+    "RetrieveLedger":         "retrieve_ledger",
+
+    "MoveQueue":              "move_queue",
+    "MoveJob":                "move_queue",
+    "run_worker":             "move_worker",
+
+    "SeriesInfo":             "dose_retrieve",
+    "select_dose_series":     "dose_retrieve",
+    "retrieve_dose_series":   "dose_retrieve",
+    "retrieve_pet_first_images": "dose_retrieve",
+    "retrieve_for_dose":      "dose_retrieve",
+
+    "extract_dose":           "dose_extract",
+    "extract_dose_statistics": "dose_extract",
+
+    "FileManifest":           "study_indexer",
+    "index_studies":          "study_indexer",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
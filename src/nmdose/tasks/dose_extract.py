@@ -0,0 +1,402 @@
+# src/nmdose/tasks/dose_extract.py
+
+"""
+dose_extract.py
+
+dosePACS 로 받은 선량 SR(RDSR, Dose Report SR) 파일에서 선량 정보를 추출해
+dosepacs.dose_statistics 에 기록하는 배치 추출기입니다.
+
+- 수신 디렉터리를 재귀로 훑어 파일 경로만 모으고, 파싱은 ProcessPoolExecutor 워커 프로세스에 나눠 맡깁니다.
+- 워커는 먼저 SOP Class/SOPInstanceUID/문서 제목만 specific_tags 로 읽어 선량 SR 이 아니거나
+  이미 추출된 SOPInstanceUID 면 바로 건너뛰고, 대상만 stop_before_pixels 로 다시 읽어 content tree 를 훑습니다.
+- 결과 행은 batch_size 건씩 execute_values 다중 행 UPSERT(ON CONFLICT sop_instance_uid)로 기록하므로
+  같은 디렉터리를 다시 돌려도 새로 받은 객체만 추가됩니다 (force=True 면 전부 다시 추출해 갱신).
+- 기본 키가 study_instance_uid 였던 기존 테이블은 추출 전에 ensure_dose_statistics() 가
+  옛 기본 키를 내리고 sop_instance_uid 고유 인덱스를 만들어 ON CONFLICT 대상을 맞춥니다.
+- dose_data(jsonb) 구조:
+    report      : 문서 수준 항목 (Procedure reported, Device Observer Name 등)
+    accumulated : 누적 선량 컨테이너 항목 (CT Dose Length Product Total 등)
+    events      : 조사 이벤트(CT Acquisition 등)마다 하위 항목을 평탄화한 목록
+    dlp_total / ctdivol_max : 자주 조회하는 값 (mGy.cm / mGy, 없으면 null)
+  NUM 항목은 {"value": 숫자, "unit": UCUM 단위}, 같은 이름이 여러 번 나오면 목록으로 보관합니다.
+  NumericValue 가 없으면 value 는 null, 숫자 하나로 읽을 수 없으면(다중 값 등) 원문 문자열이며 보고서는 그대로 추출합니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+import json
+import logging
+import os
+
+# ───── 서드파티 라이브러리 ─────
+from psycopg2.extras import execute_values
+from pydicom.multival import MultiValue
+import pydicom
+
+# ───── 내부 모듈 ─────
+from nmdose.utils.profiler import span
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+
+EXTRACTED_BY = "nmdose.dose_extract/1"   # 추출 규칙이 바뀌면 올려서 어떤 버전으로 추출한 행인지 구분
+
+XRAY_DOSE_SR = "1.2.840.10008.5.1.4.1.1.88.67"
+RADIOPHARMACEUTICAL_DOSE_SR = "1.2.840.10008.5.1.4.1.1.88.68"
+DOSE_SR_CLASSES = {
+    XRAY_DOSE_SR,
+    RADIOPHARMACEUTICAL_DOSE_SR,
+    "1.2.840.10008.5.1.4.1.1.88.11",   # Basic Text SR
+    "1.2.840.10008.5.1.4.1.1.88.22",   # Enhanced SR
+    "1.2.840.10008.5.1.4.1.1.88.33",   # Comprehensive SR
+    "1.2.840.10008.5.1.4.1.1.88.34",   # Comprehensive 3D SR
+}
+# 문서 제목(ConceptNameCodeSequence) — 일반 SR 클래스는 제목이 선량 보고서일 때만 추출
+DOSE_REPORT_TITLES = {
+    "113701",   # X-Ray Radiation Dose Report
+    "113500",   # Radiopharmaceutical Radiation Dose Report
+}
+# 조사 이벤트 컨테이너 (나머지 최상위 컨테이너는 누적 선량으로 봄)
+EVENT_CONTAINERS = {
+    "113819",   # CT Acquisition
+    "113706",   # Irradiation Event X-Ray Data
+    "113502",   # Radiopharmaceutical Administration
+}
+DLP_TOTAL = "113813"      # CT Dose Length Product Total
+MEAN_CTDIVOL = "113830"   # Mean CTDIvol
+TARGET_REGION = "123014"  # Target Region
+
+# 워커가 먼저 읽는 헤더 태그 (선량 SR 여부/중복 판단용)
+PROBE_TAGS = ["SOPClassUID", "SOPInstanceUID", "Modality", "ConceptNameCodeSequence"]
+
+DOSE_STATISTICS_COLUMNS = (
+    "study_instance_uid", "series_instance_uid", "sop_instance_uid", "modality",
+    "study_date", "patient_id", "patient_sex", "patient_birth_date", "patient_age",
+    "body_part_examined", "manufacturer", "model_name",
+    "dose_data", "extracted_by",
+)
+
+# 기본 키가 sop_instance_uid 가 아니면 내리고, sop_instance_uid 에 고유 제약/인덱스가 없으면 만듭니다.
+_MIGRATE_DOSE_STATISTICS = """
+    ALTER TABLE dosepacs.dose_statistics ADD COLUMN IF NOT EXISTS sop_instance_uid text;
+    DO $$
+    DECLARE
+      tbl   regclass := 'dosepacs.dose_statistics'::regclass;
+      sop   smallint;
+      old_pk text;
+    BEGIN
+      SELECT attnum INTO sop FROM pg_attribute WHERE attrelid = tbl AND attname = 'sop_instance_uid';
+      SELECT conname INTO old_pk FROM pg_constraint
+       WHERE conrelid = tbl AND contype = 'p' AND conkey <> ARRAY[sop];
+      IF old_pk IS NOT NULL THEN
+        EXECUTE format('ALTER TABLE dosepacs.dose_statistics DROP CONSTRAINT %I', old_pk);
+      END IF;
+      IF NOT EXISTS (SELECT 1 FROM pg_constraint
+                      WHERE conrelid = tbl AND contype IN ('p', 'u') AND conkey = ARRAY[sop]) THEN
+        CREATE UNIQUE INDEX IF NOT EXISTS dose_statistics_sop_instance_uid_key
+            ON dosepacs.dose_statistics (sop_instance_uid);
+      END IF;
+    END $$;
+"""
+
+_LOAD_EXTRACTED = "SELECT sop_instance_uid FROM dosepacs.dose_statistics"
+
+_UPSERT_DOSE_STATISTICS = f"""
+    INSERT INTO dosepacs.dose_statistics ({", ".join(DOSE_STATISTICS_COLUMNS)}, extracted_at)
+    VALUES %s
+    ON CONFLICT (sop_instance_uid) DO UPDATE SET
+      {", ".join(f"{c} = EXCLUDED.{c}" for c in DOSE_STATISTICS_COLUMNS if c != "sop_instance_uid")},
+      extracted_at = now()
+"""
+_UPSERT_TEMPLATE = "(" + ", ".join(
+    "%s::jsonb" if c == "dose_data" else "%s" for c in DOSE_STATISTICS_COLUMNS) + ", now())"
+
+
+# ───── 파일 탐색 ─────
+def iter_dicom_files(root: str | Path) -> Iterator[Path]:
+    """root 아래 모든 일반 파일 경로 (storescp 수신 파일은 확장자가 없을 수 있어 이름으로 거르지 않음)"""
+    stack = [Path(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            log.warning(f"⚠ 디렉터리 읽기 실패: {directory} ({e})")
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(Path(entry.path))
+            elif entry.is_file():
+                yield Path(entry.path)
+
+
+# ───── content tree 파싱 ─────
+def _code(item, keyword: str = "ConceptNameCodeSequence") -> tuple[str, str]:
+    """(CodeValue, CodeMeaning) — 없으면 ("", "")"""
+    seq = item.get(keyword)
+    if not seq:
+        return "", ""
+    return str(seq[0].get("CodeValue", "")), str(seq[0].get("CodeMeaning", ""))
+
+
+def _parse_date(value) -> date | None:
+    text = str(value or "").strip()
+    try:
+        return datetime.strptime(text[:8], "%Y%m%d").date() if text else None
+    except ValueError:
+        return None
+
+
+def _number(value) -> float | str | None:
+    """NumericValue → float. 비어 있으면 None, 숫자 하나로 읽을 수 없으면(다중 값 등) 원문 문자열"""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        if isinstance(value, MultiValue):
+            return "\\".join(str(v) for v in value)
+        return str(value)
+
+
+def _value(item):
+    """content item 하나의 값 (CONTAINER 는 None)"""
+    value_type = item.get("ValueType", "")
+    if value_type == "NUM":
+        measured = item.get("MeasuredValueSequence")
+        if not measured:
+            return None
+        unit = _code(measured[0], "MeasurementUnitsCodeSequence")[0]
+        return {"value": _number(measured[0].get("NumericValue")), "unit": unit}
+    if value_type == "CODE":
+        return _code(item, "ConceptCodeSequence")[1]
+    if value_type == "TEXT":
+        return str(item.get("TextValue", ""))
+    if value_type == "UIDREF":
+        return str(item.get("UID", ""))
+    if value_type == "DATETIME":
+        return str(item.get("DateTime", ""))
+    if value_type == "DATE":
+        return str(item.get("Date", ""))
+    if value_type == "TIME":
+        return str(item.get("Time", ""))
+    if value_type == "PNAME":
+        return str(item.get("PersonName", ""))
+    return None
+
+
+def _put(target: dict, key: str, value) -> None:
+    """같은 이름이 다시 나오면 목록으로 모음"""
+    if key not in target:
+        target[key] = value
+    elif isinstance(target[key], list):
+        target[key].append(value)
+    else:
+        target[key] = [target[key], value]
+
+
+def _flatten(items, target: dict, codes: dict) -> dict:
+    """하위 content item 을 이름 → 값 으로 평탄화. codes 에는 CodeValue → 값 목록을 모음"""
+    for item in items or ():
+        code, name = _code(item)
+        if item.get("ValueType") == "CONTAINER":
+            _flatten(item.get("ContentSequence"), target, codes)
+            continue
+        value = _value(item)
+        if value is None or not name:
+            continue
+        _put(target, name, value)
+        codes.setdefault(code, []).append(value)
+        if item.get("ContentSequence"):
+            _flatten(item.ContentSequence, target, codes)
+    return target
+
+
+def _numbers(values) -> list[float]:
+    """NUM 값 목록 중 숫자로 읽힌 것만"""
+    return [v["value"] for v in values if isinstance(v, dict) and isinstance(v["value"], float)]
+
+
+def parse_dose_report(ds) -> tuple[dict, dict]:
+    """
+    선량 SR content tree → (dose_data, codes)
+      codes: CodeValue → 값 목록 (컬럼 보충용, 예: Target Region)
+    """
+    report: dict = {}
+    accumulated: dict = {}
+    events: list[dict] = []
+    codes: dict[str, list] = {}
+    for item in ds.get("ContentSequence") or ():
+        code = _code(item)[0]
+        if item.get("ValueType") == "CONTAINER":
+            if code in EVENT_CONTAINERS:
+                events.append(_flatten(item.get("ContentSequence"), {}, codes))
+            else:
+                _flatten(item.get("ContentSequence"), accumulated, codes)
+        else:
+            _flatten([item], report, codes)
+
+    dlp = _numbers(codes.get(DLP_TOTAL, ()))
+    ctdivol = _numbers(codes.get(MEAN_CTDIVOL, ()))
+    dose_data = {
+        "title": _code(ds)[1],
+        "report": report,
+        "accumulated": accumulated,
+        "events": events,
+        "dlp_total": dlp[0] if dlp else None,
+        "ctdivol_max": max(ctdivol) if ctdivol else None,
+    }
+    return dose_data, codes
+
+
+def is_dose_report(ds) -> bool:
+    """선량 SR 여부 (전용 SOP Class 이거나 일반 SR 의 문서 제목이 선량 보고서)"""
+    sop_class = str(ds.get("SOPClassUID", ""))
+    if sop_class in (XRAY_DOSE_SR, RADIOPHARMACEUTICAL_DOSE_SR):
+        return True
+    return sop_class in DOSE_SR_CLASSES and _code(ds)[0] in DOSE_REPORT_TITLES
+
+
+def extract_dose(ds, extracted_by: str = EXTRACTED_BY) -> dict:
+    """선량 SR 데이터셋 → dose_statistics 행(dict)"""
+    dose_data, codes = parse_dose_report(ds)
+    body_part = str(ds.get("BodyPartExamined", "") or "")
+    if not body_part and codes.get(TARGET_REGION):
+        body_part = str(codes[TARGET_REGION][0])
+    sop_class = str(ds.get("SOPClassUID", ""))
+    return {
+        "study_instance_uid": str(ds.get("StudyInstanceUID", "")),
+        "series_instance_uid": str(ds.get("SeriesInstanceUID", "")),
+        "sop_instance_uid": str(ds.get("SOPInstanceUID", "")),
+        "modality": "RDSR" if sop_class == XRAY_DOSE_SR else str(ds.get("Modality", "") or "SR"),
+        "study_date": _parse_date(ds.get("StudyDate")),
+        "patient_id": str(ds.get("PatientID", "")),
+        "patient_sex": str(ds.get("PatientSex", "")),
+        "patient_birth_date": _parse_date(ds.get("PatientBirthDate")),
+        "patient_age": str(ds.get("PatientAge", "")),
+        "body_part_examined": body_part or None,
+        "manufacturer": str(ds.get("Manufacturer", "")),
+        "model_name": str(ds.get("ManufacturerModelName", "")),
+        "dose_data": dose_data,
+        "extracted_by": extracted_by,
+    }
+
+
+# ───── 워커 프로세스 ─────
+_known: frozenset[str] = frozenset()
+_extracted_by = EXTRACTED_BY
+
+
+def _init_worker(known: frozenset[str], extracted_by: str) -> None:
+    """워커 프로세스마다 한 번: 이미 추출된 SOPInstanceUID 집합과 extracted_by 설정"""
+    global _known, _extracted_by
+    _known, _extracted_by = known, extracted_by
+
+
+def extract_file(path: str | Path) -> tuple[str, dict | None]:
+    """
+    파일 하나 처리 (워커 프로세스에서 실행)
+    반환: (상태, 행) — 상태: "extracted" / "skipped"(이미 추출) / "ignored"(선량 SR 아님) / "error"
+    """
+    try:
+        probe = pydicom.dcmread(path, stop_before_pixels=True, specific_tags=PROBE_TAGS)
+    except Exception as e:
+        log.debug(f"DICOM 헤더 읽기 실패: {path} ({e})")   # 수신 디렉터리의 DICOM 이 아닌 파일
+        return "error", None
+    if not is_dose_report(probe):
+        return "ignored", None
+    if str(probe.get("SOPInstanceUID", "")) in _known:
+        return "skipped", None
+    try:
+        ds = pydicom.dcmread(path, stop_before_pixels=True)
+        return "extracted", extract_dose(ds, _extracted_by)
+    except Exception as e:
+        log.warning(f"⚠ 선량 SR 추출 실패: {path} ({type(e).__name__}: {e})")
+        return "error", None
+
+
+# ───── DB ─────
+def ensure_dose_statistics(conn) -> None:
+    """
+    dose_statistics 를 sop_instance_uid 기준 UPSERT 가 가능한 형태로 맞추고 commit 합니다.
+    이미 맞춰진 테이블에는 아무것도 바꾸지 않으므로 매 실행마다 호출해도 됩니다.
+    """
+    with conn.cursor() as cur:
+        cur.execute(_MIGRATE_DOSE_STATISTICS)
+    conn.commit()
+
+
+def load_extracted(conn) -> set[str]:
+    """dose_statistics 에 이미 있는 SOPInstanceUID"""
+    with conn.cursor() as cur:
+        cur.execute(_LOAD_EXTRACTED)
+        uids = {row[0] for row in cur if row[0]}
+    conn.commit()
+    return uids
+
+
+def upsert_dose_statistics(conn, rows: list[dict], page_size: int = 500) -> int:
+    """rows 를 한 트랜잭션에 다중 행 UPSERT 하고 commit. 반환: 기록한 행 수"""
+    if not rows:
+        return 0
+    values = [
+        tuple(json.dumps(row[c], ensure_ascii=False) if c == "dose_data" else row[c]
+              for c in DOSE_STATISTICS_COLUMNS)
+        for row in rows
+    ]
+    with conn.cursor() as cur:
+        execute_values(cur, _UPSERT_DOSE_STATISTICS, values, template=_UPSERT_TEMPLATE, page_size=page_size)
+    conn.commit()
+    return len(values)
+
+
+def extract_dose_statistics(conn, root: str | Path, workers: int = 0, batch_size: int = 500,
+                            extracted_by: str = EXTRACTED_BY, force: bool = False,
+                            paths: Iterable[str | Path] | None = None) -> dict[str, int]:
+    """
+    root 아래 선량 SR 을 병렬로 추출해 dose_statistics 에 기록합니다.
+
+    Args:
+      conn         : psycopg2 커넥션
+      root         : 수신 파일 디렉터리
+      workers      (int): 워커 프로세스 수 (0 = CPU 수)
+      batch_size   (int): 한 번에 UPSERT 할 행 수
+      extracted_by (str): 행에 남길 추출기 이름/버전
+      force        (bool): True 면 이미 추출된 객체도 다시 추출해 갱신
+      paths        : 지정하면 root 를 훑지 않고 이 파일들만 처리
+
+    Returns:
+      {"extracted", "skipped", "ignored", "error", "written"} 건수
+    """
+    counts = dict.fromkeys(("extracted", "skipped", "ignored", "error", "written"), 0)
+    with span("dose_extract.ensure_table"):
+        ensure_dose_statistics(conn)
+    with span("dose_extract.load_extracted"):
+        known = frozenset() if force else frozenset(load_extracted(conn))
+    files = [str(p) for p in (paths if paths is not None else iter_dicom_files(root))]
+    log.info(f"▶ 선량 SR 추출: 파일 {len(files)}개, 기존 {len(known)}건")
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, min(64, len(files) // (workers * 4) or 1))
+    pending: dict[str, dict] = {}   # SOPInstanceUID → 행 (같은 객체 사본이 여러 파일이면 한 번만)
+    with span("dose_extract.run"), ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(known, extracted_by)) as pool:
+        for status, row in pool.map(extract_file, files, chunksize=chunksize):
+            counts[status] += 1
+            if row is None or not row["sop_instance_uid"]:
+                continue
+            pending[row["sop_instance_uid"]] = row
+            if len(pending) >= batch_size:
+                with span("dose_extract.upsert"):
+                    counts["written"] += upsert_dose_statistics(conn, list(pending.values()), batch_size)
+                pending.clear()
+        if pending:
+            with span("dose_extract.upsert"):
+                counts["written"] += upsert_dose_statistics(conn, list(pending.values()), batch_size)
+
+    log.info(f"▶ 선량 SR 추출 완료: {counts}")
+    return counts
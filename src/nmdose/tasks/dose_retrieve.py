@@ -0,0 +1,276 @@
+# src/nmdose/tasks/dose_retrieve.py
+
+"""
+dose_retrieve.py
+
+선량 분석에 필요한 Series 만 골라 dosePACS 로 가져오는 SERIES 수준 C-FIND + 선택적 C-MOVE 입니다.
+
+- Study 전체 대신 retrieve_options.yaml 의 retrieve_to_dose 조건에 맞는 Series
+  (Dose SR, Dose Report/Patient Protocol secondary capture 등)만 C-MOVE 하므로
+  CT/PET Study 한 건의 전송량이 수백 MB 에서 수 KB 수준으로 줄어듭니다.
+- 조건은 사용하도록 켠(ct_enable_*) 항목 중 하나라도 맞으면 선택합니다 (OR).
+  SeriesDescription 은 대소문자 무시 부분 일치, SeriesNumber 는 정확히 일치로 비교합니다.
+- PET 은 선량 추출에 방사성의약품/투여량 헤더만 필요하므로, pet_enable_single_axial_first_image 가 켜져 있으면
+  axial PT Series 마다 IMAGE 수준 C-FIND 로 InstanceNumber 가 가장 작은 영상 하나만 골라 그 SOP Instance 만 C-MOVE 합니다.
+- C-MOVE 목적지는 calling AET 이므로 calling 에 dosePACS 엔드포인트를 넘깁니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import time
+
+# ───── 내부 모듈 ─────
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+from nmdose.config_loader.retrieve_options_loader import RetrieveToDoseConfig
+from nmdose.tasks.move_scheduler import MoveOutcome
+from nmdose.utils.metrics import observe_move
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+# SERIES 수준 C-FIND 에서 돌려받을 태그
+SERIES_TAGS = {
+    "0020,000E": "",   # SeriesInstanceUID
+    "0008,0060": "",   # Modality
+    "0008,103E": "",   # SeriesDescription
+    "0020,0011": "",   # SeriesNumber
+    "0020,1209": "",   # NumberOfSeriesRelatedInstances
+}
+
+
+# IMAGE 수준 C-FIND 에서 돌려받을 태그
+IMAGE_TAGS = {
+    "0008,0018": "",   # SOPInstanceUID
+    "0020,0013": "",   # InstanceNumber
+    "0008,0008": "",   # ImageType
+    "0020,0037": "",   # ImageOrientationPatient (PACS 가 지원하지 않으면 비어 옴)
+}
+
+# axial 이 아닌 PET Series/영상을 나타내는 ImageType 값과 SeriesDescription 단어
+NON_AXIAL_IMAGE_TYPES = {"REFORMATTED", "MIP", "PROJECTION IMAGE", "SCREEN SHOT"}
+NON_AXIAL_DESCRIPTIONS = ("mip", "coronal", "sagittal", "cor ", "sag ")
+
+# axial 로 볼 슬라이스 법선의 z 성분 하한 (|cos|, 약 25° 기울기까지 허용)
+AXIAL_MIN_COSINE = 0.9
+
+
+@dataclass
+class SeriesInfo:
+    """
+    SERIES 수준 C-FIND 응답 한 건.
+    Attributes:
+      study_uid   (str): StudyInstanceUID
+      series_uid  (str): SeriesInstanceUID
+      modality    (str): Modality (e.g. SR, OT, CT, PT)
+      description (str): SeriesDescription
+      number      (str): SeriesNumber
+      instances   (int | None): NumberOfSeriesRelatedInstances (PACS 가 주지 않으면 None)
+    """
+    study_uid: str
+    series_uid: str
+    modality: str = ""
+    description: str = ""
+    number: str = ""
+    instances: int | None = None
+
+    @classmethod
+    def from_record(cls, study_uid: str, attrs: dict[str, str]) -> "SeriesInfo":
+        instances = (attrs.get("0020,1209") or "").strip()
+        return cls(
+            study_uid=study_uid,
+            series_uid=(attrs.get("0020,000E") or "").replace("\x00", "").strip(),
+            modality=(attrs.get("0008,0060") or "").strip(),
+            description=(attrs.get("0008,103E") or "").strip(),
+            number=(attrs.get("0020,0011") or "").strip(),
+            instances=int(instances) if instances.isdigit() else None,
+        )
+
+
+def build_series_find_keys(study_uid: str) -> dict[str, str]:
+    """Study 한 건의 Series 목록을 묻는 SERIES 수준 C-FIND 키"""
+    return {"QueryRetrieveLevel": "SERIES", "StudyInstanceUID": study_uid, **SERIES_TAGS}
+
+
+def find_series(backend, calling: DicomEndpoint, called: DicomEndpoint,
+                study_uid: str) -> list[SeriesInfo]:
+    """SERIES 수준 C-FIND. 실패하면 빈 목록을 돌려주고 경고를 남깁니다."""
+    result = backend.find(calling, called, build_series_find_keys(study_uid))
+    if result.status != "SUCCESS":
+        log.warning(f"⚠ SERIES C-FIND 실패: {study_uid}")
+    series = [SeriesInfo.from_record(study_uid, attrs) for attrs in result.responses]
+    return [s for s in series if s.series_uid]
+
+
+def is_dose_series(series: SeriesInfo, cfg: RetrieveToDoseConfig) -> bool:
+    """retrieve_to_dose 의 ct_* 조건 중 켜진 항목 하나라도 맞으면 True"""
+    if cfg.ct_enable_modalities_in_series and series.modality.upper() in {
+            m.upper() for m in cfg.ct_modalities_in_series}:
+        return True
+    if cfg.ct_enable_series_description:
+        description = series.description.lower()
+        if any(text.lower() in description for text in cfg.ct_series_description if text):
+            return True
+    if cfg.ct_enable_series_number and series.number in {str(n).strip() for n in cfg.ct_series_number}:
+        return True
+    return False
+
+
+def select_dose_series(series: list[SeriesInfo], cfg: RetrieveToDoseConfig) -> list[SeriesInfo]:
+    return [s for s in series if is_dose_series(s, cfg)]
+
+
+def is_axial_pet_series(series: SeriesInfo) -> bool:
+    """PT Series 중 MIP/coronal/sagittal 재구성이 아닌 것"""
+    if series.modality.upper() != "PT":
+        return False
+    description = f"{series.description.lower()} "
+    return not any(word in description for word in NON_AXIAL_DESCRIPTIONS)
+
+
+def is_axial_image(attrs: dict[str, str]) -> bool:
+    """
+    IMAGE 수준 응답이 axial 영상인지 판단합니다.
+    ImageType 에 재구성/MIP 표시가 있으면 제외하고, ImageOrientationPatient 가 있으면
+    행/열 방향 코사인의 외적(슬라이스 법선)이 z 축에 가까운지 확인합니다. 방향 정보가 없으면 axial 로 봅니다.
+    """
+    image_type = {part.strip().upper() for part in (attrs.get("0008,0008") or "").split("\\")}
+    if image_type & NON_AXIAL_IMAGE_TYPES:
+        return False
+    orientation = (attrs.get("0020,0037") or "").split("\\")
+    if len(orientation) != 6:
+        return True
+    try:
+        rx, ry, rz, cx, cy, cz = (float(v) for v in orientation)
+    except ValueError:
+        return True
+    normal_z = rx * cy - ry * cx
+    return abs(normal_z) >= AXIAL_MIN_COSINE
+
+
+def _instance_number(attrs: dict[str, str]) -> int | None:
+    value = (attrs.get("0020,0013") or "").strip()
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def find_first_axial_image(backend, calling: DicomEndpoint, called: DicomEndpoint,
+                           series: SeriesInfo) -> str | None:
+    """
+    IMAGE 수준 C-FIND 로 Series 의 axial 영상 중 InstanceNumber 가 가장 작은 SOPInstanceUID 를 찾습니다.
+    응답은 스트리밍으로 읽으며 최솟값만 유지하므로 영상 수와 관계없이 메모리 사용량이 일정합니다.
+    InstanceNumber 가 없는 영상은 번호가 있는 영상이 하나도 없을 때만 첫 응답을 사용합니다.
+    """
+    stream = backend.iter_find(calling, called, {
+        "QueryRetrieveLevel": "IMAGE",
+        "StudyInstanceUID": series.study_uid,
+        "SeriesInstanceUID": series.series_uid,
+        **IMAGE_TAGS,
+    })
+    best_uid, best_number, fallback_uid = None, None, None
+    for attrs in stream:
+        sop_uid = (attrs.get("0008,0018") or "").replace("\x00", "").strip()
+        if not sop_uid or not is_axial_image(attrs):
+            continue
+        number = _instance_number(attrs)
+        if number is None:
+            fallback_uid = fallback_uid or sop_uid
+        elif best_number is None or number < best_number:
+            best_uid, best_number = sop_uid, number
+    if stream.status != "SUCCESS":
+        log.warning(f"⚠ IMAGE C-FIND 실패: {series.series_uid} ({stream.count}건 수신)")
+    return best_uid or fallback_uid
+
+
+def move_series(backend, calling: DicomEndpoint, called: DicomEndpoint,
+                series: SeriesInfo, modality: str = "") -> MoveOutcome:
+    """SERIES 수준 C-MOVE 한 건 (목적지 = calling AET)"""
+    ts_start = datetime.now()
+    t0 = time.perf_counter()
+    result = backend.move(calling, called, {
+        "QueryRetrieveLevel": "SERIES",
+        "StudyInstanceUID": series.study_uid,
+        "SeriesInstanceUID": series.series_uid,
+    })
+    outcome = MoveOutcome(series.series_uid, result, ts_start, int((time.perf_counter() - t0) * 1000))
+    observe_move(outcome, called.aet, modality or series.modality)
+    return outcome
+
+
+def move_image(backend, calling: DicomEndpoint, called: DicomEndpoint,
+               series: SeriesInfo, sop_instance_uid: str, modality: str = "") -> MoveOutcome:
+    """IMAGE 수준 C-MOVE 한 건 (SOP Instance 하나, 목적지 = calling AET)"""
+    ts_start = datetime.now()
+    t0 = time.perf_counter()
+    result = backend.move(calling, called, {
+        "QueryRetrieveLevel": "IMAGE",
+        "StudyInstanceUID": series.study_uid,
+        "SeriesInstanceUID": series.series_uid,
+        "SOPInstanceUID": sop_instance_uid,
+    })
+    outcome = MoveOutcome(sop_instance_uid, result, ts_start, int((time.perf_counter() - t0) * 1000))
+    observe_move(outcome, called.aet, modality or series.modality)
+    return outcome
+
+
+def retrieve_pet_first_images(backend, calling: DicomEndpoint, called: DicomEndpoint,
+                              study_uid: str, modality: str = "",
+                              series: list[SeriesInfo] | None = None) -> list[tuple[SeriesInfo, MoveOutcome]]:
+    """
+    Study 의 axial PT Series 마다 첫 영상(최소 InstanceNumber) 하나만 C-MOVE 합니다.
+    series 를 주면 SERIES 수준 C-FIND 를 다시 하지 않습니다.
+    """
+    if series is None:
+        series = find_series(backend, calling, called, study_uid)
+
+    results = []
+    for item in filter(is_axial_pet_series, series):
+        sop_uid = find_first_axial_image(backend, calling, called, item)
+        if sop_uid is None:
+            log.warning(f"⚠ {item.series_uid}: axial 영상을 찾지 못해 건너뜀")
+            continue
+        outcome = move_image(backend, calling, called, item, sop_uid, modality)
+        log.info(f"  C-MOVE IMAGE {sop_uid} [PT #{item.number} {item.description}, "
+                 f"Series {item.instances or '?'}장 중 1장] → {outcome.result.status}")
+        results.append((item, outcome))
+    return results
+
+
+def retrieve_for_dose(backend, calling: DicomEndpoint, called: DicomEndpoint,
+                      study_uid: str, cfg: RetrieveToDoseConfig,
+                      modality: str = "") -> list[tuple[SeriesInfo, MoveOutcome]]:
+    """
+    Study 한 건에서 선량 추출에 필요한 것만 가져옵니다 (SERIES 수준 C-FIND 는 한 번).
+    - retrieve_to_dose 조건에 맞는 선량 Series 전체
+    - pet_enable_single_axial_first_image 가 켜져 있으면 axial PT Series 별 첫 영상 하나
+    """
+    series = find_series(backend, calling, called, study_uid)
+    results = retrieve_dose_series(backend, calling, called, study_uid, cfg, modality, series)
+    if cfg.pet_enable_single_axial_first_image:
+        results += retrieve_pet_first_images(backend, calling, called, study_uid, modality, series)
+    return results
+
+
+def retrieve_dose_series(backend, calling: DicomEndpoint, called: DicomEndpoint,
+                         study_uid: str, cfg: RetrieveToDoseConfig, modality: str = "",
+                         series: list[SeriesInfo] | None = None) -> list[tuple[SeriesInfo, MoveOutcome]]:
+    """
+    Study 한 건의 선량 Series 만 C-MOVE 합니다.
+    series 를 주면 SERIES 수준 C-FIND 를 다시 하지 않습니다.
+    반환: [(선택된 Series, C-MOVE 결과), ...] — 맞는 Series 가 없으면 빈 목록
+    """
+    if series is None:
+        series = find_series(backend, calling, called, study_uid)
+    selected = select_dose_series(series, cfg)
+    log.info(f"▶ {study_uid}: Series {len(series)}개 중 선량 Series {len(selected)}개 선택")
+
+    results = []
+    for item in selected:
+        outcome = move_series(backend, calling, called, item, modality)
+        log.info(f"  C-MOVE SERIES {item.series_uid} [{item.modality} #{item.number} "
+                 f"{item.description}] → {outcome.result.status} ({outcome.duration_ms}ms)")
+        results.append((item, outcome))
+    return results
@@ -0,0 +1,177 @@
+# src/nmdose/tasks/find_splitter.py
+
+"""
+find_splitter.py
+
+C-FIND 결과가 PACS 의 최대 응답 건수 제한에 걸리거나 응답이 너무 느릴 때
+조회 범위를 자동으로 나누어 다시 조회하는 모듈입니다.
+
+- 응답 건수가 max_results 에 도달하거나 latency_budget_sec 를 넘기면 진행 중인 C-FIND 를 중단하고
+  StudyDate 범위를 반으로 나눠 각각 다시 조회 (재귀)
+- 하루 단위까지 나눈 뒤에도 부족하면 StudyTime 범위를 반으로 나눔 (min_time_slot_min 분까지)
+- 모든 하위 조회 결과는 StudyInstanceUID 기준으로 중복 제거하여 도착하는 대로 돌려줍니다.
+  (중단된 조회에서 이미 받은 응답도 버리지 않고 사용)
+
+주의: StudyTime 으로 나누어 조회하면 StudyTime 값이 비어 있는 스터디는 PACS 구현에 따라 매칭되지 않을 수 있습니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Iterator, TextIO
+import logging
+import time
+
+# ───── 내부 모듈 ─────
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+from nmdose.dimse.backends import FindStream
+from nmdose.tasks.findscu_parser import StudyRecord
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+_DAY_MINUTES = 24 * 60
+
+
+@dataclass(frozen=True)
+class QuerySegment:
+    """
+    C-FIND 한 번이 담당하는 조회 범위.
+    Attributes:
+      start_date (date): StudyDate 시작일
+      end_date   (date): StudyDate 종료일
+      start_min  (int | None): StudyTime 시작(자정 기준 분). None 이면 StudyTime 조건 없음
+      end_min    (int | None): StudyTime 끝(분, 미포함)
+    """
+    start_date: date
+    end_date: date
+    start_min: int | None = None
+    end_min: int | None = None
+
+    @classmethod
+    def from_date_range(cls, date_range: str) -> "QuerySegment | None":
+        """'YYYYMMDD-YYYYMMDD' 또는 'YYYYMMDD' → QuerySegment. 열린 범위 등 나눌 수 없는 형식이면 None"""
+        parts = date_range.split("-")
+        try:
+            if len(parts) == 1:
+                day = datetime.strptime(parts[0], "%Y%m%d").date()
+                return cls(day, day)
+            if len(parts) == 2 and parts[0] and parts[1]:
+                return cls(datetime.strptime(parts[0], "%Y%m%d").date(),
+                           datetime.strptime(parts[1], "%Y%m%d").date())
+        except ValueError:
+            pass
+        return None
+
+    @property
+    def study_date(self) -> str:
+        if self.start_date == self.end_date:
+            return self.start_date.strftime("%Y%m%d")
+        return f"{self.start_date:%Y%m%d}-{self.end_date:%Y%m%d}"
+
+    @property
+    def study_time(self) -> str | None:
+        if self.start_min is None:
+            return None
+        last = self.end_min - 1
+        return (f"{self.start_min // 60:02d}{self.start_min % 60:02d}00-"
+                f"{last // 60:02d}{last % 60:02d}59")
+
+    def split(self, min_time_slot_min: int) -> list["QuerySegment"]:
+        """범위를 반으로 나눈 두 구간. 더 나눌 수 없으면 빈 리스트"""
+        if self.start_date < self.end_date:
+            mid = self.start_date + timedelta(days=(self.end_date - self.start_date).days // 2)
+            return [QuerySegment(self.start_date, mid),
+                    QuerySegment(mid + timedelta(days=1), self.end_date)]
+
+        start, end = (0, _DAY_MINUTES) if self.start_min is None else (self.start_min, self.end_min)
+        if end - start <= min_time_slot_min:
+            return []
+        mid = start + (end - start) // 2
+        return [QuerySegment(self.start_date, self.end_date, start, mid),
+                QuerySegment(self.start_date, self.end_date, mid, end)]
+
+    def __str__(self) -> str:
+        return self.study_date + (f" {self.study_time}" if self.study_time else "")
+
+
+class SplittingFinder:
+    """
+    백엔드의 iter_find 를 감싸 응답 건수 상한/지연 예산을 넘는 조회를 자동으로 나누는 C-FIND 실행기.
+    max_results 와 latency_budget_sec 가 모두 0 이면 백엔드 iter_find 와 같이 한 번만 조회합니다.
+    """
+
+    def __init__(self, backend, calling: DicomEndpoint, called: DicomEndpoint,
+                 max_results: int = 0, latency_budget_sec: float = 0,
+                 min_time_slot_min: int = 60):
+        self.backend = backend
+        self.calling = calling
+        self.called = called
+        self.max_results = max_results
+        self.latency_budget_sec = latency_budget_sec
+        self.min_time_slot_min = max(1, min_time_slot_min)
+
+    def iter_find(self, keys: dict[str, str], transcript: TextIO | None = None) -> FindStream:
+        """
+        keys["StudyDate"] 범위를 필요에 따라 나누어 조회하고, 중복 제거한 응답을 도착하는 대로 돌려줍니다.
+        반환 객체는 백엔드 iter_find 와 같은 FindStream 이며, status 는 끝까지 조회한 모든 하위 조회가
+        성공했을 때만 "SUCCESS" 입니다.
+        """
+        root = QuerySegment.from_date_range(keys.get("StudyDate", ""))
+        # StudyTime 조건이 이미 있으면 StudyTime 으로는 나누지 않음
+        time_fixed = bool(keys.get("StudyTime"))
+
+        def produce(stream: FindStream) -> Iterator[StudyRecord]:
+            seen: set[str] = set()
+            statuses: list[str] = []
+
+            def run(segment: QuerySegment | None) -> Iterator[StudyRecord]:
+                sub_keys = dict(keys)
+                if segment is not None:
+                    sub_keys["StudyDate"] = segment.study_date
+                    if segment.study_time:
+                        sub_keys["StudyTime"] = segment.study_time
+
+                children = []
+                if segment is not None:
+                    children = segment.split(self.min_time_slot_min)
+                    if time_fixed and segment.start_date == segment.end_date:
+                        children = []
+
+                sub = self.backend.iter_find(self.calling, self.called, sub_keys, transcript=transcript)
+                responses = iter(sub)
+                t0 = time.monotonic()
+                received, reason = 0, None
+                try:
+                    for record in responses:
+                        received += 1
+                        uid = record.get("0020,000D", "")
+                        if not uid or uid not in seen:
+                            seen.add(uid)
+                            yield record
+                        if children and self.max_results and received >= self.max_results:
+                            reason = f"응답 {received}건 (상한 {self.max_results})"
+                            break
+                        if (children and self.latency_budget_sec
+                                and time.monotonic() - t0 > self.latency_budget_sec):
+                            reason = f"{self.latency_budget_sec}s 초과"
+                            break
+                finally:
+                    responses.close()
+
+                if reason is not None:
+                    stream.tail.append(f"I: C-FIND {segment}: {reason} → {len(children)}개 구간으로 분할")
+                    log.info(f"✂ C-FIND {segment}: {reason} → 분할 {', '.join(map(str, children))}")
+                    for child in children:
+                        yield from run(child)
+                    return
+
+                if self.max_results and received >= self.max_results:
+                    log.warning(f"⚠ C-FIND {segment}: 응답이 상한({self.max_results})에 도달했지만 더 나눌 수 없습니다")
+                statuses.append(sub.status)
+                stream.tail.extend(sub.tail)
+
+            yield from run(root)
+            stream.status = "SUCCESS" if statuses and all(s == "SUCCESS" for s in statuses) else "FAILURE"
+
+        return FindStream(produce)
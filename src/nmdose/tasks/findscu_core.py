@@ -1,52 +1,44 @@
-import re
-import subprocess
 from datetime import datetime
 import yaml
 
 from nmdose.utils import make_batch_date_range
+from nmdose.dimse import get_dimse_backend
+from nmdose.tasks.findscu_parser import parse_findscu_output  # noqa: F401  (기존 import 경로 유지)
 
 
-def run_findscu_query(source, target, date_range, modalities, tags):
+def run_findscu_query(source, target, date_range, modalities, tags, backend=None):
     """
-    실행: findscu C-FIND, Study 레벨.
-    반환: {tag: (VR, value), ...}
+    실행: C-FIND, Study 레벨.
+    backend 를 생략하면 설정된 DIMSE 백엔드를 사용합니다.
+    반환: {tag: value, ...} (모든 응답에서 받은 태그의 합집합)
     """
     ts_start = datetime.now()
     print(f"[DEBUG] run_findscu_query START: {ts_start}")
 
-    cmd = [
-        'findscu', '-v', '-S',
-        '-aet', source.aet, '-aec', target.aet,
-        target.ip, str(target.port),
-        '-k', f'StudyDate={date_range}'
-    ]
-    for m in modalities:
-        cmd.extend(['-k', f'ModalitiesInStudy={m}'])
+    backend = backend or get_dimse_backend()
+    keys = {
+        "QueryRetrieveLevel": "STUDY",
+        "StudyDate": date_range,
+        "ModalitiesInStudy": "\\".join(modalities),
+    }
     for tag in tags:
-        cmd.extend(['-k', f'{tag}='])
+        keys.setdefault(tag, "")
 
-    print(f"[DEBUG] Command: {' '.join(cmd)}")
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        stdout = (result.stdout or '') + (result.stderr or '')
-        status = 'SUCCESS' if result.returncode == 0 else f'FAIL:{result.returncode}'
-    except Exception as e:
-        stdout = ''
-        status = f'EXCEPTION: {e}'
+    print(f"[DEBUG] Keys: {keys}")
+    result = backend.find(source, target, keys)
 
-    print(f"[DEBUG] stdout:\n{stdout}")
-    print(f"[DEBUG] Status: {status}")
+    print(f"[DEBUG] transcript:\n{result.transcript}")
+    print(f"[DEBUG] Status: {result.status}")
 
     ts_end = datetime.now()
     dur = (ts_end - ts_start).total_seconds() * 1000
     print(f"[DEBUG] run_findscu_query END: {ts_end} ({dur:.0f}ms)")
 
-    matches = re.findall(
-        r'\(([0-9A-Fa-f]{4},[0-9A-Fa-f]{4})\)\s+(\w{2})\s+\[([^\]]*)\]',
-        stdout
-    )
-    print(f"[DEBUG] Parsed {len(matches)} items")
-    return {tag: (vr, val) for tag, vr, val in matches}
+    merged: dict[str, str] = {}
+    for attrs in result.responses:
+        merged.update(attrs)
+    print(f"[DEBUG] Parsed {len(result.responses)} responses, {len(merged)} tags")
+    return merged
 
 
 def discover_allowed_tags(source, target, modalities, standard_tags, output_path="config/allowed_tags.yaml"):
@@ -72,13 +64,3 @@ def discover_allowed_tags(source, target, modalities, standard_tags, output_path
     with open(output_path, 'w', encoding='utf-8') as f:
         yaml.safe_dump({"allowed_tags": allowed}, f, default_flow_style=False, allow_unicode=True)
     return allowed
-
-
-def parse_findscu_output(raw_output):
-    """
-    아직 구현 대기 중인 파싱 함수.
-    raw_output 문자열을 받아 그대로 반환하거나,
-    빈 리스트를 반환하도록 해둡니다.
-    """
-    # TODO: 실제 파싱 로직을 여기에 구현할 것
-    return []  # 현재는 아무 동작도 하지 않음
\ No newline at end of file
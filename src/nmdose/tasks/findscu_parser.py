@@ -0,0 +1,171 @@
+# src/nmdose/tasks/findscu_parser.py
+
+"""
+findscu_parser.py
+
+findscu -v -S 출력과 C-FIND 응답 Identifier 를 응답(스터디) 단위의
+StudyRecord 로 변환하는 단일 파서 모듈입니다.
+
+- iter_findscu_responses : 줄 단위 입력용 (스트리밍, 응답 블록이 끝나는 대로 반환)
+- parse_findscu_output   : 전체 텍스트용
+  두 함수 모두 같은 _RecordBuilder 로 텍스트를 한 번만 훑습니다.
+- StudyRecord            : 태그 → 값 읽기 전용 매핑. 같은 태그 구성의 레코드끼리
+                           키 스키마를 공유하고 값은 tuple 로만 보관하여 dict 보다 작습니다.
+
+태그 키는 항상 대문자 "GGGG,EEEE" 형식이며, 조회 시 소문자 태그도 허용합니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from collections.abc import Mapping
+from typing import Iterable, Iterator
+import re
+
+
+class _Schema:
+    """여러 StudyRecord 가 공유하는 태그 순서와 태그 → 위치 색인"""
+
+    __slots__ = ("keys", "index")
+
+    def __init__(self, keys: tuple[str, ...]):
+        self.keys = tuple(key.upper() for key in keys)
+        self.index = {key: i for i, key in enumerate(self.keys)}   # 중복 태그는 마지막 값 우선
+
+
+_SCHEMAS: dict[tuple[str, ...], _Schema] = {}
+
+
+def _schema_for(keys: tuple[str, ...]) -> _Schema:
+    schema = _SCHEMAS.get(keys)
+    if schema is None:
+        if len(_SCHEMAS) > 4096:   # 비정상적으로 다양한 태그 구성에 대비한 상한
+            _SCHEMAS.clear()
+        schema = _SCHEMAS[keys] = _Schema(keys)
+    return schema
+
+
+class StudyRecord(Mapping):
+    """
+    C-FIND 응답 하나(스터디 1건)를 나타내는 읽기 전용 {태그: 값} 매핑.
+    dict 와 같은 방식(record["0020,000D"], record.get(...), dict(record))으로 사용합니다.
+    """
+
+    __slots__ = ("_schema", "_values")
+
+    def __init__(self, schema: _Schema, values: tuple[str, ...]):
+        self._schema = schema
+        self._values = values
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[tuple[str, str]]) -> "StudyRecord":
+        """(태그, 값) 쌍으로 레코드 생성. 태그는 대문자로 정규화합니다."""
+        keys: list[str] = []
+        values: list[str] = []
+        for tag, value in pairs:
+            keys.append(tag)
+            values.append(value)
+        return cls(_schema_for(tuple(keys)), tuple(values))
+
+    def __getitem__(self, tag: str) -> str:
+        index = self._schema.index
+        try:
+            return self._values[index[tag]]
+        except KeyError:
+            return self._values[index[tag.upper()]]
+
+    def __contains__(self, tag) -> bool:
+        index = self._schema.index
+        return tag in index or (isinstance(tag, str) and tag.upper() in index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._schema.index)
+
+    def __len__(self) -> int:
+        return len(self._schema.index)
+
+    def __repr__(self) -> str:
+        return f"StudyRecord({dict(self)!r})"
+
+    @property
+    def study_instance_uid(self) -> str | None:
+        return self.get("0020,000D")
+
+
+_MARKER = "Find Response:"
+_TAG_PATTERN = re.compile(r"\(([0-9A-Fa-f]{4},[0-9A-Fa-f]{4})\)\s+\w{2}\s+\[([^\]]*)\]")
+
+
+class _RecordBuilder:
+    """
+    텍스트 조각을 차례로 받아 완성된 응답 블록을 StudyRecord 로 돌려주는 상태 기계.
+    "Find Response:" 표지는 str.find 로, 표지 사이의 태그 줄은 정규식 findall 한 번으로 처리합니다.
+    """
+
+    __slots__ = ("pairs",)
+
+    def __init__(self):
+        self.pairs: list[tuple[str, str]] | None = None   # 첫 "Find Response:" 전에는 None
+
+    def _emit(self) -> StudyRecord:
+        pairs, self.pairs = self.pairs, None
+        if not pairs:
+            return StudyRecord(_schema_for(()), ())
+        tags, values = zip(*pairs)
+        return StudyRecord(_schema_for(tags), tuple(map(str.strip, values)))
+
+    def feed(self, text: str) -> Iterator[StudyRecord]:
+        find = text.find
+        findall = _TAG_PATTERN.findall
+        pos, length = 0, len(text)
+        while True:
+            idx = find(_MARKER, pos)
+            if self.pairs is not None:
+                found = findall(text, pos, length if idx < 0 else idx)
+                if found:
+                    if self.pairs:
+                        self.pairs.extend(found)
+                    else:
+                        self.pairs = found
+            if idx < 0:
+                return
+            if self.pairs is not None:
+                yield self._emit()
+            self.pairs = []
+            pos = idx + len(_MARKER)
+
+    def close(self) -> Iterator[StudyRecord]:
+        if self.pairs is not None:
+            yield self._emit()
+
+
+def iter_findscu_responses(lines: Iterable[str]) -> Iterator[StudyRecord]:
+    """
+    findscu 출력을 줄 단위로 받아 "Find Response" 블록이 끝날 때마다
+    그 응답의 StudyRecord 를 바로 돌려줍니다.
+    한 블록 분량의 줄만 모았다가 정규식 findall 한 번으로 처리하므로,
+    전체 출력을 메모리에 모으지 않으면서 줄마다 Python 코드를 돌리는 비용도 피합니다.
+    """
+    builder = _RecordBuilder()
+    block: list[str] = []
+    for line in lines:
+        if _MARKER in line:
+            # 새 표지가 오면 이전 블록이 완성된 것이므로 바로 돌려줌
+            if block:
+                yield from builder.feed("\n".join(block))
+                block.clear()
+            yield from builder.feed(line)
+            continue
+        block.append(line)
+    if block:
+        yield from builder.feed("\n".join(block))
+    yield from builder.close()
+
+
+def parse_findscu_output(raw_output: str) -> list[StudyRecord]:
+    """
+    findscu 출력 전체를 한 번에 파싱합니다.
+    반환: 응답 블록별 StudyRecord 리스트
+    """
+    builder = _RecordBuilder()
+    records = list(builder.feed(raw_output))
+    records.extend(builder.close())
+    return records
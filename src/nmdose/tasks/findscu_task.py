@@ -1,47 +1,20 @@
-import re
-import subprocess
-from pathlib import Path
 from datetime import datetime
 
-from nmdose.config_loader import (
-    get_config,
-    get_pacs_config,
-    get_retrieve_config,
-    get_schedule_config,
-)
+from nmdose.config_loader import get_retrieve_config
 from nmdose.utils import (
     make_batch_date_range,
 )
+from nmdose.dimse import get_dimse_backend
+from nmdose.config_loader.retrieve_options_loader import resolve_project_path
+from nmdose.env.init import init_app_environment
+from nmdose.utils.profiler import Profiler, activate, span
 
 
 def init_environment():
-    CONFIG = get_config()
-    PACS = get_pacs_config()
-    RETRIEVE_CONFIG = get_retrieve_config()
-    SCHEDULE_CONFIG = get_schedule_config()
-
-    log_dir = Path(r"C:\nmdose\logs\batch")
-    log_dir.mkdir(parents=True, exist_ok=True)
-
-    return CONFIG, PACS, RETRIEVE_CONFIG, SCHEDULE_CONFIG, log_dir
-
-
-def select_pacs(CONFIG, PACS):
-    if CONFIG.running_mode.lower() == "simulation":
-        return PACS.research, PACS.simulation
-    else:
-        return PACS.research, PACS.clinical
-
-
-def run_process(cmd: list[str]) -> tuple[str, str]:
-    try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        std_text = (result.stdout or "") + (result.stderr or "")
-        status = "SUCCESS"
-    except subprocess.CalledProcessError as e:
-        std_text = (e.stdout or "") + (e.stderr or "")
-        status = "FAILURE"
-    return std_text, status
+    """.env 를 로드하고 (calling, called), retrieve_to_research 설정, 로그 디렉터리를 돌려줍니다."""
+    env = init_app_environment()
+    source, target = env.endpoints()
+    return source, target, get_retrieve_config().retrieve_to_research, env.log_dir
 
 
 def save_logs(log_dir, mode, modality: str, ts_start: datetime, std_text: str):
@@ -53,15 +26,27 @@ def save_logs(log_dir, mode, modality: str, ts_start: datetime, std_text: str):
 
 
 def run_findscu():
-    """C-FIND 검색을 수행하고 전체 응답과 UID 리스트를 반환합니다."""
-    CONFIG, PACS, RETRIEVE_CONFIG, SCHEDULE_CONFIG, log_dir = init_environment()
-    print(f"▶ Running mode: {CONFIG.running_mode}")
-    source, target = select_pacs(CONFIG, PACS)
+    """C-FIND 검색을 수행하고 전체 응답과 UID 리스트를 반환합니다 (단계별 소요 시간은 profile_dir 에 저장)."""
+    profiler = Profiler("findscu")
+    with activate(profiler):
+        retrieve_cfg, all_responses, all_uids = _find_all()
+
+    print("\n▶ 단계별 소요 시간\n" + profiler.render_text(min_ms=10))
+    if retrieve_cfg.profile_dir:
+        print(f"▶ profile → {profiler.dump(resolve_project_path(retrieve_cfg.profile_dir))}")
+    return all_responses, all_uids
+
+
+def _find_all():
+    with span("init_environment"):
+        source, target, retrieve_cfg, log_dir = init_environment()
+    print(f"▶ C-FIND 대상: {target.aet} ({target.ip}:{target.port})")
 
     date_range = make_batch_date_range()
-    modalities = RETRIEVE_CONFIG.clinical_to_research.modalities
+    modalities = retrieve_cfg.modalities
+    backend = get_dimse_backend()
 
-    all_responses = []  # 전체 응답 저장
+    all_responses = []  # 전체 응답 저장 (응답별 {태그: 값})
     all_uids = []
 
     # 정의된 Study 레벨 태그 목록
@@ -74,36 +59,35 @@ def run_findscu():
     for modality in modalities:
         print(f"\n=== Modality: {modality} ===")
 
-        cmd = [
-            "findscu", "-v", "-S",
-            "-aet", source.aet, "-aec", target.aet,
-            target.ip, str(target.port),
-            "-k", "QueryRetrieveLevel=STUDY",
-            "-k", f"StudyDate={date_range}",
-            "-k", f"ModalitiesInStudy={modality}"
-        ]
+        keys = {
+            "QueryRetrieveLevel": "STUDY",
+            "StudyDate": date_range,
+            "ModalitiesInStudy": modality,
+        }
         # 모든 Study 레벨 태그 요청
         for tag in study_tags:
-            cmd.extend(["-k", f"{tag}="])
+            keys.setdefault(tag, "")
 
-        print("▶ C-FIND:", " ".join(cmd))
+        print("▶ C-FIND:", keys)
 
         ts_start = datetime.now()
-        std_text, status = run_process(cmd)
+        with span("cfind"):
+            result = backend.find(source, target, keys)
+        std_text = result.transcript
         
         # 전체 응답 로그 저장
-        save_logs(log_dir, "findscu", modality, ts_start, std_text)
+        with span("save_logs"):
+            save_logs(log_dir, "findscu", modality, ts_start, std_text)
 
         # stdout 전체 출력
         print("▶ Full Response:\n" + std_text)
 
-        # 태그별 파싱
-        responses = re.findall(r'\(([0-9A-Fa-f]{4},[0-9A-Fa-f]{4})\)\s+([A-Za-z]{2})\s+\[([^\]]*)\]', std_text)
-        for tag, vr, val in responses:
-            all_responses.append((tag, vr, val))
-            if tag == "0020,000D":
-                all_uids.append(val)
+        # 응답별 구조화 결과
+        uids = [r["0020,000D"] for r in result.responses if r.get("0020,000D")]
+        all_responses.extend(result.responses)
+        all_uids.extend(uids)
 
-        print(f"  Found {len([v for t,_,v in responses if t=='0020,000D'])} UIDs")
+        print(f"  Found {len(uids)} UIDs")
 
-    return all_responses, all_uids
+    backend.close()
+    return retrieve_cfg, all_responses, all_uids
@@ -0,0 +1,223 @@
+# src/nmdose/tasks/move_queue.py
+
+"""
+move_queue.py
+
+PostgreSQL 테이블(move_jobs)을 이용한 C-MOVE 작업 큐입니다.
+
+- find_move.py 는 C-FIND 로 찾은 UID 를 move_jobs 에 등록(enqueue)만 하고,
+  여러 호스트의 워커 프로세스(scripts/move_worker.py)가 SELECT ... FOR UPDATE SKIP LOCKED 로
+  서로 겹치지 않게 작업을 가져가(claim) C-MOVE 를 수행합니다.
+- study_instance_uid 는 UNIQUE 이므로 같은 Study 가 두 번 등록되지 않습니다.
+- claim 은 lease_until 까지 유효하며, 워커가 죽어 lease 가 만료된 작업은 다른 워커가 다시 가져갑니다.
+- 실패한 작업은 attempts 가 max_attempts 에 이를 때까지 QUEUED 로 되돌아가고, 그 뒤에는 FAILED 로 남습니다.
+
+enqueue()/complete() 는 commit 하지 않습니다. 같은 커넥션의 AuditWriter.flush() 가 movescus 기록과 함께 commit 합니다.
+claim()/renew() 는 다른 워커가 곧바로 볼 수 있도록 즉시 commit 합니다. 둘은 claim 전용 커넥션을
+서로 다른 스레드(feeder, lease heartbeat)에서 쓰므로 내부 락으로 한 번에 하나씩 실행합니다.
+워커는 lease_sec 의 1/3 마다 실행 중인 작업의 lease 를 renew() 로 연장하므로, 긴 C-MOVE 나
+back-pressure 대기 중인 작업이 lease 만료로 다른 워커에게 넘어가 두 번 이동되지 않습니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from dataclasses import dataclass
+from typing import Iterator
+import logging
+import os
+import socket
+import threading
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+QUEUED = "QUEUED"
+CLAIMED = "CLAIMED"
+DONE = "DONE"
+FAILED = "FAILED"
+
+
+@dataclass
+class MoveJob:
+    """
+    워커가 가져간 C-MOVE 작업 한 건.
+    Attributes:
+      job_id             (int): 작업 ID
+      study_instance_uid (str): StudyInstanceUID
+      find_id            (int): 등록한 C-FIND 의 find_id (movescus 기록용)
+      modality           (str): 등록한 C-FIND 의 모달리티
+      attempts           (int): 이번 claim 을 포함한 시도 횟수
+    """
+    job_id: int
+    study_instance_uid: str
+    find_id: int | None
+    modality: str
+    attempts: int
+
+
+_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS move_jobs (
+        job_id             SERIAL PRIMARY KEY,
+        study_instance_uid TEXT NOT NULL UNIQUE,
+        find_id            INTEGER,
+        modality           TEXT,
+        called_aet         TEXT,
+        state              TEXT NOT NULL DEFAULT 'QUEUED',
+        attempts           INTEGER NOT NULL DEFAULT 0,
+        worker_id          TEXT,
+        lease_until        TIMESTAMPTZ,
+        last_error         TEXT,
+        created_at         TIMESTAMPTZ NOT NULL DEFAULT now(),
+        updated_at         TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+    CREATE INDEX IF NOT EXISTS move_jobs_claim_idx ON move_jobs (state, job_id);
+"""
+
+# 이미 있는 UID 는 FAILED 로 끝난 경우에만 다시 대기열로 (시도 횟수 초기화)
+_ENQUEUE = """
+    INSERT INTO move_jobs (study_instance_uid, find_id, modality, called_aet, state, attempts)
+    VALUES (%s, %s, %s, %s, 'QUEUED', 0)
+    ON CONFLICT (study_instance_uid) DO UPDATE
+       SET state      = 'QUEUED',
+           attempts   = 0,
+           find_id    = EXCLUDED.find_id,
+           updated_at = now()
+     WHERE move_jobs.state = 'FAILED'
+"""
+
+_CLAIM = """
+    UPDATE move_jobs
+       SET state       = 'CLAIMED',
+           worker_id   = %(worker_id)s,
+           lease_until = now() + make_interval(secs => %(lease_sec)s),
+           attempts    = attempts + 1,
+           updated_at  = now()
+     WHERE job_id IN (
+            SELECT job_id
+              FROM move_jobs
+             WHERE (state = 'QUEUED' OR (state = 'CLAIMED' AND lease_until < now()))
+               AND (%(called_aet)s IS NULL OR called_aet = %(called_aet)s)
+             ORDER BY job_id
+             LIMIT %(limit)s
+               FOR UPDATE SKIP LOCKED
+           )
+    RETURNING job_id, study_instance_uid, find_id, modality, attempts
+"""
+
+# 실행 중인 작업의 lease 연장 (이미 다른 워커가 가져간 작업은 건드리지 않음)
+# 결과 기록 커넥션이 complete() 로 잠근(아직 commit 전) 행은 기다리지 않고 건너뜀
+_RENEW = """
+    UPDATE move_jobs
+       SET lease_until = now() + make_interval(secs => %(lease_sec)s),
+           updated_at  = now()
+     WHERE job_id IN (
+            SELECT job_id
+              FROM move_jobs
+             WHERE job_id = ANY(%(job_ids)s)
+               AND worker_id = %(worker_id)s
+               AND state = 'CLAIMED'
+               FOR UPDATE SKIP LOCKED
+           )
+"""
+
+# lease 를 다른 워커에게 뺏긴(만료 후 재할당) 작업의 결과는 반영하지 않음
+_COMPLETE = """
+    UPDATE move_jobs
+       SET state       = CASE WHEN %(success)s THEN 'DONE'
+                              WHEN attempts >= %(max_attempts)s THEN 'FAILED'
+                              ELSE 'QUEUED' END,
+           last_error  = %(error)s,
+           lease_until = NULL,
+           updated_at  = now()
+     WHERE job_id = %(job_id)s
+       AND worker_id = %(worker_id)s
+       AND state = 'CLAIMED'
+"""
+
+
+def default_worker_id() -> str:
+    """호스트명:PID 형식의 워커 ID"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class MoveQueue:
+    """move_jobs 테이블 접근 객체. 스레드마다 커넥션을 따로 쓰도록 conn 을 호출마다 받습니다."""
+
+    def __init__(self, called_aet: str | None = None, lease_sec: int = 1800,
+                 max_attempts: int = 5, worker_id: str | None = None):
+        self.called_aet = called_aet
+        self.lease_sec = lease_sec
+        self.max_attempts = max(1, max_attempts)
+        self.worker_id = worker_id or default_worker_id()
+        self._claim_lock = threading.Lock()   # claim()/renew() 의 claim 전용 커넥션 공유 보호
+
+    @staticmethod
+    def ensure_table(conn) -> None:
+        """move_jobs 테이블이 없으면 생성합니다."""
+        with conn.cursor() as cur:
+            cur.execute(_CREATE_TABLE)
+        conn.commit()
+
+    def enqueue(self, conn, uid: str, find_id: int | None, modality: str) -> None:
+        """C-FIND 로 찾은 Study 를 대기열에 등록 (이미 있으면 FAILED 인 경우만 재등록)"""
+        with conn.cursor() as cur:
+            cur.execute(_ENQUEUE, (uid, find_id, modality, self.called_aet))
+
+    def claim(self, conn, limit: int = 1) -> list[MoveJob]:
+        """대기 중이거나 lease 가 만료된 작업을 최대 limit 건 가져오고 즉시 commit 합니다."""
+        with self._claim_lock:
+            with conn.cursor() as cur:
+                cur.execute(_CLAIM, {
+                    "worker_id": self.worker_id,
+                    "lease_sec": self.lease_sec,
+                    "called_aet": self.called_aet,
+                    "limit": limit,
+                })
+                jobs = [MoveJob(*row) for row in cur.fetchall()]
+            conn.commit()
+        return jobs
+
+    def renew(self, conn, jobs: list[MoveJob]) -> int:
+        """이 워커가 실행 중인 jobs 의 lease 를 지금부터 lease_sec 로 연장하고 즉시 commit. 반환: 연장한 건수"""
+        if not jobs:
+            return 0
+        with self._claim_lock:
+            with conn.cursor() as cur:
+                cur.execute(_RENEW, {
+                    "lease_sec": self.lease_sec,
+                    "job_ids": [job.job_id for job in jobs],
+                    "worker_id": self.worker_id,
+                })
+                renewed = cur.rowcount
+            conn.commit()
+        if renewed < len(jobs):
+            log.info(f"lease 연장: {len(jobs)}건 중 {renewed}건 (나머지는 완료 기록 중이거나 lease 가 만료됨)")
+        return renewed
+
+    def complete(self, conn, job: MoveJob, success: bool, error: str | None = None) -> None:
+        """작업 결과 반영: 성공이면 DONE, 실패면 재시도 가능 시 QUEUED, 아니면 FAILED"""
+        with conn.cursor() as cur:
+            cur.execute(_COMPLETE, {
+                "success": success,
+                "max_attempts": self.max_attempts,
+                "error": None if success else error,
+                "job_id": job.job_id,
+                "worker_id": self.worker_id,
+            })
+            if cur.rowcount == 0:
+                log.warning(f"⚠ 작업 {job.job_id}({job.study_instance_uid}) 의 lease 가 만료되어 결과를 반영하지 않음")
+
+    def iter_claims(self, conn, batch: int = 1, poll_interval: float = 5.0,
+                    stop: threading.Event | None = None, drain: bool = False) -> Iterator[MoveJob]:
+        """
+        작업을 batch 건씩 가져와 하나씩 돌려줍니다.
+        대기열이 비면 drain=True 일 때 종료하고, 아니면 poll_interval 초마다 다시 확인합니다 (stop 이 설정될 때까지).
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            jobs = self.claim(conn, batch)
+            if not jobs:
+                if drain:
+                    return
+                stop.wait(poll_interval)
+                continue
+            yield from jobs
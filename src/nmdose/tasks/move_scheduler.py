@@ -0,0 +1,219 @@
+# src/nmdose/tasks/move_scheduler.py
+
+"""
+move_scheduler.py
+
+StudyInstanceUID 목록에 대한 C-MOVE 를 엔드포인트별 동시 실행 수 제한 안에서 병렬로 수행하는 스케줄러입니다.
+
+- 동시 실행 수는 retrieve_options.yaml 의 retrieve_to_research.move_workers 로 AET 별 설정
+- PACS 가 실패를 돌려주거나 응답이 느려지면 동시 실행 수를 절반으로 줄이고 잠시 쉬었다가(back-pressure),
+  정상 응답이 이어지면 다시 1씩 늘립니다 (AIMD).
+- 결과는 완료 순서대로 호출한 스레드에 돌려주므로 movescus 기록은 기존처럼 한 커넥션에서 순차 수행됩니다.
+- UID 는 스트리밍 C-FIND 가 응답을 돌려주는 대로 예약되므로 조회가 끝나기 전에 C-MOVE 가 시작됩니다.
+- C-MOVE-RSP 가 도착할 때마다 sub-operation 건수를 진행 버스(nmdose.dimse.progress)에 게시합니다.
+- 백엔드가 예외를 던지면 그 UID 만 FAILURE 결과로 돌려주고 나머지 C-MOVE 는 계속합니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Iterator
+import logging
+import queue
+import threading
+import time
+
+# ───── 내부 모듈 ─────
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+from nmdose.dimse.backends import MoveResult
+from nmdose.dimse.progress import ProgressBus, progress_bus
+from nmdose.utils.metrics import MOVE_INFLIGHT, MOVE_QUEUE_DEPTH
+from nmdose.utils.profiler import span
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class MoveOutcome:
+    """
+    C-MOVE 한 건의 실행 결과.
+    Attributes:
+      uid         (str): StudyInstanceUID
+      result      (MoveResult): 백엔드가 돌려준 결과
+      ts_start    (datetime): 요청 시작 시각
+      duration_ms (int): 소요 시간 (밀리초)
+    """
+    uid: str
+    result: object
+    ts_start: datetime
+    duration_ms: int
+
+
+def get_move_workers(cfg, endpoint: DicomEndpoint) -> int:
+    """
+    retrieve_to_research.move_workers 에서 endpoint AET 의 동시 실행 수를 찾습니다.
+    AET 항목이 없으면 "default" 값을, 그것도 없으면 1을 사용합니다.
+    """
+    workers = cfg.move_workers or {}
+    return max(1, int(workers.get(endpoint.aet, workers.get("default", 1))))
+
+
+class _AdaptiveLimiter:
+    """상한 안에서 실행 허용 수를 늘리고 줄일 수 있는 세마포어"""
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self.active = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.active >= self.limit:
+                self._cond.wait()
+            self.active += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def decrease(self) -> int:
+        with self._cond:
+            self.limit = max(1, self.limit // 2)
+            return self.limit
+
+    def increase(self) -> int:
+        with self._cond:
+            if self.limit < self.max_limit:
+                self.limit += 1
+                self._cond.notify_all()
+            return self.limit
+
+
+class MoveScheduler:
+    """동시 실행 수가 제한된 C-MOVE 스케줄러"""
+
+    def __init__(self, backend, calling: DicomEndpoint, called: DicomEndpoint,
+                 max_workers: int = 1, slow_threshold_ms: int = 120_000,
+                 backoff_sec: float = 5.0, max_backoff_sec: float = 120.0,
+                 progress: ProgressBus | None = progress_bus):
+        self.backend = backend
+        self.progress = progress
+        self.calling = calling
+        self.called = called
+        self.max_workers = max(1, max_workers)
+        self.slow_threshold_ms = slow_threshold_ms
+        self.backoff_sec = backoff_sec
+        self.max_backoff_sec = max_backoff_sec
+
+        self._limiter = _AdaptiveLimiter(self.max_workers)
+        self._pause_until = 0.0
+        self._consecutive_bad = 0
+        self._lock = threading.Lock()
+
+    def _wait_if_paused(self) -> None:
+        with self._lock:
+            delay = self._pause_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _feedback(self, ok: bool, duration_ms: int) -> None:
+        """응답 결과로 동시 실행 수와 휴지 시간을 조정"""
+        slow = duration_ms > self.slow_threshold_ms
+        if ok and not slow:
+            with self._lock:
+                self._consecutive_bad = 0
+            self._limiter.increase()
+            return
+
+        limit = self._limiter.decrease()
+        with self._lock:
+            self._consecutive_bad += 1
+            pause = min(self.max_backoff_sec, self.backoff_sec * 2 ** (self._consecutive_bad - 1))
+            self._pause_until = max(self._pause_until, time.monotonic() + pause)
+        reason = "실패" if not ok else f"지연 {duration_ms}ms"
+        log.warning(f"⚠ C-MOVE {reason}: 동시 실행 수 {limit}로 축소, {pause:.1f}s 대기")
+
+    def _move_one(self, uid: str) -> MoveOutcome:
+        self._wait_if_paused()
+        self._limiter.acquire()
+        MOVE_QUEUE_DEPTH.labels(self.called.aet).dec()
+        inflight = MOVE_INFLIGHT.labels(self.called.aet)
+        inflight.inc()
+        ts_start = datetime.now()
+        t0 = time.perf_counter()
+        result = MoveResult(status="FAILURE")
+        try:
+            on_progress = None
+            if self.progress is not None:
+                self.progress.start(uid, self.called.aet)
+                on_progress = lambda r: self.progress.update(uid, r)
+            with span("cmove"):
+                result = self.backend.move(self.calling, self.called, {
+                    "QueryRetrieveLevel": "STUDY",
+                    "StudyInstanceUID": uid,
+                }, on_progress=on_progress)
+        except Exception as e:
+            # 백엔드 예외(Association 실패, 풀 고갈, 콜백 오류 등)는 실패 결과로 바꿔 배치 전체가 멈추지 않게 함
+            log.exception(f"❌ C-MOVE {uid} 실행 중 예외")
+            result = MoveResult(status="FAILURE", transcript=f"E: {type(e).__name__}: {e}")
+        finally:
+            duration_ms = int((time.perf_counter() - t0) * 1000)
+            if self.progress is not None:
+                self.progress.finish(uid, result)
+            inflight.dec()
+            self._limiter.release()
+        self._feedback(result.status == "SUCCESS", duration_ms)
+        return MoveOutcome(uid, result, ts_start, duration_ms)
+
+    def run(self, uids: Iterable[str], prefetch: int | None = None) -> Iterator[MoveOutcome]:
+        """
+        uids 의 C-MOVE 를 병렬 실행하고, 완료되는 순서대로 MoveOutcome 을 돌려줍니다.
+        uids 는 스트리밍 C-FIND 처럼 아직 도착 중인 이터레이터여도 되며,
+        도착하는 즉시 예약됩니다 (끝나지 않은 예약은 prefetch 건, 기본 max_workers * 2 건으로 제한).
+        예약 자리가 빈 뒤에야 uids 에서 다음 UID 를 꺼내므로, 큐 claim 처럼 꺼내는 순간 시간이 흐르는
+        입력도 prefetch 건 넘게 미리 가져가지 않습니다.
+        """
+        results: queue.Queue = queue.Queue()
+        slots = threading.Semaphore(max(1, prefetch or self.max_workers * 2))
+        end = object()
+
+        log.info(f"▶ C-MOVE 스케줄러 시작 (최대 동시 {self.max_workers}, 대상 {self.called.aet})")
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix=f"movescu-{self.called.aet}") as pool:
+
+            def feed() -> None:
+                submitted = 0
+                source = iter(uids)
+                try:
+                    while True:
+                        slots.acquire()
+                        uid = next(source, end)
+                        if uid is end:
+                            break
+                        MOVE_QUEUE_DEPTH.labels(self.called.aet).inc()
+                        future = pool.submit(self._move_one, uid)
+                        future.add_done_callback(results.put)
+                        submitted += 1
+                except BaseException as e:   # 입력 이터레이터 오류는 호출 스레드에서 다시 발생
+                    results.put(e)
+                results.put((end, submitted))
+
+            feeder = threading.Thread(target=feed, name="movescu-feeder", daemon=True)
+            feeder.start()
+
+            total, yielded = None, 0
+            while total is None or yielded < total:
+                item = results.get()
+                if isinstance(item, BaseException):
+                    raise item
+                if isinstance(item, tuple) and item[0] is end:
+                    total = item[1]
+                    continue
+                slots.release()
+                yielded += 1
+                yield item.result()
+            feeder.join()
@@ -0,0 +1,132 @@
+# src/nmdose/tasks/move_worker.py
+
+"""
+move_worker.py
+
+move_jobs 큐(MoveQueue)에서 작업을 가져와 C-MOVE 를 수행하는 워커 루프입니다.
+
+- 여러 프로세스/호스트에서 동시에 실행해도 SKIP LOCKED claim 덕분에 같은 Study 를 두 번 가져가지 않습니다.
+- 프로세스 안에서는 MoveScheduler 로 max_workers 건까지 병렬 실행하고 PACS 상태에 따라 동시 실행 수를 줄입니다.
+- 결과는 find_move.py 와 같은 형식으로 movescus 에 기록합니다 (AuditWriter, find_id 연결 유지).
+- 빈 실행 자리가 있을 때만 한 건씩 claim 하고, heartbeat 스레드가 실행 중인 작업의 lease 를 주기적으로 연장합니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+import logging
+import threading
+
+# ───── 내부 모듈 ─────
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+from nmdose.tasks.move_queue import MoveJob, MoveQueue
+from nmdose.tasks.move_scheduler import MoveOutcome, MoveScheduler
+from nmdose.utils.audit_writer import AuditWriter
+from nmdose.utils.metrics import observe_move
+from nmdose.utils.text_utils import sanitize_event
+from nmdose.utils.transcript_index import TranscriptIndex, summarize_transcript
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+
+def make_move_event(outcome: MoveOutcome, calling: DicomEndpoint, called: DicomEndpoint,
+                    find_id: int | None, attempt: int = 1,
+                    study_uid: str | None = None, series_uid: str | None = None) -> dict:
+    """
+    C-MOVE 결과 → movescus 감사 이벤트 (NUL 제거, error_detail 은 실패 시 한 줄 요약)
+    재시도는 같은 find_id 로 기록되므로 attempt(1부터)로 (find_id, study_instance_uid, attempt) 를 구분합니다.
+    SERIES/IMAGE 수준 C-MOVE 는 outcome.uid 가 Series/SOP UID 이므로 study_uid/series_uid 를 따로 넘깁니다.
+    """
+    result = outcome.result
+    event = {
+        "find_id": find_id,
+        "ts": outcome.ts_start,
+        "calling_aet": calling.aet,
+        "called_aet":  called.aet,
+        "peer_host":   called.ip,
+        "peer_port":   called.port,
+        "pending_count": result.pending_count,
+        "completed_count": result.completed,
+        "failed_count": result.failed,
+        "warning_count": result.warning,
+        "remaining_count": result.remaining,
+        "duration_ms": outcome.duration_ms,
+        "status": result.status,
+        "error_detail": None if result.status == "SUCCESS" else summarize_transcript(result.transcript),
+        "study_instance_uid": study_uid or outcome.uid,
+        "series_instance_uid": series_uid,
+        "attempt": attempt,
+    }
+    return sanitize_event(event)
+
+
+def run_worker(backend, calling: DicomEndpoint, called: DicomEndpoint, queue: MoveQueue,
+               claim_conn, conn, audit: AuditWriter, max_workers: int = 1,
+               slow_threshold_ms: int = 120_000, backoff_sec: float = 5.0, poll_interval: float = 5.0,
+               stop: threading.Event | None = None, drain: bool = False,
+               transcripts: TranscriptIndex | None = None,
+               heartbeat_sec: float | None = None) -> dict[str, int]:
+    """
+    큐가 빌 때까지(drain=True) 또는 stop 이 설정될 때까지 작업을 처리합니다.
+
+    Args:
+      claim_conn   : claim/lease 연장 전용 커넥션 (feeder, heartbeat 스레드에서 사용)
+      conn         : 결과 기록용 커넥션 (audit 과 같은 커넥션, 호출한 스레드에서 사용)
+      transcripts  : 상태 줄을 색인할 TranscriptIndex (없으면 색인하지 않음)
+      heartbeat_sec: 실행 중인 작업의 lease 연장 주기(초). 기본은 queue.lease_sec / 3
+    반환: {"done": 성공 건수, "failed": 실패 건수}
+    """
+    jobs: dict[str, MoveJob] = {}
+    jobs_lock = threading.Lock()
+
+    def claimed_uids():
+        # 스케줄러가 실행 자리를 비운 뒤에야 다음 UID 를 꺼내므로 한 건씩만 claim
+        for job in queue.iter_claims(claim_conn, batch=1, poll_interval=poll_interval,
+                                     stop=stop, drain=drain):
+            with jobs_lock:
+                jobs[job.study_instance_uid] = job
+            yield job.study_instance_uid
+
+    finished = threading.Event()
+    interval = heartbeat_sec or max(1.0, queue.lease_sec / 3)
+
+    def heartbeat() -> None:
+        while not finished.wait(interval):
+            with jobs_lock:
+                held = list(jobs.values())
+            try:
+                queue.renew(claim_conn, held)
+            except Exception:
+                log.exception("❌ move_jobs lease 연장 실패")
+
+    scheduler = MoveScheduler(backend, calling, called, max_workers=max_workers,
+                              slow_threshold_ms=slow_threshold_ms, backoff_sec=backoff_sec)
+    counts = {"done": 0, "failed": 0}
+    log.info(f"▶ move 워커 시작: {queue.worker_id} → {called.aet} (동시 {max_workers})")
+    renewer = threading.Thread(target=heartbeat, name="move-lease-heartbeat", daemon=True)
+    renewer.start()
+    try:
+        for outcome in scheduler.run(claimed_uids(), prefetch=max_workers):
+            with jobs_lock:
+                job = jobs.pop(outcome.uid)
+            observe_move(outcome, called.aet, job.modality)
+            # 큐 재시도도 같은 find_id 로 기록되므로 claim 횟수(attempts)로 행을 구분
+            event = make_move_event(outcome, calling, called, job.find_id, job.attempts)
+            success = outcome.result.status == "SUCCESS"
+            # 작업 완료와 movescus 기록이 같은 flush(commit)에 포함되도록 complete 를 먼저 실행
+            queue.complete(conn, job, success, event["error_detail"])
+            move_id = audit.add_move(event)
+            if transcripts is not None:
+                transcripts.add("movescu", outcome.uid, outcome.result.transcript, outcome.result.status,
+                                find_id=job.find_id, move_id=move_id, modality=job.modality,
+                                ts=outcome.ts_start)
+            counts["done" if success else "failed"] += 1
+            log.info(f"C-MOVE {outcome.uid} → {outcome.result.status} "
+                     f"({outcome.duration_ms}ms, 시도 {job.attempts})")
+    finally:
+        finished.set()
+        renewer.join()
+        audit.flush()
+        if transcripts is not None:
+            transcripts.flush()
+    log.info(f"▶ move 워커 종료: 성공 {counts['done']}건, 실패 {counts['failed']}건")
+    return counts
@@ -0,0 +1,84 @@
+# src/nmdose/tasks/preview.py
+
+"""
+preview.py
+
+C-FIND 미리보기(검색만 하고 C-MOVE 는 하지 않음) 로직입니다.
+scripts/findscu_preview.py 와 대시보드의 미리보기 작업(nmdose.api.jobs)이 함께 사용합니다.
+
+- 응답이 도착하는 대로 Study 요약을 on_study 콜백으로 넘김
+- should_stop() 이 True 가 되면 남은 응답을 버리고 C-FIND 를 중단 (스트림을 닫으면 findscu 프로세스/Association 정리)
+"""
+
+# ───── 표준 라이브러리 ─────
+from typing import Callable
+import logging
+
+# ───── 내부 모듈 ─────
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+STANDARD_STUDY_TAGS = [
+    "0008,0005", "0008,0020", "0008,0030", "0008,0050", "0010,0010",
+    "0010,0020", "0020,000D", "0008,0061", "0008,0062", "0008,1030",
+    "0020,1206", "0020,1208",
+]
+
+
+def build_findscu_keys(modality: str, date_range: str, tags: list[str]) -> dict[str, str]:
+    """C-FIND 조회 키 빌드"""
+    keys = {
+        "QueryRetrieveLevel": "STUDY",
+        "StudyDate": date_range,
+        "ModalitiesInStudy": modality,
+    }
+    for tag in tags:
+        keys.setdefault(tag, "")
+    return keys
+
+
+def summarize_study(attrs) -> dict[str, str | None]:
+    """C-FIND 응답 → 대시보드/로그용 Study 요약"""
+    return {
+        "uid":          attrs.get("0020,000D"),
+        "patient_id":   attrs.get("0010,0020"),
+        "study_date":   attrs.get("0008,0020"),
+        "study_time":   attrs.get("0008,0030"),
+        "modalities":   attrs.get("0008,0061"),
+        "description":  attrs.get("0008,1030"),
+        "series_count": attrs.get("0020,1206"),
+        "image_count":  attrs.get("0020,1208"),
+    }
+
+
+def run_preview(backend, calling: DicomEndpoint, called: DicomEndpoint,
+                modalities: list[str], date_range: str,
+                on_study: Callable[[str, int, dict], None] | None = None,
+                should_stop: Callable[[], bool] = lambda: False,
+                tags: list[str] = STANDARD_STUDY_TAGS) -> dict[str, int]:
+    """
+    modality 별 C-FIND 를 실행하고 modality → 응답 건수를 돌려줍니다.
+    on_study(modality, 순번, 요약) 은 응답 한 건마다 호출됩니다.
+    """
+    counts: dict[str, int] = {}
+    for modality in modalities:
+        if should_stop():
+            break
+        keys = build_findscu_keys(modality, date_range, tags)
+        log.info(f"▶ C-FIND 미리보기 ({backend.name}): {keys}")
+
+        stream = backend.iter_find(calling, called, keys)
+        responses = iter(stream)
+        try:
+            for idx, attrs in enumerate(responses, 1):
+                if on_study is not None:
+                    on_study(modality, idx, summarize_study(attrs))
+                if should_stop():
+                    log.info(f"⚠ C-FIND 미리보기 중단: {modality} ({idx}건 수신 후)")
+                    break
+        finally:
+            responses.close()      # 중단 시에도 프로세스/Association 정리
+        counts[modality] = stream.count
+    return counts
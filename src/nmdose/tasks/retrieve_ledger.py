@@ -0,0 +1,143 @@
+# src/nmdose/tasks/retrieve_ledger.py
+
+"""
+retrieve_ledger.py
+
+Study 단위 C-MOVE 작업 장부(retrieve_ledger 테이블)입니다.
+
+- C-FIND 로 찾은 UID 는 PENDING 으로 등록되고, C-MOVE 결과에 따라 DONE / FAILED 로 바뀝니다.
+- FAILED 는 시도 횟수(attempts)와 마지막 오류(last_error)를 남기며, max_attempts 번 실패하면 GAVE_UP 으로 확정됩니다.
+- resume 모드는 장부에서 PENDING / FAILED 인 Study 만 다시 C-MOVE 하므로
+  Study 하나의 실패 때문에 날짜 창 전체를 다시 조회/이동할 필요가 없습니다.
+- 날짜 창은 그 창의 모든 Study 가 PENDING 을 벗어나면(DONE, FAILED, GAVE_UP) 완료된 것으로 봅니다.
+  FAILED 는 다음 실행의 resume 단계에서 재시도됩니다.
+
+쓰기는 commit 하지 않습니다. 같은 커넥션을 쓰는 AuditWriter.flush() 의 commit 에 함께 기록되며,
+그 전에 비정상 종료되면 해당 창은 batch_status 가 갱신되지 않으므로 다음 실행에서 다시 등록됩니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from dataclasses import dataclass
+from datetime import date
+import logging
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+PENDING = "PENDING"
+DONE = "DONE"
+FAILED = "FAILED"
+GAVE_UP = "GAVE_UP"
+
+RETRYABLE_STATES = (PENDING, FAILED)
+
+
+@dataclass
+class LedgerEntry:
+    """
+    장부의 재시도 대상 한 건.
+    Attributes:
+      study_instance_uid (str): StudyInstanceUID
+      modality           (str): 등록한 C-FIND 의 모달리티
+      find_id            (int): 등록한 C-FIND 의 find_id (movescus 기록용)
+      attempts           (int): 지금까지의 C-MOVE 시도 횟수
+    """
+    study_instance_uid: str
+    modality: str
+    find_id: int | None
+    attempts: int
+
+
+_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS retrieve_ledger (
+        study_instance_uid TEXT PRIMARY KEY,
+        window_start       DATE,
+        window_end         DATE,
+        modality           TEXT,
+        find_id            INTEGER,
+        state              TEXT NOT NULL DEFAULT 'PENDING',
+        attempts           INTEGER NOT NULL DEFAULT 0,
+        last_error         TEXT,
+        updated_at         TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+    CREATE INDEX IF NOT EXISTS retrieve_ledger_state_idx ON retrieve_ledger (state);
+"""
+
+# 이미 장부에 있는 UID(창 겹침)는 상태를 유지하고, 끝나지 않은 항목만 최신 C-FIND 로 연결
+# (init_db 가 만든 테이블에는 DEFAULT 가 없을 수 있으므로 state/attempts 를 명시)
+_REGISTER = """
+    INSERT INTO retrieve_ledger
+      (study_instance_uid, window_start, window_end, modality, find_id, state, attempts, updated_at)
+    VALUES (%s, %s, %s, %s, %s, 'PENDING', 0, now())
+    ON CONFLICT (study_instance_uid) DO UPDATE
+       SET find_id    = EXCLUDED.find_id,
+           updated_at = now()
+     WHERE retrieve_ledger.state <> 'DONE'
+"""
+
+_MARK = """
+    UPDATE retrieve_ledger
+       SET state      = CASE WHEN %(state)s = 'FAILED' AND attempts + 1 >= %(max_attempts)s
+                             THEN 'GAVE_UP' ELSE %(state)s END,
+           attempts   = attempts + 1,
+           last_error = %(error)s,
+           updated_at = now()
+     WHERE study_instance_uid = %(uid)s
+"""
+
+
+class RetrieveLedger:
+    """retrieve_ledger 테이블 접근 객체"""
+
+    def __init__(self, conn, max_attempts: int = 5):
+        self.conn = conn
+        self.max_attempts = max(1, max_attempts)
+
+    def ensure_table(self) -> None:
+        """retrieve_ledger 테이블이 없으면 생성합니다."""
+        with self.conn.cursor() as cur:
+            cur.execute(_CREATE_TABLE)
+        self.conn.commit()
+
+    def register(self, uid: str, window: tuple[date, date], modality: str, find_id: int | None) -> None:
+        """C-FIND 로 찾은 Study 를 PENDING 으로 등록 (이미 DONE 이면 그대로 둠)"""
+        with self.conn.cursor() as cur:
+            cur.execute(_REGISTER, (uid, window[0], window[1], modality, find_id))
+
+    def mark(self, uid: str, success: bool, error: str | None = None) -> None:
+        """C-MOVE 결과 반영: 성공이면 DONE, 실패면 FAILED (max_attempts 도달 시 GAVE_UP)"""
+        with self.conn.cursor() as cur:
+            cur.execute(_MARK, {
+                "state": DONE if success else FAILED,
+                "max_attempts": self.max_attempts,
+                "error": None if success else error,
+                "uid": uid,
+            })
+
+    def retryable(self, limit: int | None = None) -> list[LedgerEntry]:
+        """PENDING / FAILED 인 Study 목록 (오래된 순)"""
+        sql = """
+            SELECT study_instance_uid, modality, find_id, attempts
+              FROM retrieve_ledger
+             WHERE state IN %s
+             ORDER BY updated_at
+        """
+        params: tuple = (RETRYABLE_STATES,)
+        if limit is not None:
+            sql += " LIMIT %s"
+            params += (limit,)
+        with self.conn.cursor() as cur:
+            cur.execute(sql, params)
+            return [LedgerEntry(*row) for row in cur.fetchall()]
+
+    def pending_in_window(self, window: tuple[date, date]) -> int:
+        """창 안에서 아직 결과가 정해지지 않은(PENDING) Study 수"""
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT count(*)
+                  FROM retrieve_ledger
+                 WHERE state = 'PENDING'
+                   AND window_start = %s
+                   AND window_end   = %s
+            """, window)
+            return cur.fetchone()[0]
@@ -0,0 +1,77 @@
+# src/nmdose/tasks/retrieved_index.py
+
+"""
+retrieved_index.py
+
+이미 C-MOVE 에 성공한 StudyInstanceUID 색인입니다.
+
+- 실행 시작 시 movescus(status = 'SUCCESS')에서 한 번만 읽어 메모리 set 으로 보관
+- since 를 주면 그 날짜 이후 구간을 조회한 C-FIND(findscus.end_date >= since)에 딸린 이동 기록만 읽어
+  처리할 날짜 창과 겹칠 수 있는 UID 만 메모리에 올립니다.
+- calling_aet 를 주면 그 AET 로 요청한 C-MOVE 만 읽습니다. movescus 에는 dosePACS 로 보낸
+  선량 Series C-MOVE(scripts/dose_retrieve.py)도 같은 Study UID 로 남으므로, 연구용 수신은 research AET 로 거릅니다.
+- C-FIND 결과 중 색인에 있는 UID 는 C-MOVE 예약 전에 걸러내고,
+  이번 실행에서 새로 성공한 UID 는 add() 로 추가하여 다른 모달리티/창에서도 다시 받지 않습니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from datetime import date
+from typing import Iterable
+import logging
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+
+_LOAD_ALL = """
+    SELECT DISTINCT m.study_instance_uid
+      FROM movescus m
+     WHERE m.status = 'SUCCESS'
+"""
+
+_LOAD_SINCE = """
+    SELECT DISTINCT m.study_instance_uid
+      FROM movescus m
+      JOIN findscus f ON f.find_id = m.find_id
+     WHERE m.status = 'SUCCESS'
+       AND f.end_date >= %s
+"""
+
+_BY_CALLING_AET = "       AND m.calling_aet = %s\n"
+
+
+class RetrievedIndex:
+    """C-MOVE 가 완료된 StudyInstanceUID 집합"""
+
+    def __init__(self, uids: Iterable[str] = ()):
+        self._uids: set[str] = set(uids)
+
+    @classmethod
+    def load(cls, conn, since: date | None = None, calling_aet: str | None = None) -> "RetrievedIndex":
+        """
+        movescus 에서 성공한 UID 를 읽어 색인을 만듭니다.
+
+        Args:
+          conn  : psycopg2 커넥션
+          since (date, optional): 이 날짜 이후를 조회한 C-FIND 의 이동 기록만 읽음 (None 이면 전체)
+          calling_aet (str, optional): 이 AET 가 요청한(= 이 AET 로 받은) C-MOVE 만 읽음
+        """
+        sql, params = (_LOAD_ALL, ()) if since is None else (_LOAD_SINCE, (since,))
+        if calling_aet is not None:
+            sql += _BY_CALLING_AET
+            params += (calling_aet,)
+        with conn.cursor() as cur:
+            cur.execute(sql, params or None)
+            index = cls(row[0] for row in cur if row[0])
+        conn.commit()
+        log.info(f"이미 수신한 Study 색인 {len(index)}건 로드" + (f" (since {since})" if since else ""))
+        return index
+
+    def add(self, uid: str) -> None:
+        self._uids.add(uid)
+
+    def __contains__(self, uid: str) -> bool:
+        return uid in self._uids
+
+    def __len__(self) -> int:
+        return len(self._uids)
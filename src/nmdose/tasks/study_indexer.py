@@ -0,0 +1,346 @@
+# src/nmdose/tasks/study_indexer.py
+
+"""
+study_indexer.py
+
+researchPACS 로 받은 DICOM 파일 헤더만 읽어 rpacs.study_metadata 를 채우는 색인기입니다.
+
+- 수신 디렉터리를 os.scandir 로 훑어 파일마다 (경로, mtime, 크기)만 모읍니다.
+- 읽기는 ProcessPoolExecutor 워커가 pydicom stop_before_pixels + specific_tags 로 필요한 태그만 파싱합니다.
+- 파일별 헤더는 로컬 SQLite 목록(FileManifest)에 보관합니다. 증분 모드에서는 mtime/크기가 목록과 같은 파일은
+  다시 열지 않으므로, 야간 실행은 새로 받은(또는 바뀐) 파일만 읽습니다.
+- 이번에 읽은 파일이 속한 Study 만 목록에서 다시 모아(Series/Instance 수, 모달리티, 검사 부위) 메모리에서 집계하고,
+  batch_size Study 씩 임시 테이블로 COPY 한 뒤 study_metadata 에 UPSERT 합니다.
+- 다시 집계할 Study 는 파일 목록과 함께 dirty_studies 에 먼저 기록하고, COPY 가 성공한 배치만 지웁니다.
+  PostgreSQL 기록이 실패해도 다음 증분 실행이 파일을 다시 읽지 않고 남은 Study 를 이어서 COPY 합니다.
+- 디스크에서 지워진 파일은 목록에서 빼지 않습니다. 수신 파일을 정리해도 이미 받은 Study 의 집계는 유지됩니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+import csv
+import io
+import logging
+import os
+import sqlite3
+
+# ───── 서드파티 라이브러리 ─────
+import pydicom
+
+# ───── 내부 모듈 ─────
+from nmdose.utils.profiler import span
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+
+# study_metadata 컬럼 → DICOM 키워드 (Study 수준 값은 Study 안에서 처음 나온 비어 있지 않은 값)
+HEADER_TAGS = {
+    "patient_id":               "PatientID",
+    "patient_sex":              "PatientSex",
+    "patient_birth_date":       "PatientBirthDate",
+    "patient_age":              "PatientAge",
+    "study_date":               "StudyDate",
+    "study_time":               "StudyTime",
+    "modality":                 "Modality",
+    "study_description":        "StudyDescription",
+    "access_number":            "AccessionNumber",
+    "referring_physician_name": "ReferringPhysicianName",
+    "institution_name":         "InstitutionName",
+    "body_part_examined":       "BodyPartExamined",
+}
+UID_TAGS = {"study_uid": "StudyInstanceUID", "series_uid": "SeriesInstanceUID", "sop_uid": "SOPInstanceUID"}
+SPECIFIC_TAGS = list(UID_TAGS.values()) + list(HEADER_TAGS.values())
+
+STUDY_METADATA_COLUMNS = (
+    "study_instance_uid", *HEADER_TAGS, "num_series", "num_instances",
+)
+# Study 안의 서로 다른 값을 모두 모아 쉼표로 잇는 컬럼 (예: modality "CT,PT")
+_MULTI_VALUED = ("modality", "body_part_examined")
+
+_MANIFEST_COLUMNS = ("path", "mtime_ns", "size", *UID_TAGS, *HEADER_TAGS)
+
+_MANIFEST_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS files (
+        path     TEXT PRIMARY KEY,
+        mtime_ns INTEGER NOT NULL,
+        size     INTEGER NOT NULL,
+        {", ".join(f"{c} TEXT" for c in (*UID_TAGS, *HEADER_TAGS))}
+    );
+    CREATE INDEX IF NOT EXISTS files_study_uid_idx ON files (study_uid);
+    CREATE TABLE IF NOT EXISTS dirty_studies (study_uid TEXT PRIMARY KEY);
+"""
+
+_CREATE_STAGE = """
+    CREATE TEMP TABLE study_metadata_stage
+        (LIKE rpacs.study_metadata INCLUDING DEFAULTS) ON COMMIT DROP
+"""
+_COPY_STAGE = f"COPY study_metadata_stage ({', '.join(STUDY_METADATA_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+_MERGE_STAGE = f"""
+    INSERT INTO rpacs.study_metadata ({", ".join(STUDY_METADATA_COLUMNS)}, created_time)
+    SELECT {", ".join(STUDY_METADATA_COLUMNS)}, now() FROM study_metadata_stage
+    ON CONFLICT (study_instance_uid) DO UPDATE SET
+      {", ".join(f"{c} = EXCLUDED.{c}" for c in STUDY_METADATA_COLUMNS if c != "study_instance_uid")}
+"""
+
+FileStat = tuple[str, int, int]   # (경로, mtime_ns, 크기)
+
+
+# ───── 파일 탐색 / 헤더 읽기 ─────
+def scan_files(root: str | Path) -> Iterator[FileStat]:
+    """root 아래 모든 일반 파일의 (경로, mtime_ns, 크기) — 확장자로 거르지 않음"""
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            log.warning(f"⚠ 디렉터리 읽기 실패: {directory} ({e})")
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.is_file():
+                stat = entry.stat()
+                yield entry.path, stat.st_mtime_ns, stat.st_size
+
+
+def read_header(item: FileStat) -> tuple[FileStat, dict | None]:
+    """
+    파일 하나의 헤더만 읽음 (워커 프로세스에서 실행)
+    반환: (item, {"study_uid", "series_uid", "sop_uid", <HEADER_TAGS 컬럼>...}) — DICOM 이 아니면 None
+    """
+    try:
+        ds = pydicom.dcmread(item[0], stop_before_pixels=True, specific_tags=SPECIFIC_TAGS)
+    except Exception as e:
+        log.debug(f"헤더 읽기 실패: {item[0]} ({e})")
+        return item, None
+    header = {key: str(ds.get(keyword, "") or "").strip()
+              for key, keyword in (*UID_TAGS.items(), *HEADER_TAGS.items())}
+    if not header["study_uid"]:
+        return item, None
+    return item, header
+
+
+# ───── 집계 ─────
+def _to_date(value: str) -> str | None:
+    try:
+        return datetime.strptime(value[:8], "%Y%m%d").date().isoformat() if value else None
+    except ValueError:
+        return None
+
+
+def _to_time(value: str) -> str | None:
+    """DICOM TM(HHMMSS.FFFFFF, 뒷자리 생략 가능) → HH:MM:SS"""
+    digits = value.split(".")[0].replace(":", "")
+    if not digits.isdigit() or len(digits) < 2:
+        return None
+    digits = digits.ljust(6, "0")[:6]
+    hh, mm, ss = int(digits[:2]), int(digits[2:4]), int(digits[4:6])
+    if hh > 23 or mm > 59 or ss > 60:
+        return None
+    return f"{hh:02d}:{mm:02d}:{min(ss, 59):02d}"
+
+
+@dataclass
+class StudyAggregate:
+    """Study 한 건의 파일별 헤더를 모은 결과"""
+    study_instance_uid: str
+    values: dict[str, str] = field(default_factory=dict)
+    series: set[str] = field(default_factory=set)
+    instances: set[str] = field(default_factory=set)
+    multi: dict[str, set[str]] = field(default_factory=lambda: {c: set() for c in _MULTI_VALUED})
+
+    def add(self, header: dict) -> None:
+        if header.get("series_uid"):
+            self.series.add(header["series_uid"])
+        if header.get("sop_uid"):
+            self.instances.add(header["sop_uid"])
+        for column in HEADER_TAGS:
+            value = header.get(column) or ""
+            if not value:
+                continue
+            if column in self.multi:
+                self.multi[column].add(value)
+            else:
+                self.values.setdefault(column, value)
+
+    def as_row(self) -> tuple:
+        """STUDY_METADATA_COLUMNS 순서의 행"""
+        values = dict(self.values)
+        for column, seen in self.multi.items():
+            values[column] = ",".join(sorted(seen)) or None
+        values["patient_birth_date"] = _to_date(values.get("patient_birth_date", ""))
+        values["study_date"] = _to_date(values.get("study_date", ""))
+        values["study_time"] = _to_time(values.get("study_time", ""))
+        values["study_instance_uid"] = self.study_instance_uid
+        values["num_series"] = len(self.series)
+        values["num_instances"] = len(self.instances)
+        return tuple(None if values.get(c) == "" else values.get(c) for c in STUDY_METADATA_COLUMNS)
+
+
+# ───── 파일 목록 (SQLite) ─────
+class FileManifest:
+    """파일별 (mtime, 크기, 헤더) 목록. 증분 실행에서 바뀌지 않은 파일을 거르는 기준"""
+
+    def __init__(self, path: Path | str):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_MANIFEST_SCHEMA)
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM files")
+        self._conn.execute("DELETE FROM dirty_studies")
+        self._conn.commit()
+
+    def changed(self, files: Iterable[FileStat]) -> tuple[list[FileStat], set[str]]:
+        """
+        목록과 mtime/크기가 다른(또는 새) 파일과, 바뀐 파일이 원래 속했던 StudyInstanceUID
+        반환: (다시 읽을 파일, 기존 Study UID 집합)
+        """
+        known = {path: (mtime, size, study)
+                 for path, mtime, size, study in self._conn.execute(
+                     "SELECT path, mtime_ns, size, study_uid FROM files")}
+        todo, studies = [], set()
+        for item in files:
+            previous = known.get(item[0])
+            if previous is None:
+                todo.append(item)
+            elif previous[:2] != item[1:]:
+                todo.append(item)
+                if previous[2]:
+                    studies.add(previous[2])
+        return todo, studies
+
+    def put(self, item: FileStat, header: dict | None) -> None:
+        header = header or {}
+        row = (*item, *(header.get(c) for c in (*UID_TAGS, *HEADER_TAGS)))
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO files ({', '.join(_MANIFEST_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(_MANIFEST_COLUMNS))})", row)
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def dirty(self) -> set[str]:
+        """study_metadata 에 아직 반영되지 않은 StudyInstanceUID"""
+        return {uid for (uid,) in self._conn.execute("SELECT study_uid FROM dirty_studies")}
+
+    def mark_dirty(self, study_uids: Iterable[str]) -> None:
+        self._conn.executemany("INSERT OR IGNORE INTO dirty_studies VALUES (?)", ((u,) for u in study_uids))
+
+    def mark_clean(self, study_uids: Iterable[str]) -> None:
+        """COPY 가 끝난 Study 를 dirty_studies 에서 지우고 commit"""
+        self._conn.executemany("DELETE FROM dirty_studies WHERE study_uid = ?", ((u,) for u in study_uids))
+        self._conn.commit()
+
+    def aggregate(self, study_uids: Iterable[str] | None = None) -> Iterator[StudyAggregate]:
+        """Study 별 집계를 차례로 돌려줌 (study_uids 가 None 이면 목록 전체)"""
+        columns = ("study_uid", "series_uid", "sop_uid", *HEADER_TAGS)
+        sql = f"SELECT {', '.join('f.' + c for c in columns)} FROM files f"
+        if study_uids is not None:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (study_uid TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM wanted")
+            self._conn.executemany("INSERT OR IGNORE INTO wanted VALUES (?)", ((u,) for u in study_uids))
+            sql += " JOIN wanted w ON w.study_uid = f.study_uid"
+        else:
+            sql += " WHERE f.study_uid IS NOT NULL"
+        sql += " ORDER BY f.study_uid"
+
+        current: StudyAggregate | None = None
+        for values in self._conn.execute(sql):
+            header = dict(zip(columns, values))
+            if current is None or current.study_instance_uid != header["study_uid"]:
+                if current is not None:
+                    yield current
+                current = StudyAggregate(header["study_uid"])
+            current.add(header)
+        if current is not None:
+            yield current
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "FileManifest":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ───── PostgreSQL COPY ─────
+def copy_study_metadata(conn, rows: list[tuple]) -> int:
+    """rows 를 임시 테이블로 COPY 한 뒤 study_metadata 에 UPSERT (한 트랜잭션, commit 포함)"""
+    if not rows:
+        return 0
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)      # None → 빈 칸 → NULL
+    buffer.seek(0)
+    with conn.cursor() as cur:
+        cur.execute(_CREATE_STAGE)
+        cur.copy_expert(_COPY_STAGE, buffer)
+        cur.execute(_MERGE_STAGE)
+    conn.commit()
+    return len(rows)
+
+
+def index_studies(conn, root: str | Path, manifest: FileManifest, workers: int = 0,
+                  incremental: bool = True, batch_size: int = 5000) -> dict[str, int]:
+    """
+    root 아래 DICOM 헤더를 읽어 study_metadata 를 채웁니다.
+
+    Args:
+      conn        : psycopg2 커넥션
+      root        : 수신 파일 디렉터리
+      manifest    (FileManifest): 파일별 헤더 목록
+      workers     (int): 헤더 읽기 워커 프로세스 수 (0 = CPU 수)
+      incremental (bool): True 면 mtime/크기가 바뀐 파일만 읽음, False 면 목록을 비우고 전부 다시 읽음
+      batch_size  (int): 한 번에 COPY 할 Study 수
+
+    Returns:
+      {"files", "read", "not_dicom", "studies"} 건수
+    """
+    if not incremental:
+        manifest.clear()
+    with span("study_index.scan"):
+        files = list(scan_files(root))
+        todo, affected = manifest.changed(files)
+        affected |= manifest.dirty()            # 지난 실행에서 COPY 하지 못한 Study
+    counts = {"files": len(files), "read": len(todo), "not_dicom": 0, "studies": 0}
+    log.info(f"▶ Study 색인: 파일 {len(files)}개 중 {len(todo)}개 읽기 ({'증분' if incremental else '전체'})")
+
+    if todo:
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, min(256, len(todo) // (workers * 4) or 1))
+        with span("study_index.read"), ProcessPoolExecutor(max_workers=workers) as pool:
+            for item, header in pool.map(read_header, todo, chunksize=chunksize):
+                manifest.put(item, header)
+                if header is None:
+                    counts["not_dicom"] += 1
+                else:
+                    affected.add(header["study_uid"])
+    # 파일 목록과 다시 집계할 Study 를 함께 commit 한 뒤 COPY (실패하면 dirty_studies 에 남아 다음 실행에서 재시도)
+    manifest.mark_dirty(affected)
+    manifest.commit()
+
+    rows: list[tuple] = []
+    with span("study_index.copy"):
+        for study in manifest.aggregate(affected):
+            rows.append(study.as_row())
+            if len(rows) >= batch_size:
+                counts["studies"] += copy_study_metadata(conn, rows)
+                manifest.mark_clean(row[0] for row in rows)
+                rows.clear()
+        counts["studies"] += copy_study_metadata(conn, rows)
+    manifest.mark_clean(affected)
+
+    log.info(f"▶ Study 색인 완료: {counts}")
+    return counts
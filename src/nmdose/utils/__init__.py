@@ -1,19 +1,39 @@
 # src/nmdose/utils/__init__.py
 
 """
+공용 유틸리티 패키지
 
+공개 이름은 처음 사용할 때 해당 모듈을 import 합니다 (nmdose._lazy).
+예: `from nmdose.utils import sanitize_event` 는 text_utils 만 불러오고 psycopg2/설정 로더는 건드리지 않습니다.
 """
 
-from .date_utils import make_batch_date_range
-from .date_utils import parse_start_date
-from .date_utils import parse_end_date
+from nmdose._lazy import lazy_exports
 
-from .text_utils        import sanitize_event
+_EXPORTS = {
+    "make_batch_date_range":  "date_utils",
+    "make_batch_date_ranges": "date_utils",
+    "plan_batch_windows":     "date_utils",
+    "batch_slot_deadline":    "date_utils",
+    "iter_windows_in_slot":   "date_utils",
+    "parse_start_date":       "date_utils",
+    "parse_end_date":         "date_utils",
 
+    "sanitize_event":         "text_utils",
 
-__all__ = [
-    "make_batch_date_range",
-    "sanitize_event",
-    "parse_start_date",
-    "parse_end_date",
-]
+    "AuditWriter":            "audit_writer",
+
+    "db_connection":          "db_pool",
+    "get_connection_pool":    "db_pool",
+    "close_all_pools":        "db_pool",
+
+    "SegmentLogSink":         "log_sink",
+    "TranscriptIndex":        "transcript_index",
+    "summarize_transcript":   "transcript_index",
+
+    "MetricsRegistry":        "metrics",
+    "observe_move":           "metrics",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
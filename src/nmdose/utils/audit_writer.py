@@ -0,0 +1,169 @@
+# src/nmdose/utils/audit_writer.py
+
+"""
+audit_writer.py
+
+findscus / movescus 감사 로그를 모아 두었다가 배치 단위로 기록하는 writer 입니다.
+
+- 이벤트는 메모리 버퍼에 쌓이고, batch_size 건이 모이거나 flush_interval_sec 가 지나면
+  execute_values 다중 행 INSERT 로 한 트랜잭션에 기록한 뒤 한 번만 commit 합니다.
+- find_id 는 begin_find() 에서 findscus 시퀀스로 미리 할당하므로,
+  findscus 행이 아직 기록되지 않았어도 movescus 이벤트에 바로 사용할 수 있습니다.
+  move_id 도 add_move() 에서 같은 방식으로 할당해 transcript 색인과 연결합니다.
+- 한 flush 안에서 findscus 를 movescus 보다 먼저 기록하므로 외래키 순서가 항상 맞고,
+  findscus 는 find_id 기준 UPSERT 라서 RUNNING 으로 먼저 기록된 행도 finish_find() 결과로 갱신됩니다.
+- 프로세스가 비정상 종료되면 아직 flush 되지 않은 한 배치 분량만 유실됩니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+import logging
+import time
+
+# ───── 서드파티 라이브러리 ─────
+from psycopg2.extras import execute_values
+
+# ───── 내부 모듈 ─────
+from nmdose.utils.metrics import DB_FLUSH_SECONDS, DB_FLUSHED_ROWS
+from nmdose.utils.profiler import profiled
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+
+FINDSCUS_COLUMNS = (
+    "find_id", "ts", "calling_aet", "called_aet",
+    "peer_host", "peer_port",
+    "query_retrieve_level",
+    "start_date", "end_date",
+    "modalities_in_study",
+    "result_count", "duration_ms",
+    "status", "error_detail",
+)
+
+MOVESCUS_COLUMNS = (
+    "move_id", "find_id", "ts", "calling_aet", "called_aet",
+    "peer_host", "peer_port",
+    "pending_count", "completed_count", "failed_count", "warning_count", "remaining_count",
+    "duration_ms",
+    "status", "error_detail", "attempt", "series_instance_uid",
+    "study_instance_uid",
+)
+
+# begin_find() 이후 finish_find() 로 바뀌는 컬럼
+_FINDSCUS_RESULT_COLUMNS = ("result_count", "duration_ms", "status", "error_detail")
+
+_INSERT_FINDSCUS = (
+    f"INSERT INTO findscus ({', '.join(FINDSCUS_COLUMNS)}) VALUES %s "
+    "ON CONFLICT (find_id) DO UPDATE SET "
+    + ", ".join(f"{col} = EXCLUDED.{col}" for col in _FINDSCUS_RESULT_COLUMNS)
+)
+_INSERT_MOVESCUS = f"INSERT INTO movescus ({', '.join(MOVESCUS_COLUMNS)}) VALUES %s"
+_NEXT_FIND_ID = "SELECT nextval(pg_get_serial_sequence('findscus', 'find_id'))"
+_NEXT_MOVE_ID = "SELECT nextval(pg_get_serial_sequence('movescus', 'move_id'))"
+
+
+class AuditWriter:
+    """
+    findscus / movescus 이벤트를 배치로 기록하는 writer.
+
+    with 문으로 사용하면 블록을 벗어날 때 남은 이벤트를 flush 합니다.
+    같은 커넥션을 쓰는 단일 스레드에서 호출하는 것을 전제로 합니다.
+    """
+
+    def __init__(self, conn, batch_size: int = 500, flush_interval_sec: float = 5.0):
+        self.conn = conn
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_sec = flush_interval_sec
+
+        self._finds: dict[int, tuple] = {}   # find_id → 행 (같은 find_id 는 마지막 상태만 기록)
+        self._moves: list[tuple] = []
+        self._last_flush = time.monotonic()
+
+    # ───── 이벤트 추가 ─────
+    def begin_find(self, event: dict) -> int:
+        """
+        C-FIND 이벤트를 버퍼에 넣고 미리 할당한 find_id 를 돌려줍니다.
+        event 의 result_count / duration_ms / status 등은 finish_find() 로 나중에 갱신할 수 있습니다.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(_NEXT_FIND_ID)
+            find_id = cur.fetchone()[0]
+        self._finds[find_id] = self._row(FINDSCUS_COLUMNS, {**event, "find_id": find_id})
+        self._maybe_flush()
+        return find_id
+
+    def finish_find(self, find_id: int, event: dict) -> None:
+        """C-FIND 결과(건수, 소요 시간, 상태, 오류 내용)를 반영합니다."""
+        self._finds[find_id] = self._row(FINDSCUS_COLUMNS, {**event, "find_id": find_id})
+        self._maybe_flush()
+
+    def add_move(self, event: dict) -> int:
+        """
+        C-MOVE 이벤트 한 건을 버퍼에 넣고 미리 할당한 move_id 를 돌려줍니다.
+        event["find_id"] 는 begin_find() 의 반환값입니다.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(_NEXT_MOVE_ID)
+            move_id = cur.fetchone()[0]
+        self._moves.append(self._row(MOVESCUS_COLUMNS, {**event, "move_id": move_id}))
+        self._maybe_flush()
+        return move_id
+
+    @property
+    def pending(self) -> int:
+        """아직 기록되지 않은 이벤트 수"""
+        return len(self._finds) + len(self._moves)
+
+    # ───── 기록 ─────
+    @profiled("db.audit_flush")
+    def flush(self) -> int:
+        """
+        버퍼의 이벤트를 한 트랜잭션으로 기록하고 기록한 건수를 돌려줍니다.
+        실패하면 rollback 후 버퍼를 그대로 두고 예외를 다시 발생시키므로 다음 flush 에서 재시도할 수 있습니다.
+        """
+        count = self.pending
+        if count == 0:
+            self._last_flush = time.monotonic()
+            return 0
+
+        t0 = time.perf_counter()
+        try:
+            with self.conn.cursor() as cur:
+                if self._finds:
+                    execute_values(cur, _INSERT_FINDSCUS, list(self._finds.values()),
+                                   page_size=self.batch_size)
+                if self._moves:
+                    execute_values(cur, _INSERT_MOVESCUS, self._moves, page_size=self.batch_size)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            DB_FLUSH_SECONDS.labels("FAILURE").observe(time.perf_counter() - t0)
+            log.exception(f"❌ 감사 로그 {count}건 기록 실패")
+            raise
+        DB_FLUSH_SECONDS.labels("SUCCESS").observe(time.perf_counter() - t0)
+        DB_FLUSHED_ROWS.inc(count)
+
+        self._finds.clear()
+        self._moves.clear()
+        self._last_flush = time.monotonic()
+        log.debug(f"감사 로그 {count}건 기록")
+        return count
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "AuditWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ───── 내부 도우미 ─────
+    def _maybe_flush(self) -> None:
+        if (self.pending >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval_sec):
+            self.flush()
+
+    @staticmethod
+    def _row(columns: tuple[str, ...], event: dict) -> tuple:
+        return tuple(event[col] for col in columns)
@@ -2,49 +2,25 @@
 
 # ───── 표준 라이브러리 ─────
 from datetime import datetime, date, timedelta
+from typing import Iterator
 import logging
 
 # ───── 서드파티 라이브러리 ─────
 from dateutil import parser
-import psycopg2
 
 # ───── 내부 모듈 ─────
 from nmdose.config_loader.retrieve_options_loader import get_retrieve_config
-from nmdose.config_loader.database import get_db_config
+from nmdose.utils.db_pool import db_connection
+from nmdose.utils.profiler import profiled
 
 # ───── 로거 객체 생성 ─────
 log = logging.getLogger(__name__)
 
 
-def make_batch_date_range() -> str:
-    """
-    retrieve_options.retrieve_to_research.* 설정을 기반으로 날짜 범위를 계산합니다.
-    DB의 마지막 처리일이 있으면 이를 기준으로 시작일을 정하며,
-    일일 시작일을 넘지 않도록 종료일을 제한합니다.
-    반환값: 'YYYYMMDD-YYYYMMDD' 문자열
-    """
-    RETRIEVE_OPTIONS = get_retrieve_config()
-    cfg = RETRIEVE_OPTIONS.retrieve_to_research
-
-    # 설정값 파싱
-    start_str       = cfg.batch_start_date      # 예: "20240222"
-    batch_days      = cfg.batch_days            # 예: 7
-    daily_start_str = cfg.daily_start_date      # 예: "20250508"
-
-    # 문자열 → 날짜 객체
-    start_dt       = parser.parse(start_str).date()
-    daily_start_dt = parser.parse(daily_start_str).date()
-
-    # DB에서 마지막 처리일 조회
-    db_conf = get_db_config().rpacs
-    conn = psycopg2.connect(
-        host=db_conf.host,
-        port=db_conf.port,
-        user=db_conf.user,
-        password=db_conf.user,
-        dbname=db_conf.database
-    )
-    with conn, conn.cursor() as cur:
+@profiled("db.last_processed_date")
+def get_last_processed_date() -> date | None:
+    """batch_status 테이블에서 가장 최근의 last_processed_date 를 조회합니다 (없으면 None)."""
+    with db_connection() as conn, conn.cursor() as cur:
         cur.execute("""
             SELECT last_processed_date
               FROM batch_status
@@ -53,25 +29,112 @@ def make_batch_date_range() -> str:
         """)
         row = cur.fetchone()
 
-    last_processed_dt = None
     if row and row[0]:
         raw = row[0]
-        last_processed_dt = raw if isinstance(raw, date) else parser.parse(str(raw)).date()
+        return raw if isinstance(raw, date) else parser.parse(str(raw)).date()
+    return None
+
+
+def plan_batch_windows(last_processed_dt: date | None = None, cfg=None) -> list[tuple[date, date]]:
+    """
+    batch_start_date(또는 마지막 처리일)부터 daily_start_date 까지 남은 구간을
+    batch_days 크기의 (시작일, 종료일) 창으로 나눈 목록을 시간 순서대로 돌려줍니다.
+
+    첫 창은 make_batch_date_range() 와 같습니다 (마지막 처리일 당일부터 다시 조회).
+    이후 창은 앞 창의 다음 날부터 시작하며, 종료일은 daily_start_date 를 넘지 않습니다.
+    """
+    if cfg is None:
+        cfg = get_retrieve_config().retrieve_to_research
+
+    start_dt       = parser.parse(cfg.batch_start_date).date()
+    daily_start_dt = parser.parse(cfg.daily_start_date).date()
+    step           = timedelta(days=cfg.batch_days)
 
     # 시작일 결정
-    effective_start = (
+    window_start = (
         last_processed_dt if last_processed_dt and last_processed_dt >= start_dt else start_dt
     )
 
-    # 종료일 계산
-    candidate_end = effective_start + timedelta(days=batch_days - 1)
-    effective_end = min(candidate_end, daily_start_dt)
+    windows = []
+    while True:
+        window_end = min(window_start + step - timedelta(days=1), daily_start_dt)
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+        if window_start > daily_start_dt:
+            break
+    return windows
+
+
+def format_date_range(start: date, end: date) -> str:
+    """(시작일, 종료일) → 'YYYYMMDD-YYYYMMDD'"""
+    return f"{start.strftime('%Y%m%d')}-{end.strftime('%Y%m%d')}"
+
+
+@profiled("make_batch_date_ranges")
+def make_batch_date_ranges() -> list[str]:
+    """
+    따라잡기(catch-up)용: 남은 모든 창을 'YYYYMMDD-YYYYMMDD' 문자열 목록으로 반환합니다.
+    각 창을 처리한 뒤 batch_status 에 종료일을 기록하면 다음 실행은 그 다음 창부터 시작합니다.
+    """
+    return [format_date_range(start, end) for start, end in plan_batch_windows(get_last_processed_date())]
+
+
+@profiled("make_batch_date_range")
+def make_batch_date_range() -> str:
+    """
+    retrieve_options.retrieve_to_research.* 설정을 기반으로 날짜 범위를 계산합니다.
+    DB의 마지막 처리일이 있으면 이를 기준으로 시작일을 정하며,
+    일일 시작일을 넘지 않도록 종료일을 제한합니다.
+    반환값: 'YYYYMMDD-YYYYMMDD' 문자열 (plan_batch_windows 의 첫 창)
+    """
+    start, end = plan_batch_windows(get_last_processed_date())[0]
+    return format_date_range(start, end)
+
+
+def batch_slot_deadline(now: datetime | None = None, cfg=None) -> datetime | None:
+    """
+    now 가 batch_start_time ~ batch_end_time 시간대 안이면 그 시간대가 끝나는 시각을,
+    시간대 밖이면 None 을 돌려줍니다. 자정을 넘기는 시간대(예: 22:00 ~ 06:00)도 처리합니다.
+    """
+    if cfg is None:
+        cfg = get_retrieve_config().retrieve_to_research
+    now = now or datetime.now()
+
+    slot_start = datetime.strptime(cfg.batch_start_time, "%H:%M").time()
+    slot_end   = datetime.strptime(cfg.batch_end_time, "%H:%M").time()
+    today      = now.date()
 
-    # 포맷 변환
-    start_fmt = effective_start.strftime("%Y%m%d")
-    end_fmt   = effective_end.strftime("%Y%m%d")
+    if slot_start < slot_end:
+        if slot_start <= now.time() < slot_end:
+            return datetime.combine(today, slot_end)
+        return None
 
-    return f"{start_fmt}-{end_fmt}"
+    # 자정을 넘기는 시간대
+    if now.time() >= slot_start:
+        return datetime.combine(today + timedelta(days=1), slot_end)
+    if now.time() < slot_end:
+        return datetime.combine(today, slot_end)
+    return None
+
+
+def iter_windows_in_slot(windows: list, deadline: datetime | None,
+                         clock=datetime.now) -> Iterator:
+    """
+    windows 를 차례로 돌려주되, 다음 창을 처리할 시간이 deadline 전까지 남아 있을 때만 계속합니다.
+    남은 시간은 지금까지 처리한 창 중 가장 오래 걸린 창의 소요 시간으로 추정합니다.
+    첫 창은 항상 돌려주며, deadline 이 None(배치 시간대 밖에서 수동 실행)이면 첫 창만 처리합니다.
+    """
+    longest = timedelta(0)
+    for i, window in enumerate(windows):
+        if i > 0:
+            if deadline is None:
+                return
+            if clock() + longest > deadline:
+                log.info(f"⏹ 배치 시간대 종료 전 처리 불가: 남은 창 {len(windows) - i}개는 다음 실행으로 이월")
+                return
+        t0 = clock()
+        yield window
+        longest = max(longest, clock() - t0)
 
 
 def parse_start_date(range_str: str) -> date:
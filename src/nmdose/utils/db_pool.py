@@ -0,0 +1,125 @@
+# src/nmdose/utils/db_pool.py
+
+"""
+db_pool.py
+
+config/database.yaml(get_db_config) 기반의 스레드 안전 PostgreSQL 커넥션 풀입니다.
+
+- 접속 대상(rpacs, rpacs_admin)과 DB 이름별로 ThreadedConnectionPool 하나를 프로세스 전체가 공유
+- db_connection() 으로 빌려 쓰고 with 블록이 끝나면 commit(예외 시 rollback) 후 풀에 반납
+- 끊어진 커넥션은 반납 시 폐기하므로 다음 대여 때 새로 연결합니다
+- 비밀번호는 기존 코드와 같이 사용자명과 동일하다고 가정합니다
+- ThreadedConnectionPool.getconn 은 pool_max 개가 모두 대여 중이면 기다리지 않고 PoolError 를 던집니다.
+  API 서버와 배치/워커 스레드가 같은 풀을 쓰므로 db_connection() 은 반납을 wait_sec 초까지 기다린 뒤에만
+  PoolError 를 다시 던집니다 (pool_max 는 동시에 커넥션을 잡는 스레드 수보다 크게 설정)
+"""
+
+# ───── 표준 라이브러리 ─────
+from contextlib import contextmanager
+from typing import Iterator
+import logging
+import threading
+import time
+
+# ───── 서드파티 라이브러리 ─────
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+# ───── 내부 모듈 ─────
+from nmdose.config_loader.database import get_db_config
+from nmdose.utils.profiler import span
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+
+_pools: dict[tuple[str, str], ThreadedConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+GETCONN_WAIT_SEC = 30.0     # 풀이 모두 대여 중일 때 반납을 기다리는 최대 시간(초)
+_GETCONN_POLL_SEC = 0.05
+
+
+def get_connection_pool(target: str = "rpacs", dbname: str | None = None) -> ThreadedConnectionPool:
+    """
+    접속 대상의 커넥션 풀을 돌려줍니다. 처음 호출될 때 생성하고 이후에는 재사용합니다.
+
+    Args:
+      target (str): database.yaml 의 항목 이름 ("rpacs" 또는 "rpacs_admin")
+      dbname (str, optional): 접속할 DB 이름. 지정하지 않으면 설정의 database 값
+    """
+    db_conf = getattr(get_db_config(), target)
+    dbname = dbname or db_conf.database
+    key = (target, dbname)
+
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ThreadedConnectionPool(
+                db_conf.pool_min,
+                db_conf.pool_max,
+                host=db_conf.host,
+                port=db_conf.port,
+                user=db_conf.user,
+                password=db_conf.user,
+                dbname=dbname,
+            )
+            _pools[key] = pool
+            log.info(f"DB 커넥션 풀 생성: {target}/{dbname} (최대 {db_conf.pool_max})")
+    return pool
+
+
+def _getconn(pool: ThreadedConnectionPool, wait_sec: float):
+    """pool.getconn() — 풀이 모두 대여 중이면 wait_sec 초까지 반납을 기다렸다가 다시 시도"""
+    deadline = time.monotonic() + wait_sec
+    while True:
+        try:
+            return pool.getconn()
+        except PoolError:
+            if getattr(pool, "closed", False) or time.monotonic() >= deadline:
+                raise
+            time.sleep(_GETCONN_POLL_SEC)
+
+
+@contextmanager
+def db_connection(target: str = "rpacs", dbname: str | None = None,
+                  autocommit: bool = False, wait_sec: float = GETCONN_WAIT_SEC) -> Iterator:
+    """
+    풀에서 커넥션을 빌려 with 블록 동안 사용합니다.
+    블록이 정상 종료되면 commit, 예외가 나면 rollback 한 뒤 반납합니다.
+
+    Args:
+      autocommit (bool): CREATE DATABASE 처럼 트랜잭션 밖에서 실행해야 하는 명령용
+      wait_sec   (float): 풀이 모두 대여 중일 때 기다리는 최대 시간(초). 넘으면 PoolError
+    """
+    with span("db.getconn"):
+        pool = get_connection_pool(target, dbname)
+        conn = _getconn(pool, wait_sec)
+    broken = False
+    try:
+        conn.autocommit = autocommit
+        yield conn
+        if not autocommit:
+            conn.commit()
+    except BaseException:
+        if not conn.closed:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+        raise
+    finally:
+        broken = broken or bool(conn.closed)
+        if not broken:
+            conn.autocommit = False
+        pool.putconn(conn, close=broken)
+
+
+def close_all_pools() -> None:
+    """모든 커넥션 풀을 닫습니다 (프로세스 종료, 테스트 정리용)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
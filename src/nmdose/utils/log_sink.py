@@ -0,0 +1,248 @@
+# src/nmdose/utils/log_sink.py
+
+"""
+log_sink.py
+
+findscu/movescu 로그(transcript)를 Study 별 작은 파일 대신
+배치 단위의 gzip 세그먼트 파일 하나에 모아 기록하는 비동기 로그 싱크입니다.
+
+- write() 는 큐에 넣기만 하고 곧바로 돌아오며, 백그라운드 스레드가 압축과 파일 쓰기를 담당
+- 레코드 하나 = gzip 멤버 하나 (JSON 한 줄: kind, uid, modality, ts, seq, text)
+  gzip 멤버를 이어 붙인 파일은 그 자체로 올바른 gzip 파일이므로 zcat 으로도 읽을 수 있습니다.
+- 세그먼트마다 "<세그먼트>.idx" 색인(오프셋, kind, uid, ts)을 함께 남겨 UID/오프셋으로 한 레코드만 바로 풀 수 있음
+- 세그먼트 크기가 max_segment_bytes 를 넘으면 다음 세그먼트로 교체
+- 큰 C-FIND transcript 는 open_text() 로 chunk_bytes 단위 레코드(seq 0, 1, ...)로 나눠 기록
+
+읽기: iter_records(), read_record(), find_records() / CLI: scripts/read_batch_log.py
+"""
+
+# ───── 표준 라이브러리 ─────
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+import gzip
+import io
+import json
+import logging
+import queue
+import threading
+import zlib
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".log.gz"
+INDEX_SUFFIX = ".idx"
+
+_STOP = object()
+
+
+@dataclass
+class LogRecord:
+    """
+    세그먼트 파일의 레코드 한 건.
+    Attributes:
+      kind     (str): "findscu" / "movescu" 등 로그 종류
+      uid      (str): StudyInstanceUID (C-FIND 는 "no_uid")
+      modality (str): 모달리티
+      ts       (str): 요청 시작 시각 (ISO 8601)
+      seq      (int): 한 transcript 를 여러 레코드로 나눈 경우의 순번
+      text     (str): 로그 본문
+      segment  (Path | None): 읽어 온 세그먼트 파일
+      offset   (int | None): 세그먼트 안의 압축 오프셋 (read_record 에 사용)
+    """
+    kind: str
+    uid: str
+    modality: str
+    ts: str
+    seq: int
+    text: str
+    segment: Path | None = None
+    offset: int | None = None
+
+
+class SegmentLogSink:
+    """gzip 세그먼트 파일에 로그 레코드를 비동기로 기록하는 싱크"""
+
+    def __init__(self, directory: Path | str, prefix: str = "batch",
+                 max_segment_bytes: int = 64 * 1024 * 1024, queue_size: int = 10_000,
+                 compresslevel: int = 6):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_segment_bytes = max_segment_bytes
+        self.compresslevel = compresslevel
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._segment_seq = 0
+        self._file = None
+        self._index = None
+        self.segment_path: Path | None = None
+        self.errors = 0
+
+        self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+        self._thread.start()
+
+    # ───── 기록 요청 (호출 스레드) ─────
+    def write(self, kind: str, uid: str, modality: str, ts: datetime, text: str, seq: int = 0) -> None:
+        """레코드 한 건을 기록 대기열에 넣습니다. 대기열이 가득 차면 빈자리가 날 때까지 기다립니다."""
+        self._queue.put((kind, uid.replace("\x00", ""), modality, ts.isoformat(), seq,
+                         text.replace("\x00", "")))
+
+    def open_text(self, kind: str, uid: str, modality: str, ts: datetime,
+                  chunk_bytes: int = 1024 * 1024) -> "_ChunkedTranscript":
+        """스트리밍 C-FIND transcript 처럼 write() 로 계속 이어 쓰는 텍스트용 파일 객체"""
+        return _ChunkedTranscript(self, kind, uid, modality, ts, chunk_bytes)
+
+    def close(self) -> None:
+        """대기 중인 레코드를 모두 기록하고 세그먼트를 닫습니다."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def __enter__(self) -> "SegmentLogSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ───── 백그라운드 스레드 ─────
+    def _open_segment(self) -> None:
+        self._segment_seq += 1
+        name = f"{self.prefix}_{datetime.now():%Y%m%d_%H%M%S}_{self._segment_seq:04d}"
+        self.segment_path = self.directory / (name + SEGMENT_SUFFIX)
+        self._file = open(self.segment_path, "ab")
+        self._index = open(self.directory / (name + SEGMENT_SUFFIX + INDEX_SUFFIX), "a", encoding="utf-8")
+        log.info(f"로그 세그먼트 시작: {self.segment_path}")
+
+    def _close_segment(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._index.close()
+            self._file = self._index = None
+
+    def _append(self, kind, uid, modality, ts, seq, text) -> None:
+        if self._file is None or self._file.tell() >= self.max_segment_bytes:
+            self._close_segment()
+            self._open_segment()
+
+        payload = json.dumps({"kind": kind, "uid": uid, "modality": modality, "ts": ts,
+                              "seq": seq, "text": text}, ensure_ascii=False).encode("utf-8")
+        offset = self._file.tell()
+        self._file.write(gzip.compress(payload, compresslevel=self.compresslevel, mtime=0))
+        self._index.write(f"{offset}\t{kind}\t{uid}\t{ts}\t{seq}\n")
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            try:
+                self._append(*item)
+                # 대기열이 비었을 때만 flush 해서 몰릴 때는 쓰기를 모아서 처리
+                if self._queue.empty():
+                    self._file.flush()
+                    self._index.flush()
+            except Exception:
+                self.errors += 1
+                log.exception("❌ 로그 세그먼트 기록 실패")
+        self._close_segment()
+
+
+class _ChunkedTranscript(io.TextIOBase):
+    """chunk_bytes 만큼 모일 때마다 레코드 하나로 싱크에 넘기는 텍스트 파일 객체"""
+
+    def __init__(self, sink: SegmentLogSink, kind, uid, modality, ts, chunk_bytes):
+        self._sink = sink
+        self._meta = (kind, uid, modality, ts)
+        self._chunk_bytes = chunk_bytes
+        self._parts: list[str] = []
+        self._size = 0
+        self._seq = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self._chunk_bytes:
+            self._emit()
+        return len(text)
+
+    def _emit(self) -> None:
+        kind, uid, modality, ts = self._meta
+        self._sink.write(kind, uid, modality, ts, "".join(self._parts), seq=self._seq)
+        self._seq += 1
+        self._parts.clear()
+        self._size = 0
+
+    def close(self) -> None:
+        if not self.closed:
+            if self._parts or self._seq == 0:
+                self._emit()
+        super().close()
+
+
+# ───── 읽기 ─────
+def _decode(payload: bytes, segment: Path, offset: int) -> LogRecord:
+    data = json.loads(payload)
+    return LogRecord(data["kind"], data["uid"], data["modality"], data["ts"], data["seq"], data["text"],
+                     segment, offset)
+
+
+def read_record(segment: Path | str, offset: int) -> LogRecord:
+    """세그먼트의 offset 위치에 있는 레코드 하나만 풀어 돌려줍니다."""
+    segment = Path(segment)
+    with open(segment, "rb") as f:
+        f.seek(offset)
+        decomp = zlib.decompressobj(wbits=31)
+        chunks = []
+        while not decomp.eof:
+            block = f.read(64 * 1024)
+            if not block:
+                raise ValueError(f"{segment}:{offset} 에서 레코드가 끝나지 않았습니다")
+            chunks.append(decomp.decompress(block))
+    return _decode(b"".join(chunks), segment, offset)
+
+
+def iter_records(segment: Path | str) -> Iterator[LogRecord]:
+    """세그먼트의 모든 레코드를 순서대로 돌려줍니다 (색인 없이 파일만으로 동작)."""
+    segment = Path(segment)
+    data = memoryview(segment.read_bytes())
+    offset = 0
+    while offset < len(data):
+        decomp = zlib.decompressobj(wbits=31)
+        chunks, pos = [], offset
+        while not decomp.eof and pos < len(data):
+            block = data[pos:pos + 64 * 1024]
+            chunks.append(decomp.decompress(block))
+            pos += len(block)
+        if not decomp.eof:
+            log.warning(f"⚠ {segment}:{offset} 이후 불완전한 레코드 (기록 중 종료된 세그먼트)")
+            return
+        yield _decode(b"".join(chunks), segment, offset)
+        offset = pos - len(decomp.unused_data)
+
+
+def iter_index(segment: Path | str) -> Iterator[tuple[int, str, str, str, int]]:
+    """세그먼트 색인의 (offset, kind, uid, ts, seq) 목록"""
+    index_path = Path(str(segment) + INDEX_SUFFIX)
+    with open(index_path, encoding="utf-8") as f:
+        for line in f:
+            offset, kind, uid, ts, seq = line.rstrip("\n").split("\t")
+            yield int(offset), kind, uid, ts, int(seq)
+
+
+def find_records(directory: Path | str, uid: str, kind: str | None = None) -> list[LogRecord]:
+    """디렉터리의 모든 세그먼트에서 uid 의 레코드를 색인으로 찾아 돌려줍니다 (seq 순)."""
+    found = []
+    for segment in sorted(Path(directory).glob("*" + SEGMENT_SUFFIX)):
+        if not Path(str(segment) + INDEX_SUFFIX).is_file():
+            found += [r for r in iter_records(segment) if r.uid == uid and kind in (None, r.kind)]
+            continue
+        for offset, rec_kind, rec_uid, _, _ in iter_index(segment):
+            if rec_uid == uid and kind in (None, rec_kind):
+                found.append(read_record(segment, offset))
+    return found
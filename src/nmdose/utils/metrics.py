@@ -0,0 +1,325 @@
+# src/nmdose/utils/metrics.py
+
+"""
+metrics.py
+
+프로세스 내 메트릭 레지스트리와 Prometheus 텍스트 형식(0.0.4) 출력입니다.
+
+- Counter / Gauge / Histogram 은 레이블 값 튜플별 자식을 dict 에 캐시하므로,
+  C-FIND/C-MOVE 루프에서의 기록 비용은 dict 조회 + 잠금 + 정수/실수 덧셈 정도입니다.
+- 값은 /metrics 요청(render) 시에만 문자열로 만들어집니다.
+- 풀 사용률처럼 조회 시점에 읽으면 되는 값은 register_collector() 로 등록한 함수가 render 때 계산합니다.
+- 배치 스크립트처럼 HTTP 서버가 없는 프로세스는 write_textfile() 로 node_exporter textfile 수집기용 파일을 남깁니다.
+
+외부 라이브러리(prometheus_client)에 의존하지 않으며 nmdose 의 다른 모듈도 import 하지 않습니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Iterable
+import logging
+import math
+import os
+import threading
+import weakref
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+# 초 단위 지연 시간 기본 버킷 (C-FIND 수백 ms ~ C-MOVE 수십 분)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+# DB flush 처럼 짧은 작업용 버킷
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+Sample = tuple[str, dict[str, str], float]   # (이름, 레이블, 값)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class _Metric:
+    """레이블 값 튜플별 자식 값을 가진 메트릭 패밀리"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """레이블 값에 해당하는 자식 (처음 보는 조합이면 생성)"""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}: 레이블 {self.labelnames} 에 값 {key} 를 줄 수 없습니다.")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _default(self):
+        """레이블이 없는 메트릭의 단일 자식"""
+        return self.labels()
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        with self._lock:
+            self._children.clear()
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+
+class Counter(_Metric):
+    """단조 증가 카운터 (이름은 _total 로 끝나도록 짓습니다)"""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value(self._lock)
+
+    def inc(self, amount: float = 1) -> None:
+        self._default().inc(amount)
+
+    def samples(self) -> Iterable[Sample]:
+        for key, child in list(self._children.items()):
+            yield self.name, dict(zip(self.labelnames, key)), child.value
+
+
+class Gauge(Counter):
+    """올라가고 내려가는 현재 값"""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1) -> None:
+        self._default().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: tuple[float, ...], lock: threading.Lock):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = lock
+
+    def observe(self, value: float) -> None:
+        idx = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+            self.count += 1
+
+
+class Histogram(_Metric):
+    """고정 버킷 히스토그램 (le 버킷은 render 시 누적)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != math.inf))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets, self._lock)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def samples(self) -> Iterable[Sample]:
+        for key, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, key))
+            with self._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+Collector = Callable[[], Iterable[tuple[str, str, str, list[Sample]]]]
+
+
+class MetricsRegistry:
+    """메트릭 패밀리와 조회 시점 수집기(collector)의 모음"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Collector] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"이미 다른 형태로 등록된 메트릭입니다: {metric.name}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def register_collector(self, collector: Collector) -> None:
+        """
+        render 때마다 호출할 수집기 등록.
+        collector() 는 (이름, 종류, 설명, [(이름, 레이블, 값), ...]) 튜플들을 돌려줍니다.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        families: list[tuple[str, str, str, Iterable[Sample]]] = [
+            (m.name, m.kind, m.help, m.samples()) for m in list(self._metrics.values())
+        ]
+        for collector in list(self._collectors):
+            try:
+                families.extend(collector())
+            except Exception:
+                log.exception(f"❌ 메트릭 수집기 실행 실패: {collector!r}")
+
+        lines: list[str] = []
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str | Path) -> None:
+        """node_exporter textfile 수집기용 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+# ───── 프로세스 전역 레지스트리와 nmdose 메트릭 ─────
+registry = MetricsRegistry()
+
+CFIND_SECONDS = registry.histogram(
+    "nmdose_cfind_duration_seconds", "C-FIND 한 건의 소요 시간 (마지막 응답까지)",
+    ("endpoint", "modality", "status"))
+CFIND_RESPONSES = registry.counter(
+    "nmdose_cfind_responses_total", "C-FIND 로 받은 응답(Study) 수", ("endpoint", "modality"))
+CMOVE_SECONDS = registry.histogram(
+    "nmdose_cmove_duration_seconds", "Study 단위 C-MOVE 한 건의 소요 시간",
+    ("endpoint", "modality", "status"))
+STUDIES_MOVED = registry.counter(
+    "nmdose_studies_moved_total", "C-MOVE 를 마친 Study 수", ("endpoint", "modality", "status"))
+INSTANCES_MOVED = registry.counter(
+    "nmdose_instances_moved_total", "C-MOVE sub-operation 결과별 인스턴스 수 (rate() = 인스턴스/초)",
+    ("endpoint", "modality", "result"))
+MOVE_INSTANCES_PER_SEC = registry.gauge(
+    "nmdose_move_instances_per_second", "마지막 C-MOVE 의 완료 인스턴스 처리 속도", ("endpoint",))
+MOVE_QUEUE_DEPTH = registry.gauge(
+    "nmdose_move_queue_depth", "스케줄러에 예약됐지만 아직 시작하지 않은 C-MOVE 수", ("endpoint",))
+MOVE_INFLIGHT = registry.gauge(
+    "nmdose_move_inflight", "실행 중인 C-MOVE 수", ("endpoint",))
+DB_FLUSH_SECONDS = registry.histogram(
+    "nmdose_db_flush_duration_seconds", "감사 로그 배치 기록(flush) 소요 시간", ("status",),
+    buckets=FAST_BUCKETS)
+DB_FLUSHED_ROWS = registry.counter(
+    "nmdose_db_flushed_rows_total", "감사 로그로 기록한 행 수")
+
+
+def observe_move(outcome, endpoint: str, modality: str) -> None:
+    """MoveOutcome 한 건을 C-MOVE 메트릭에 반영 (modality 는 호출한 쪽이 알고 있음)"""
+    result = outcome.result
+    seconds = outcome.duration_ms / 1000
+    CMOVE_SECONDS.labels(endpoint, modality, result.status).observe(seconds)
+    STUDIES_MOVED.labels(endpoint, modality, result.status).inc()
+    for name in ("completed", "failed", "warning"):
+        count = getattr(result, name, 0)
+        if count:
+            INSTANCES_MOVED.labels(endpoint, modality, name).inc(count)
+    if seconds > 0:
+        MOVE_INSTANCES_PER_SEC.labels(endpoint).set(result.completed / seconds)
+
+
+# ───── Association 풀 사용률 (render 시점에 읽음) ─────
+_pools: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def track_pool(pool) -> None:
+    """stats() 와 max_size 를 가진 풀을 사용률 메트릭 대상으로 등록 (약한 참조)"""
+    _pools.add(pool)
+
+
+def _collect_pools():
+    in_use: list[Sample] = []
+    idle: list[Sample] = []
+    utilization: list[Sample] = []
+    for pool in list(_pools):
+        for pair, stats in pool.stats().items():
+            labels = {"pair": pair}
+            in_use.append(("nmdose_association_pool_in_use", labels, stats["in_use"]))
+            idle.append(("nmdose_association_pool_idle", labels, stats["idle"]))
+            utilization.append(("nmdose_association_pool_utilization", labels,
+                                stats["in_use"] / pool.max_size if pool.max_size else 0.0))
+    return [
+        ("nmdose_association_pool_in_use", "gauge", "사용 중인 Association 수", in_use),
+        ("nmdose_association_pool_idle", "gauge", "유휴 Association 수", idle),
+        ("nmdose_association_pool_utilization", "gauge", "사용 중 / 최대 Association 비율", utilization),
+    ]
+
+
+registry.register_collector(_collect_pools)
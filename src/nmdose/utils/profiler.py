@@ -0,0 +1,255 @@
+# src/nmdose/utils/profiler.py
+
+"""
+profiler.py
+
+배치 실행 한 번의 단계별 소요 시간을 계층(span) 구조로 모으는 프로파일러입니다.
+
+- `with span("cfind"):` 이나 `@profiled("db.batch_status")` 로 단계를 표시하면,
+  같은 부모 아래 같은 이름의 span 은 한 노드로 합쳐져 호출 수/누적/최소/최대 시간이 쌓입니다.
+- 중첩은 스레드별 스택으로 추적합니다. 스택이 빈 스레드(C-MOVE 스케줄러의 작업 스레드 등)의 span 은
+  루트 바로 아래에 붙으며, 병렬로 실행된 시간은 합산되므로 벽시계 시간보다 클 수 있습니다.
+- activate() 로 켠 프로파일러가 없으면 span()/profiled 는 아무것도 하지 않으므로
+  코드에 남겨 두어도 C-FIND/C-MOVE 루프에 부담이 없습니다.
+- summary() 는 flame graph 도구(d3-flame-graph 등)가 읽을 수 있는 name/value/children 트리이고,
+  dump() 로 실행별 JSON 파일을, save_profile() 로 PostgreSQL profile_runs 에 집계 행을 남깁니다.
+"""
+
+# ───── 표준 라이브러리 ─────
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Iterator
+import json
+import logging
+import threading
+import time
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+
+class _Node:
+    """같은 경로(부모 → 이름)의 span 누적 통계"""
+
+    __slots__ = ("name", "calls", "total", "min", "max", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.children: dict[str, "_Node"] = {}
+
+
+class Profiler:
+    """실행 한 번 동안의 span 트리"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now()
+        self._t0 = time.perf_counter()
+        self._elapsed: float | None = None
+        self._root = _Node(name)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    # ───── 기록 ─────
+    def _stack(self) -> list[_Node]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = [self._root]
+        return stack
+
+    def _child(self, name: str) -> _Node:
+        parent = self._stack()[-1]
+        node = parent.children.get(name)
+        if node is None:
+            with self._lock:
+                node = parent.children.setdefault(name, _Node(name))
+        return node
+
+    def _observe(self, node: _Node, elapsed: float) -> None:
+        with self._lock:
+            node.calls += 1
+            node.total += elapsed
+            node.min = min(node.min, elapsed)
+            node.max = max(node.max, elapsed)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """현재 스레드의 span 아래에 name 단계를 기록"""
+        node = self._child(name)
+        stack = self._stack()
+        stack.append(node)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            stack.pop()
+            self._observe(node, elapsed)
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        이미 잰 시간을 현재 스레드의 span 아래 name 단계에 한 번의 호출로 더합니다.
+        yield 로 소비자에게 제어를 넘기는 제너레이터처럼 벽시계 구간을 span 으로 감쌀 수 없을 때 사용합니다.
+        """
+        self._observe(self._child(name), seconds)
+
+    def stop(self) -> None:
+        """실행 종료 시각 고정 (루트의 소요 시간)"""
+        if self._elapsed is None:
+            self._elapsed = time.perf_counter() - self._t0
+
+    @property
+    def elapsed(self) -> float:
+        return self._elapsed if self._elapsed is not None else time.perf_counter() - self._t0
+
+    # ───── 출력 ─────
+    def summary(self) -> dict:
+        """
+        flame-style 트리: {"name", "value"(ms), "calls", "total_ms", "self_ms", "min_ms", "max_ms", "children"}
+        자식은 누적 시간이 큰 순서로 정렬합니다.
+        """
+        with self._lock:
+            return self._summarize(self._root, self.elapsed, 1)
+
+    def _summarize(self, node: _Node, total: float, calls: int) -> dict:
+        children = [self._summarize(c, c.total, c.calls) for c in node.children.values()]
+        children.sort(key=lambda c: c["total_ms"], reverse=True)
+        total_ms = round(total * 1000, 3)
+        child_ms = sum(c["total_ms"] for c in children)
+        return {
+            "name": node.name,
+            "value": total_ms,
+            "calls": calls,
+            "total_ms": total_ms,
+            "self_ms": round(max(0.0, total_ms - child_ms), 3),
+            "min_ms": round(node.min * 1000, 3) if node.calls else total_ms,
+            "max_ms": round(node.max * 1000, 3) if node.calls else total_ms,
+            "children": children,
+        }
+
+    def stages(self) -> dict[str, float]:
+        """{"cfind/record_move": 누적 ms, ...} — 경로별 누적 시간 (DB 집계 행용)"""
+        flat: dict[str, float] = {}
+
+        def walk(node: dict, prefix: str) -> None:
+            for child in node["children"]:
+                path = f"{prefix}/{child['name']}" if prefix else child["name"]
+                flat[path] = child["total_ms"]
+                walk(child, path)
+
+        walk(self.summary(), "")
+        return flat
+
+    def render_text(self, min_ms: float = 1.0) -> str:
+        """콘솔용 들여쓰기 요약 (min_ms 보다 짧은 단계는 생략)"""
+        lines: list[str] = []
+
+        def walk(node: dict, depth: int) -> None:
+            lines.append(f"{'  ' * depth}{node['name']}: {node['total_ms']:.1f}ms "
+                         f"(x{node['calls']}, self {node['self_ms']:.1f}ms)")
+            for child in node["children"]:
+                if child["total_ms"] >= min_ms:
+                    walk(child, depth + 1)
+
+        walk(self.summary(), 0)
+        return "\n".join(lines)
+
+    def dump(self, directory: str | Path) -> Path:
+        """directory/<name>_<시작시각>.json 으로 summary 저장"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.name}_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json"
+        data = {
+            "name": self.name,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.elapsed * 1000, 3),
+            "tree": self.summary(),
+        }
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+
+# ───── 프로세스 전역 활성 프로파일러 ─────
+_active: Profiler | None = None
+_NOOP = nullcontext()
+
+
+@contextmanager
+def activate(profiler: Profiler) -> Iterator[Profiler]:
+    """with 블록 동안 profiler 를 모든 스레드의 span()/profiled 대상으로 설정"""
+    global _active
+    previous, _active = _active, profiler
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active = previous
+
+
+def span(name: str):
+    """활성 프로파일러에 name 단계를 기록하는 context manager (없으면 아무것도 하지 않음)"""
+    profiler = _active
+    if profiler is None:
+        return _NOOP
+    return profiler.span(name)
+
+
+def add_time(name: str, seconds: float) -> None:
+    """활성 프로파일러에 이미 잰 시간을 name 단계로 더합니다 (없으면 아무것도 하지 않음)"""
+    profiler = _active
+    if profiler is not None:
+        profiler.add(name, seconds)
+
+
+def profiled(name: str | None = None) -> Callable:
+    """함수 호출 전체를 span 으로 기록하는 데코레이터 (이름을 생략하면 함수 이름)"""
+
+    def decorator(fn: Callable) -> Callable:
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            profiler = _active
+            if profiler is None:
+                return fn(*args, **kwargs)
+            with profiler.span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ───── PostgreSQL 집계 행 ─────
+_CREATE_PROFILE_RUNS = """
+CREATE TABLE IF NOT EXISTS profile_runs (
+    run_id      serial PRIMARY KEY,
+    name        text NOT NULL,
+    started_at  timestamptz NOT NULL,
+    duration_ms integer NOT NULL,
+    stages      jsonb NOT NULL
+)
+"""
+
+_INSERT_PROFILE_RUN = """
+INSERT INTO profile_runs (name, started_at, duration_ms, stages)
+VALUES (%s, %s, %s, %s::jsonb)
+RETURNING run_id
+"""
+
+
+def save_profile(conn, profiler: Profiler) -> int:
+    """profile_runs 에 실행 한 건의 경로별 누적 시간을 기록하고 run_id 를 돌려줍니다 (commit 포함)."""
+    with conn.cursor() as cur:
+        cur.execute(_CREATE_PROFILE_RUNS)
+        cur.execute(_INSERT_PROFILE_RUN, (
+            profiler.name, profiler.started_at, int(profiler.elapsed * 1000),
+            json.dumps(profiler.stages(), ensure_ascii=False),
+        ))
+        run_id = cur.fetchone()[0]
+    conn.commit()
+    return run_id
@@ -2,6 +2,8 @@
 
 import copy
 
+from nmdose.utils.profiler import profiled
+
 _NULL_TRANS = str.maketrans('', '', '\x00')
 
 def strip_nuls(s: str) -> str:
@@ -29,6 +31,7 @@ def sanitize_value(x):
     # 필요 시 set, etc. 도 추가 가능
     return x
 
+@profiled("sanitize_event")
 def sanitize_event(event: dict) -> dict:
     """
     event 딕셔너리 전체를 복사 없이 제자리(recursive in-place)로
@@ -0,0 +1,219 @@
+# src/nmdose/utils/transcript_index.py
+
+"""
+transcript_index.py
+
+findscu/movescu transcript 에서 상태 줄과 DIMSE 상태 코드만 뽑아
+로컬 SQLite FTS5 색인에 넣고 조회하는 모듈입니다.
+
+- 원문 전체는 로그 세그먼트(log_sink.py)에 두고, 색인에는 문제 추적에 필요한 줄만 보관
+  (E:/W:/F: 줄, Response/Status 줄, 0xNNNN 상태 코드)
+- find_id / move_id / StudyInstanceUID 는 일반 테이블의 인덱스로, 본문은 FTS5 로 검색하므로
+  UID 조회와 "Refused", "0xA701" 같은 검색이 수 ms 안에 끝납니다.
+- findscus/movescus.error_detail 에는 summarize_transcript() 의 한 줄 요약만 기록합니다.
+
+조회 CLI: scripts/search_transcripts.py
+"""
+
+# ───── 표준 라이브러리 ─────
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+import logging
+import re
+import sqlite3
+
+# ───── 로거 객체 생성 ─────
+log = logging.getLogger(__name__)
+
+# 색인에 남길 줄: DCMTK 의 오류/경고/치명 줄과 DIMSE 응답/상태 줄
+_STATUS_LINE = re.compile(
+    r"^\s*[EWF]:|Response|Status|Error|Fail|Abort|Reject|Refused|Timeout|0x[0-9A-Fa-f]{4}",
+    re.IGNORECASE,
+)
+_STATUS_CODE = re.compile(r"0x[0-9A-Fa-f]{4}\b")
+_SUCCESS_CODES = {"0X0000", "0XFF00", "0XFF01"}
+
+SUMMARY_MAX_CHARS = 300
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS transcripts (
+        id       INTEGER PRIMARY KEY,
+        kind     TEXT NOT NULL,
+        uid      TEXT,
+        find_id  INTEGER,
+        move_id  INTEGER,
+        modality TEXT,
+        ts       TEXT,
+        status   TEXT,
+        codes    TEXT,
+        body     TEXT
+    );
+    CREATE INDEX IF NOT EXISTS transcripts_uid_idx     ON transcripts (uid);
+    CREATE INDEX IF NOT EXISTS transcripts_find_id_idx ON transcripts (find_id);
+    CREATE INDEX IF NOT EXISTS transcripts_move_id_idx ON transcripts (move_id);
+    CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts
+        USING fts5(status, codes, body, content='transcripts', content_rowid='id');
+"""
+
+_COLUMNS = "id, kind, uid, find_id, move_id, modality, ts, status, codes, body"
+
+
+def extract_status_lines(text: str, max_lines: int = 200) -> list[str]:
+    """transcript 에서 상태/오류 줄만 골라 돌려줍니다 (앞쪽 max_lines 줄까지)."""
+    lines = []
+    for line in text.splitlines():
+        if _STATUS_LINE.search(line):
+            lines.append(line.strip())
+            if len(lines) >= max_lines:
+                break
+    return lines
+
+
+def extract_status_codes(text: str) -> list[str]:
+    """transcript 에 나온 DIMSE 상태 코드(0xNNNN) 목록 (중복 제거, 대문자)"""
+    return list(dict.fromkeys(f"0x{code[2:].upper()}" for code in _STATUS_CODE.findall(text)))
+
+
+def summarize_transcript(text: str, max_chars: int = SUMMARY_MAX_CHARS) -> str | None:
+    """
+    감사 테이블의 error_detail 용 한 줄 요약.
+    첫 오류(E:/F:) 줄, 없으면 마지막 상태 줄에 성공이 아닌 DIMSE 상태 코드를 덧붙입니다.
+    """
+    lines = extract_status_lines(text)
+    if not lines:
+        stripped = text.strip()
+        return stripped.splitlines()[-1][:max_chars] if stripped else None
+
+    summary = next((line for line in lines if line[:2] in ("E:", "F:")), lines[-1])
+    codes = [c for c in extract_status_codes(text) if c.upper() not in _SUCCESS_CODES]
+    if codes and not any(c.lower() in summary.lower() for c in codes):
+        summary += f" [{' '.join(codes)}]"
+    return summary[:max_chars]
+
+
+def fts_phrase(text: str) -> str:
+    """사용자 입력 → FTS5 구(phrase) 질의 (큰따옴표로 감싸 -, :, = 등을 연산자로 해석하지 않게 함)"""
+    return '"' + text.replace('"', '""') + '"'
+
+
+@dataclass
+class TranscriptHit:
+    """
+    색인 조회 결과 한 건.
+    Attributes:
+      id       (int): 색인 행 id
+      kind     (str): "findscu" / "movescu"
+      uid      (str): StudyInstanceUID (C-FIND 는 "no_uid")
+      find_id  (int | None): findscus.find_id
+      move_id  (int | None): movescus.move_id
+      modality (str | None): 모달리티
+      ts       (str | None): 요청 시작 시각 (ISO 8601)
+      status   (str | None): "SUCCESS" / "FAILURE"
+      codes    (str): 공백으로 구분한 DIMSE 상태 코드
+      body     (str): 색인된 상태/오류 줄
+    """
+    id: int
+    kind: str
+    uid: str | None
+    find_id: int | None
+    move_id: int | None
+    modality: str | None
+    ts: str | None
+    status: str | None
+    codes: str
+    body: str
+
+
+class TranscriptIndex:
+    """
+    SQLite FTS5 transcript 색인.
+    add() 는 batch_size 건마다 commit 하며, 같은 스레드에서 호출하는 것을 전제로 합니다 (AuditWriter 와 같음).
+    """
+
+    def __init__(self, path: Path | str, batch_size: int = 200):
+        self.path = Path(path)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")     # 기록 중에도 CLI 에서 조회 가능
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._pending = 0
+
+    # ───── 기록 ─────
+    def add(self, kind: str, uid: str | None, text: str, status: str | None = None,
+            find_id: int | None = None, move_id: int | None = None,
+            modality: str | None = None, ts: datetime | str | None = None) -> int:
+        """transcript 의 상태 줄과 상태 코드를 색인하고 행 id 를 돌려줍니다."""
+        body = "\n".join(extract_status_lines(text))
+        codes = " ".join(extract_status_codes(text))
+        if isinstance(ts, datetime):
+            ts = ts.isoformat()
+
+        cur = self._conn.execute(
+            "INSERT INTO transcripts (kind, uid, find_id, move_id, modality, ts, status, codes, body) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (kind, uid, find_id, move_id, modality, ts, status, codes, body),
+        )
+        row_id = cur.lastrowid
+        self._conn.execute(
+            "INSERT INTO transcripts_fts (rowid, status, codes, body) VALUES (?, ?, ?, ?)",
+            (row_id, status, codes, body),
+        )
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+        return row_id
+
+    def flush(self) -> None:
+        self._conn.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "TranscriptIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ───── 조회 ─────
+    def by_uid(self, uid: str) -> list[TranscriptHit]:
+        """StudyInstanceUID 의 색인 항목 (기록 순)"""
+        return self._select("WHERE uid = ? ORDER BY id", (uid,))
+
+    def by_find_id(self, find_id: int) -> list[TranscriptHit]:
+        """find_id 에 속한 C-FIND/C-MOVE 항목 (기록 순)"""
+        return self._select("WHERE find_id = ? ORDER BY id", (find_id,))
+
+    def by_move_id(self, move_id: int) -> list[TranscriptHit]:
+        """move_id 의 C-MOVE 항목"""
+        return self._select("WHERE move_id = ? ORDER BY id", (move_id,))
+
+    def search(self, query: str, limit: int = 50, kind: str | None = None,
+               raw: bool = False) -> list[TranscriptHit]:
+        """
+        FTS5 검색. 관련도 순으로 최대 limit 건을 돌려줍니다.
+        기본은 query 전체를 한 구(phrase)로 찾으므로 'C-MOVE-RSP', 'E: Failed', 'status=0xA701' 처럼
+        FTS5 연산자 문자가 섞인 문자열도 그대로 검색됩니다.
+        raw=True 면 FTS5 질의 문법을 그대로 사용합니다 (예: 'codes:0xA701', 'status:FAILURE AND timeout').
+        질의 문법이 잘못되면 sqlite3.OperationalError 가 납니다.
+        """
+        sql = (f"SELECT {', '.join('t.' + c.strip() for c in _COLUMNS.split(','))} "
+               "FROM transcripts_fts f JOIN transcripts t ON t.id = f.rowid "
+               "WHERE transcripts_fts MATCH ?")
+        params: tuple = (query if raw else fts_phrase(query),)
+        if kind is not None:
+            sql += " AND t.kind = ?"
+            params += (kind,)
+        sql += " ORDER BY f.rank LIMIT ?"
+        params += (limit,)
+        return [TranscriptHit(*row) for row in self._conn.execute(sql, params)]
+
+    def _select(self, where: str, params: tuple) -> list[TranscriptHit]:
+        rows = self._conn.execute(f"SELECT {_COLUMNS} FROM transcripts {where}", params)
+        return [TranscriptHit(*row) for row in rows]
@@ -0,0 +1,124 @@
+# tests/api/test_jobs.py
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from nmdose.api import job_manager
+from nmdose.api.job_manager import JobManager
+from nmdose.dimse.backends import FindStream
+
+
+def wait_finished(job, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.finished
+
+
+def test_same_key_is_deduplicated_while_running():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+    job, created = manager.submit("t", lambda j: release.wait(5) and "done", key="k")
+    again, created_again = manager.submit("t", lambda j: None, key="k")
+    assert created and not created_again and again is job
+
+    release.set()
+    wait_finished(job)
+    assert job.state == job_manager.SUCCEEDED and job.result == "done"
+    assert manager.submit("t", lambda j: None, key="k")[1] is True
+    manager.shutdown()
+
+
+def test_cancel_running_and_queued_jobs():
+    manager = JobManager(max_workers=1)
+    started = threading.Event()
+
+    def loop(job):
+        started.set()
+        while not job.cancelled:
+            time.sleep(0.01)
+        return "stopped"
+
+    running, _ = manager.submit("t", loop)
+    queued, _ = manager.submit("t", lambda j: "never")
+    started.wait(5)
+
+    manager.cancel(queued.id)
+    assert queued.state == job_manager.CANCELLED
+    manager.cancel(running.id)
+    wait_finished(running)
+    assert running.state == job_manager.CANCELLED
+    assert [e for _, e, _ in running.events_since()] == ["start", "cancel_requested", "end"]
+    manager.shutdown()
+
+
+def test_failed_job_records_error():
+    manager = JobManager()
+    job, _ = manager.submit("t", lambda j: 1 / 0)
+    wait_finished(job)
+    assert job.state == job_manager.FAILED and "division" in job.error
+    manager.shutdown()
+
+
+class EP:
+    def __init__(self, aet):
+        self.aet = aet
+
+
+class FakeEnv:
+    modalities = ["PT", "NM"]
+
+    def endpoints(self):
+        return EP("NMDOSE"), EP("PACS")
+
+    def date_range(self):
+        return "20250101-20250101"
+
+
+class FakeBackend:
+    name = "fake"
+
+    def iter_find(self, calling, called, keys):
+        modality = keys["ModalitiesInStudy"]
+
+        def produce(stream):
+            for i in range(3):
+                yield {"0020,000D": f"1.2.{modality}.{i}", "0008,0020": "20250101"}
+            stream.status = "SUCCESS"
+        return FindStream(produce)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    import nmdose.dimse
+    import nmdose.env.init
+    import nmdose.main
+
+    monkeypatch.setattr(nmdose.env.init, "init_app_environment", lambda: FakeEnv())
+    monkeypatch.setattr(nmdose.dimse, "get_dimse_backend", lambda: FakeBackend())
+    with TestClient(nmdose.main.app) as client:
+        yield client
+
+
+def test_start_findscu_runs_preview_job_and_streams_progress(client):
+    started = client.post("/api/start-findscu").json()
+    assert started["status"] in ("started", "running")
+    job_id = started["job_id"]
+
+    with client.stream("GET", f"/api/jobs/{job_id}/events") as response:
+        body = "".join(response.iter_text())
+
+    events = [line.split(": ", 1)[1] for line in body.splitlines() if line.startswith("event: ")]
+    assert events[0] == "start" and events[-1] == "end"
+    assert events.count("study") == 6
+
+    job = client.get(f"/api/jobs/{job_id}").json()
+    assert job["state"] == "SUCCEEDED"
+    assert job["result"] == {"date_range": "20250101-20250101", "counts": {"PT": 3, "NM": 3}, "studies": 6}
+    assert client.get("/api/jobs/unknown").status_code == 404
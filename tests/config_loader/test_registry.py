@@ -0,0 +1,94 @@
+# tests/config_loader/test_registry.py
+
+import os
+
+import pytest
+
+from nmdose.config_loader.registry import ConfigRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def write(path, text, mtime_ns):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def setup(tmp_path):
+    clock = FakeClock()
+    registry = ConfigRegistry(check_interval=5, clock=clock)
+    path = tmp_path / "opts.yaml"
+    write(path, "a", 1_000_000_000)
+    calls = []
+
+    def parser(p):
+        calls.append(p)
+        text = p.read_text(encoding="utf-8")
+        if text == "broken":
+            raise ValueError("bad yaml")
+        return text
+
+    return registry, clock, path, parser, calls
+
+
+def test_cached_until_interval_and_stat_change(setup):
+    registry, clock, path, parser, calls = setup
+    assert registry.get(path, parser) == "a"
+    write(path, "bb", 2_000_000_000)
+
+    # 확인 주기 안에서는 stat 도 하지 않고 캐시를 돌려줌
+    clock.now = 4
+    assert registry.get(path, parser) == "a"
+    assert len(calls) == 1
+
+    clock.now = 6
+    assert registry.get(path, parser) == "bb"
+    clock.now = 12
+    assert registry.get(path, parser) == "bb"   # 내용이 그대로면 다시 파싱하지 않음
+    assert len(calls) == 2
+
+
+def test_subscribers_notified_on_change_only(setup):
+    registry, clock, path, parser, calls = setup
+    seen = []
+    unsubscribe = registry.subscribe(path, lambda new, old: seen.append((new, old)))
+
+    registry.get(path, parser)
+    assert seen == []
+
+    write(path, "bb", 2_000_000_000)
+    clock.now = 10
+    registry.get(path, parser)
+    assert seen == [("bb", "a")]
+
+    unsubscribe()
+    write(path, "ccc", 3_000_000_000)
+    registry.invalidate(path)
+    assert registry.get(path, parser) == "ccc"
+    assert seen == [("bb", "a")]
+
+
+def test_failed_reload_keeps_previous_value(setup):
+    registry, clock, path, parser, calls = setup
+    registry.get(path, parser)
+
+    write(path, "broken", 2_000_000_000)
+    clock.now = 10
+    assert registry.get(path, parser) == "a"
+
+    write(path, "fixed", 3_000_000_000)
+    clock.now = 20
+    assert registry.get(path, parser) == "fixed"
+
+
+def test_first_load_errors_propagate(tmp_path):
+    registry = ConfigRegistry()
+    with pytest.raises(FileNotFoundError):
+        registry.get(tmp_path / "missing.yaml", lambda p: p.read_text())
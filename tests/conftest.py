@@ -0,0 +1,77 @@
+# tests/conftest.py
+
+import pytest
+
+
+class FakeCursor:
+    """psycopg2 커서 대역: 실행한 SQL 을 커넥션에 기록하고 커넥션의 rows 를 돌려줌"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params))
+
+    def fetchone(self):
+        if self.conn.fetchone is not None:
+            return self.conn.fetchone()
+        return self.conn.rows[0] if self.conn.rows else None
+
+    def fetchall(self):
+        return list(self.conn.rows)
+
+    def __iter__(self):
+        return iter(self.conn.rows)
+
+    def copy_expert(self, sql, buffer):
+        self.conn.copied.append((sql, buffer.read()))
+
+
+class FakeConnection:
+    """
+    psycopg2 커넥션 대역.
+    Attributes:
+      rows      (list): 커서의 fetchall()/반복 결과 (fetchone 을 주지 않으면 첫 행이 fetchone 결과)
+      fetchone  (callable | None): 호출마다 fetchone() 결과를 만드는 함수 (e.g. 시퀀스 nextval)
+      error     (Exception | None): 주면 cursor() 가 이 예외를 던짐 (DB 장애 흉내)
+      executed  (list): 실행한 (SQL, params)
+      copied    (list): copy_expert 로 받은 (SQL, 본문 텍스트)
+      commits / rollbacks (int): commit()/rollback() 호출 수
+    """
+
+    def __init__(self, rows=(), fetchone=None, error=None):
+        self.rows = list(rows)
+        self.fetchone = fetchone
+        self.error = error
+        self.executed = []
+        self.copied = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    @property
+    def statements(self) -> list[str]:
+        """실행한 SQL 문 (공백 정규화)"""
+        return [" ".join(sql.split()) for sql, _ in self.executed]
+
+    def cursor(self):
+        if self.error is not None:
+            raise self.error
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def fake_conn():
+    """FakeConnection 을 만드는 팩토리: fake_conn(rows=..., fetchone=..., error=...)"""
+    return FakeConnection
@@ -0,0 +1,68 @@
+# tests/dimse/conftest.py
+
+import pytest
+
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+
+pytest.importorskip("pynetdicom")
+
+from pydicom.dataset import Dataset
+from pynetdicom import AE, evt
+from pynetdicom.sop_class import (
+    StudyRootQueryRetrieveInformationModelFind,
+    StudyRootQueryRetrieveInformationModelMove,
+    Verification,
+)
+
+
+STUDIES = [
+    ("1.2.3.1", "20240101", "PT"),
+    ("1.2.3.2", "20240102", "PT"),
+    ("1.2.3.3", "20240102", "NM"),
+]
+
+
+@pytest.fixture
+def scp():
+    """C-FIND/C-MOVE 를 응답하는 로컬 PACS 대역(SCP)"""
+    received = []
+
+    def handle_find(event):
+        query = event.identifier
+        received.append(query)
+        for uid, study_date, modality in STUDIES:
+            if query.ModalitiesInStudy and query.ModalitiesInStudy != modality:
+                continue
+            ds = Dataset()
+            ds.QueryRetrieveLevel = "STUDY"
+            ds.StudyInstanceUID = uid
+            ds.StudyDate = study_date
+            ds.ModalitiesInStudy = modality
+            yield 0xFF00, ds
+
+    def handle_move(event):
+        # 목적지 없이 sub-operation 0건으로 바로 성공 처리
+        yield "127.0.0.1", 11113
+        yield 0
+
+    def handle_accepted(event):
+        accepted.append(event.assoc)
+
+    accepted = []
+    ae = AE(ae_title="FAKEPACS")
+    ae.add_supported_context(StudyRootQueryRetrieveInformationModelFind)
+    ae.add_supported_context(StudyRootQueryRetrieveInformationModelMove)
+    ae.add_supported_context(Verification)
+    server = ae.start_server(
+        ("127.0.0.1", 0), block=False,
+        evt_handlers=[
+            (evt.EVT_C_FIND, handle_find),
+            (evt.EVT_C_MOVE, handle_move),
+            (evt.EVT_ACCEPTED, handle_accepted),
+        ],
+    )
+    port = server.server_address[1]
+    endpoint = DicomEndpoint(aet="FAKEPACS", ip="127.0.0.1", port=port)
+    # received: 받은 C-FIND Identifier 목록, accepted: 수락한 Association 목록
+    yield endpoint, received, accepted
+    server.shutdown()
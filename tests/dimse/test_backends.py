@@ -0,0 +1,117 @@
+# tests/dimse/test_backends.py
+
+import io
+import os
+
+import pytest
+
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+from nmdose.dimse import PynetdicomBackend, SubprocessBackend, get_dimse_backend
+from nmdose.dimse.backends import build_identifier, dataset_to_record
+
+pytest.importorskip("pynetdicom")
+
+
+CALLING = DicomEndpoint(aet="NMDOSE", ip="127.0.0.1", port=11113)
+
+
+def test_pynetdicom_find_returns_structured_responses(scp):
+    called, received, _ = scp
+    backend = PynetdicomBackend()
+
+    result = backend.find(CALLING, called, {
+        "QueryRetrieveLevel": "STUDY",
+        "StudyDate": "20240101-20240102",
+        "ModalitiesInStudy": "PT",
+        "StudyInstanceUID": "",
+    })
+
+    assert result.status == "SUCCESS"
+    assert [r["0020,000D"] for r in result.responses] == ["1.2.3.1", "1.2.3.2"]
+    assert result.responses[0]["0008,0020"] == "20240101"
+    assert received[0].StudyDate == "20240101-20240102"
+
+
+def test_pynetdicom_move_reports_success(scp):
+    called, _, _ = scp
+    result = PynetdicomBackend().move(CALLING, called, {
+        "QueryRetrieveLevel": "STUDY",
+        "StudyInstanceUID": "1.2.3.1",
+    })
+    assert result.status == "SUCCESS"
+    assert result.failed == 0
+
+
+def test_pynetdicom_find_association_failure():
+    # 아무도 듣지 않는 포트 → Association 실패
+    called = DicomEndpoint(aet="NOBODY", ip="127.0.0.1", port=1)
+    result = PynetdicomBackend(acse_timeout=2, network_timeout=2).find(
+        CALLING, called, {"QueryRetrieveLevel": "STUDY"}
+    )
+    assert result.status == "FAILURE"
+    assert result.responses == []
+
+
+def test_build_identifier_accepts_keywords_and_tags():
+    ds = build_identifier({"QueryRetrieveLevel": "STUDY", "0020,000d": "", "0008,0020": "20240101"})
+    attrs = dataset_to_record(ds)
+    assert attrs == {"0008,0020": "20240101", "0008,0052": "STUDY", "0020,000D": ""}
+
+
+def test_subprocess_backend_parses_findscu_output(monkeypatch):
+    transcript = (
+        "I: Requesting Association\n"
+        "I: ---------------------------\n"
+        "I: Find Response: 1 (Pending)\n"
+        "I: (0008,0020) DA [20240101]\n"
+        "I: (0020,000d) UI [1.2.3.1]\n"
+        "I: ---------------------------\n"
+        "I: Find Response: 2 (Pending)\n"
+        "I: (0020,000d) UI [1.2.3.2]\n"
+    )
+    backend = SubprocessBackend()
+    monkeypatch.setattr(backend, "_run", lambda cmd: (transcript, "SUCCESS"))
+
+    result = backend.find(CALLING, CALLING, {"StudyInstanceUID": ""})
+    assert [r["0020,000D"] for r in result.responses] == ["1.2.3.1", "1.2.3.2"]
+
+
+def test_get_dimse_backend_rejects_unknown_name():
+    assert get_dimse_backend("subprocess").name == "subprocess"
+    with pytest.raises(ValueError):
+        get_dimse_backend("nope")
+
+
+def test_subprocess_iter_find_streams_child_output(tmp_path, monkeypatch):
+    # PATH 앞쪽에 가짜 findscu 를 두어 실제 파이프 읽기를 검증
+    fake = tmp_path / "findscu"
+    fake.write_text(
+        "#!/bin/sh\n"
+        "echo 'I: Find Response: 1 (Pending)'\n"
+        "echo 'I: (0020,000d) UI [1.2.3.1]'\n"
+        "echo 'I: Find Response: 2 (Pending)'\n"
+        "echo 'I: (0020,000d) UI [1.2.3.2]'\n"
+        "echo 'I: Received Final Find Response (Success)'\n"
+    )
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+
+    log_file = io.StringIO()
+    stream = SubprocessBackend().iter_find(CALLING, CALLING, {"StudyInstanceUID": ""}, transcript=log_file)
+    uids = [attrs["0020,000D"] for attrs in stream]
+
+    assert uids == ["1.2.3.1", "1.2.3.2"]
+    assert stream.status == "SUCCESS"
+    assert stream.count == 2
+    assert "Received Final Find Response" in log_file.getvalue()
+
+
+def test_pynetdicom_iter_find_streams_responses(scp):
+    called, _, _ = scp
+    stream = PynetdicomBackend().iter_find(CALLING, called, {
+        "QueryRetrieveLevel": "STUDY",
+        "ModalitiesInStudy": "",
+        "StudyInstanceUID": "",
+    })
+    assert [attrs["0020,000D"] for attrs in stream] == ["1.2.3.1", "1.2.3.2", "1.2.3.3"]
+    assert stream.status == "SUCCESS"
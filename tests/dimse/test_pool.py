@@ -0,0 +1,83 @@
+# tests/dimse/test_pool.py
+
+import threading
+
+import pytest
+
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+from nmdose.dimse import AssociationError, AssociationPool, PynetdicomBackend
+
+pytest.importorskip("pynetdicom")
+
+
+CALLING = DicomEndpoint(aet="NMDOSE", ip="127.0.0.1", port=11113)
+MOVE_KEYS = {"QueryRetrieveLevel": "STUDY", "StudyInstanceUID": "1.2.3.1"}
+
+
+def test_pooled_backend_reuses_one_association(scp):
+    called, _, accepted = scp
+    backend = PynetdicomBackend(pool_size=2)
+    try:
+        for _ in range(10):
+            assert backend.move(CALLING, called, MOVE_KEYS).status == "SUCCESS"
+        assert len(accepted) == 1
+        assert backend.pool.stats()[f"NMDOSE->{called.aet}"] == {"idle": 1, "in_use": 0}
+    finally:
+        backend.close()
+
+
+def test_pool_respects_max_size_across_threads(scp):
+    called, _, accepted = scp
+    backend = PynetdicomBackend(pool_size=2)
+    errors = []
+
+    def worker():
+        for _ in range(5):
+            if backend.move(CALLING, called, MOVE_KEYS).status != "SUCCESS":
+                errors.append("move failed")
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    backend.close()
+
+    assert errors == []
+    assert 1 <= len(accepted) <= 2
+
+
+def test_pool_replaces_idle_expired_association(scp):
+    called, _, accepted = scp
+    backend = PynetdicomBackend()
+    pool = AssociationPool(backend, max_size=1, idle_timeout=0)
+    try:
+        with pool.borrow(CALLING, called) as first:
+            pass
+        with pool.borrow(CALLING, called) as second:
+            assert second is not first
+        assert len(accepted) == 2
+    finally:
+        pool.close()
+
+
+def test_pool_discards_association_after_error(scp):
+    called, _, accepted = scp
+    pool = AssociationPool(PynetdicomBackend(), max_size=1)
+    with pytest.raises(RuntimeError):
+        with pool.borrow(CALLING, called):
+            raise RuntimeError("boom")
+    assert pool.stats()[f"NMDOSE->{called.aet}"] == {"idle": 0, "in_use": 0}
+    pool.close()
+
+
+def test_pool_acquire_timeout_when_exhausted(scp):
+    called, _, _ = scp
+    pool = AssociationPool(PynetdicomBackend(), max_size=1, acquire_timeout=0.2)
+    try:
+        with pool.borrow(CALLING, called):
+            with pytest.raises(AssociationError):
+                with pool.borrow(CALLING, called):
+                    pass
+    finally:
+        pool.close()
@@ -0,0 +1,81 @@
+# tests/dimse/test_progress.py
+
+import os
+
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+from nmdose.dimse import MoveResult, ProgressBus, SubprocessBackend
+from nmdose.dimse.backends import parse_movescu_line
+from nmdose.tasks.move_scheduler import MoveScheduler
+
+CALLING = DicomEndpoint(aet="NMDOSE", ip="127.0.0.1", port=11113)
+CALLED = DicomEndpoint(aet="ORTHANC", ip="127.0.0.1", port=4242)
+
+
+def test_bus_tracks_active_and_recent_moves():
+    bus = ProgressBus(keep_finished=2)
+    events = []
+    bus.subscribe(lambda event, p: events.append((event, p.uid, p.completed)))
+
+    bus.start("1.2.1", "ORTHANC")
+    bus.update("1.2.1", MoveResult("FAILURE", pending_count=1, remaining=3, completed=1))
+    assert bus.active()[0]["total"] == 4
+
+    bus.finish("1.2.1", MoveResult("SUCCESS", pending_count=4, remaining=0, completed=4))
+    assert bus.active() == []
+    assert bus.get("1.2.1")["status"] == "SUCCESS"
+    assert bus.get("1.2.1")["completed"] == 4
+    assert [e[0] for e in events] == ["start", "update", "update", "finish"]
+
+
+def test_parse_movescu_line_reads_debug_counts():
+    result = MoveResult("FAILURE")
+    assert parse_movescu_line("I: Received Move Response 1 (Pending)", result)
+    assert parse_movescu_line("D: Remaining Suboperations       : 5", result)
+    assert parse_movescu_line("D: Completed Suboperations       : 2", result)
+    assert not parse_movescu_line("D: Message Type                  : C-MOVE RSP", result)
+    assert (result.pending_count, result.remaining, result.completed) == (1, 5, 2)
+
+
+def test_subprocess_move_reports_progress_while_streaming(tmp_path, monkeypatch):
+    # PATH 앞쪽에 가짜 movescu 를 두어 응답마다 콜백이 호출되는지 검증
+    fake = tmp_path / "movescu"
+    fake.write_text(
+        "#!/bin/sh\n"
+        "echo 'I: Received Move Response 1 (Pending)'\n"
+        "echo 'D: Message Type                  : C-MOVE RSP'\n"
+        "echo 'D: Remaining Suboperations       : 1'\n"
+        "echo 'D: Completed Suboperations       : 1'\n"
+        "echo 'D: Failed Suboperations          : 0'\n"
+        "echo 'I: Received Move Response 2 (Success)'\n"
+        "echo 'D: Completed Suboperations       : 2'\n"
+    )
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+
+    seen = []
+    result = SubprocessBackend().move(CALLING, CALLED, {"StudyInstanceUID": "1.2.1"},
+                                      on_progress=lambda r: seen.append((r.remaining, r.completed)))
+
+    assert result.status == "SUCCESS"
+    assert (result.pending_count, result.completed, result.failed) == (1, 2, 0)
+    assert seen[1:3] == [(1, 0), (1, 1)]
+    assert "Move Response 2" in result.transcript
+    assert "Completed Suboperations       : 2" in result.transcript
+    assert "Message Type" not in result.transcript
+
+
+def test_scheduler_publishes_progress_to_bus():
+    class Backend:
+        def move(self, calling, called, keys, on_progress=None):
+            result = MoveResult("SUCCESS", pending_count=1, remaining=1, completed=1)
+            on_progress(result)
+            assert bus.active()[0]["completed"] == 1
+            result.remaining, result.completed = 0, 2
+            return result
+
+    bus = ProgressBus()
+    outcomes = list(MoveScheduler(Backend(), CALLING, CALLED, progress=bus).run(["1.2.1"]))
+
+    assert outcomes[0].result.completed == 2
+    assert bus.active() == []
+    assert bus.recent()[0]["completed"] == 2
@@ -0,0 +1,112 @@
+# tests/tasks/test_dose_extract.py
+
+import json
+import shutil
+from datetime import date
+from pathlib import Path
+
+import pydicom
+import pytest
+
+from nmdose.tasks import dose_extract
+from nmdose.tasks.dose_extract import (
+    extract_dose, extract_dose_statistics, extract_file, is_dose_report, iter_dicom_files,
+)
+
+SAMPLE = Path(__file__).resolve().parents[2] / "sample.dcm"
+SAMPLE_SOP = "1.2.840.113619.2.290.3.296522351.592.1735768826.183"
+
+
+@pytest.fixture
+def upserted(monkeypatch):
+    """execute_values 로 UPSERT 한 (커넥션, 행) 목록"""
+    calls = []
+
+    def fake_execute_values(cur, sql, values, template=None, page_size=100):
+        assert "ON CONFLICT (sop_instance_uid)" in sql
+        calls.extend((cur.conn, row) for row in values)
+
+    monkeypatch.setattr(dose_extract, "execute_values", fake_execute_values)
+    return calls
+
+
+def test_extract_dose_parses_ct_dose_report():
+    ds = pydicom.dcmread(SAMPLE, stop_before_pixels=True)
+    assert is_dose_report(ds)
+
+    row = extract_dose(ds, extracted_by="test")
+    assert row["sop_instance_uid"] == SAMPLE_SOP
+    assert row["study_date"] == date(2025, 1, 2)
+    assert row["patient_birth_date"] == date(1947, 1, 19)
+    assert row["body_part_examined"] == "Orbit region"     # 헤더에 없으면 Target Region
+    assert row["extracted_by"] == "test"
+
+    dose = row["dose_data"]
+    assert dose["title"] == "X-Ray Radiation Dose Report"
+    assert dose["dlp_total"] == 274.25
+    assert dose["ctdivol_max"] == 3.08
+    assert len(dose["events"]) == 2
+    assert dose["events"][1]["DLP"]["value"] == 274.25
+    assert dose["accumulated"]["Total Number of Irradiation Events"]["value"] == 2
+    json.dumps(dose)
+
+
+def test_extract_file_skips_known_and_non_dicom(tmp_path):
+    other = tmp_path / "note.txt"
+    other.write_text("not dicom")
+    dose_extract._init_worker(frozenset(), "test")
+    assert extract_file(SAMPLE)[0] == "extracted"
+    assert extract_file(other) == ("error", None)
+
+    dose_extract._init_worker(frozenset({SAMPLE_SOP}), "test")
+    try:
+        assert extract_file(SAMPLE) == ("skipped", None)
+    finally:
+        dose_extract._init_worker(frozenset(), dose_extract.EXTRACTED_BY)
+
+
+def test_extract_dose_statistics_is_idempotent(tmp_path, fake_conn, upserted):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    shutil.copy(SAMPLE, tmp_path / "a" / "b" / "SR1")
+    shutil.copy(SAMPLE, tmp_path / "a" / "SR1_copy")     # 같은 객체 사본은 한 행으로
+    assert len(list(iter_dicom_files(tmp_path))) == 2
+
+    conn = fake_conn()
+    counts = extract_dose_statistics(conn, tmp_path, workers=1)
+    assert counts["extracted"] == 2 and counts["written"] == 1
+    (written_conn, row), = upserted
+    assert written_conn is conn and json.loads(row[12])["dlp_total"] == 274.25
+    assert "CREATE UNIQUE INDEX IF NOT EXISTS" in conn.statements[0]
+
+    rerun = fake_conn(rows=[(SAMPLE_SOP,)])
+    counts = extract_dose_statistics(rerun, tmp_path, workers=1)
+    assert counts["skipped"] == 2 and counts["written"] == 0
+    assert len(upserted) == 1
+
+    forced = fake_conn(rows=[(SAMPLE_SOP,)])
+    counts = extract_dose_statistics(forced, tmp_path, workers=1, force=True)
+    assert counts["written"] == 1
+    assert [sql for sql, _ in forced.executed] == [dose_extract._MIGRATE_DOSE_STATISTICS]   # force 면 기존 UID 를 읽지 않음
+
+
+def test_malformed_num_items_keep_the_report(caplog, monkeypatch):
+    ds = pydicom.dcmread(SAMPLE, stop_before_pixels=True)
+    nums = [item for container in ds.ContentSequence if container.get("ContentSequence")
+            for item in container.ContentSequence if item.get("ValueType") == "NUM"]
+    del nums[0].MeasuredValueSequence[0].NumericValue               # 값 없음
+    nums[1].MeasuredValueSequence[0].NumericValue = ["1.5", "2.5"]   # 다중 값 (DLP Total)
+
+    row = extract_dose(ds, extracted_by="test")
+    dose = row["dose_data"]
+    assert dose["accumulated"]["Total Number of Irradiation Events"]["value"] is None
+    assert dose["accumulated"]["CT Dose Length Product Total"]["value"] == "1.5\\2.5"
+    assert dose["dlp_total"] is None and dose["ctdivol_max"] == 3.08   # 나머지 항목은 그대로 추출
+    json.dumps(dose)
+
+    def broken(ds, extracted_by):
+        raise ValueError("bad content tree")
+    monkeypatch.setattr(dose_extract, "extract_dose", broken)
+    dose_extract._init_worker(frozenset(), "test")
+    with caplog.at_level("WARNING", logger=dose_extract.__name__):
+        assert extract_file(SAMPLE) == ("error", None)
+    assert str(SAMPLE) in caplog.text and "bad content tree" in caplog.text
@@ -0,0 +1,112 @@
+# tests/tasks/test_dose_retrieve.py
+
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+from nmdose.config_loader.retrieve_options_loader import RetrieveToDoseConfig
+from nmdose.dimse import FindResult, FindStream, MoveResult
+from nmdose.tasks.dose_retrieve import (
+    SeriesInfo, find_first_axial_image, is_axial_image, retrieve_dose_series, retrieve_for_dose,
+    select_dose_series,
+)
+
+DOSE = DicomEndpoint(aet="NMDOSE", ip="127.0.0.1", port=5678)
+CLINICAL = DicomEndpoint(aet="NMPACS", ip="127.0.0.1", port=104)
+
+CFG = RetrieveToDoseConfig(
+    ct_enable_modalities_in_series=True, ct_modalities_in_series=["SR"],
+    ct_enable_series_description=True, ct_series_description=["Dose Report", "Patient Protocol"],
+    ct_enable_series_number=True, ct_series_number=["501", "999"],
+    pet_enable_single_axial_first_image=True,
+)
+
+SERIES = [
+    {"0020,000E": "1.2.3.1", "0008,0060": "CT", "0008,103E": "CT WB 3.0", "0020,0011": "2", "0020,1209": "512"},
+    {"0020,000E": "1.2.3.2", "0008,0060": "SR", "0008,103E": "Radiation Dose", "0020,0011": "700"},
+    {"0020,000E": "1.2.3.3", "0008,0060": "OT", "0008,103E": "CT DOSE REPORT", "0020,0011": "3"},
+    {"0020,000E": "1.2.3.4", "0008,0060": "SC", "0008,103E": "", "0020,0011": " 999"},
+    {"0020,000E": "1.2.3.5", "0008,0060": "PT", "0008,103E": "PET WB", "0020,0011": "4"},
+]
+
+
+AXIAL = "1\\0\\0\\0\\1\\0"
+CORONAL = "1\\0\\0\\0\\0\\-1"
+
+IMAGES = [
+    {"0008,0018": "1.2.3.5.3", "0020,0013": "3", "0020,0037": AXIAL},
+    {"0008,0018": "1.2.3.5.1", "0020,0013": "1", "0008,0008": "DERIVED\\SECONDARY\\MIP"},
+    {"0008,0018": "1.2.3.5.2", "0020,0013": "2", "0020,0037": AXIAL},
+    {"0008,0018": "1.2.3.5.0", "0020,0013": "0", "0020,0037": CORONAL},
+]
+
+
+class FakeBackend:
+    def __init__(self):
+        self.finds = []
+        self.moves = []
+
+    def find(self, calling, called, keys):
+        self.finds.append(keys)
+        return FindResult(list(SERIES), "SUCCESS")
+
+    def iter_find(self, calling, called, keys):
+        self.finds.append(keys)
+
+        def produce(stream):
+            yield from IMAGES
+            stream.status = "SUCCESS"
+        return FindStream(produce)
+
+    def move(self, calling, called, keys, on_progress=None):
+        self.moves.append((calling.aet, keys))
+        return MoveResult("SUCCESS", completed=1)
+
+
+def test_select_dose_series_matches_any_enabled_rule():
+    series = [SeriesInfo.from_record("1.2.3", attrs) for attrs in SERIES]
+    assert [s.series_uid for s in select_dose_series(series, CFG)] == ["1.2.3.2", "1.2.3.3", "1.2.3.4"]
+    assert series[0].instances == 512 and series[1].instances is None
+
+
+def test_disabled_rules_are_ignored():
+    cfg = RetrieveToDoseConfig(**{**CFG.__dict__, "ct_enable_series_description": False,
+                                  "ct_enable_series_number": False})
+    series = [SeriesInfo.from_record("1.2.3", attrs) for attrs in SERIES]
+    assert [s.series_uid for s in select_dose_series(series, cfg)] == ["1.2.3.2"]
+
+
+def test_retrieve_moves_only_selected_series_to_calling():
+    backend = FakeBackend()
+    results = retrieve_dose_series(backend, DOSE, CLINICAL, "1.2.3", CFG, modality="CT")
+
+    assert backend.finds[0]["QueryRetrieveLevel"] == "SERIES"
+    assert backend.finds[0]["StudyInstanceUID"] == "1.2.3"
+    assert [keys["SeriesInstanceUID"] for _, keys in backend.moves] == ["1.2.3.2", "1.2.3.3", "1.2.3.4"]
+    assert all(aet == "NMDOSE" and keys["QueryRetrieveLevel"] == "SERIES" for aet, keys in backend.moves)
+    assert all(outcome.result.status == "SUCCESS" for _, outcome in results)
+
+
+def test_axial_check_uses_image_type_and_orientation():
+    assert is_axial_image({"0020,0037": AXIAL})
+    assert not is_axial_image({"0020,0037": CORONAL})
+    assert not is_axial_image({"0008,0008": "DERIVED\\SECONDARY\\REFORMATTED"})
+    assert is_axial_image({})   # 방향 정보를 주지 않는 PACS
+
+
+def test_first_axial_image_has_lowest_instance_number():
+    series = SeriesInfo("1.2.3", "1.2.3.5", modality="PT")
+    assert find_first_axial_image(FakeBackend(), DOSE, CLINICAL, series) == "1.2.3.5.2"
+
+
+def test_retrieve_for_dose_moves_one_pet_image_per_axial_series():
+    backend = FakeBackend()
+    results = retrieve_for_dose(backend, DOSE, CLINICAL, "1.2.3", CFG, modality="PT")
+
+    assert sum(keys["QueryRetrieveLevel"] == "SERIES" for keys in backend.finds) == 1
+    image_moves = [keys for _, keys in backend.moves if keys["QueryRetrieveLevel"] == "IMAGE"]
+    assert image_moves == [{"QueryRetrieveLevel": "IMAGE", "StudyInstanceUID": "1.2.3",
+                            "SeriesInstanceUID": "1.2.3.5", "SOPInstanceUID": "1.2.3.5.2"}]
+    assert len(results) == 4
+
+    cfg = RetrieveToDoseConfig(**{**CFG.__dict__, "pet_enable_single_axial_first_image": False})
+    backend = FakeBackend()
+    retrieve_for_dose(backend, DOSE, CLINICAL, "1.2.3", cfg)
+    assert all(keys["QueryRetrieveLevel"] == "SERIES" for _, keys in backend.moves)
@@ -0,0 +1,86 @@
+# tests/tasks/test_find_splitter.py
+
+from datetime import date
+
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+from nmdose.dimse import FindStream
+from nmdose.tasks.find_splitter import QuerySegment, SplittingFinder
+from nmdose.tasks.findscu_parser import StudyRecord
+
+CALLING = DicomEndpoint(aet="NMDOSE", ip="127.0.0.1", port=11113)
+CALLED = DicomEndpoint(aet="ORTHANC", ip="127.0.0.1", port=4242)
+
+
+def _in_range(value, query):
+    if not query:
+        return True
+    if "-" not in query:
+        return value == query
+    low, high = query.split("-")
+    return low <= value <= high
+
+
+class CappedBackend:
+    """응답을 최대 cap 건까지만 돌려주는 PACS 흉내. 받은 조회 키를 queries 에 기록"""
+
+    def __init__(self, studies, cap):
+        self.studies = studies   # [(uid, StudyDate, StudyTime)]
+        self.cap = cap
+        self.queries = []
+
+    def iter_find(self, calling, called, keys, transcript=None):
+        self.queries.append(dict(keys))
+        matches = [s for s in self.studies
+                   if _in_range(s[1], keys["StudyDate"]) and _in_range(s[2], keys.get("StudyTime"))]
+
+        def produce(stream):
+            for uid, study_date, study_time in matches[:self.cap]:
+                yield StudyRecord.from_pairs([("0008,0020", study_date), ("0008,0030", study_time),
+                                              ("0020,000D", uid)])
+            stream.status = "SUCCESS"
+
+        return FindStream(produce)
+
+
+def test_segment_splits_dates_then_study_time():
+    segment = QuerySegment.from_date_range("20240101-20240104")
+    assert [s.study_date for s in segment.split(60)] == ["20240101-20240102", "20240103-20240104"]
+
+    day = QuerySegment(date(2024, 1, 1), date(2024, 1, 1))
+    morning, afternoon = day.split(60)
+    assert (morning.study_time, afternoon.study_time) == ("000000-115959", "120000-235959")
+    assert QuerySegment(day.start_date, day.end_date, 0, 60).split(60) == []
+
+
+def test_truncated_range_is_bisected_and_merged_without_duplicates():
+    studies = [(f"1.2.{d}.{i}", f"202401{d:02d}", f"{8 + i:02d}0000") for d in range(1, 5) for i in range(3)]
+    backend = CappedBackend(studies, cap=4)
+    finder = SplittingFinder(backend, CALLING, CALLED, max_results=4)
+
+    stream = finder.iter_find({"QueryRetrieveLevel": "STUDY", "StudyDate": "20240101-20240104",
+                               "StudyInstanceUID": ""})
+    uids = [r["0020,000D"] for r in stream]
+
+    assert sorted(uids) == sorted(s[0] for s in studies)
+    assert len(uids) == len(set(uids)) == stream.count
+    assert stream.status == "SUCCESS"
+    assert backend.queries[0]["StudyDate"] == "20240101-20240104"
+    assert {q["StudyDate"] for q in backend.queries} >= {"20240101", "20240104"}
+
+
+def test_single_day_over_ceiling_is_split_by_study_time():
+    studies = [(f"1.2.{h}", "20240101", f"{h:02d}3000") for h in range(24)]
+    backend = CappedBackend(studies, cap=10)
+    finder = SplittingFinder(backend, CALLING, CALLED, max_results=10, min_time_slot_min=60)
+
+    uids = {r["0020,000D"] for r in finder.iter_find({"StudyDate": "20240101"})}
+
+    assert uids == {s[0] for s in studies}
+    assert any("StudyTime" in q for q in backend.queries)
+
+
+def test_disabled_splitting_sends_one_query():
+    backend = CappedBackend([("1.2.1", "20240101", "080000")], cap=1)
+    stream = SplittingFinder(backend, CALLING, CALLED).iter_find({"StudyDate": "20240101-20240110"})
+    assert [r["0020,000D"] for r in stream] == ["1.2.1"]
+    assert len(backend.queries) == 1
@@ -0,0 +1,71 @@
+# tests/tasks/test_findscu_parser.py
+
+from nmdose.tasks.findscu_parser import StudyRecord, iter_findscu_responses, parse_findscu_output
+
+SAMPLE = """I: Requesting Association
+I: Association Accepted (Max Send PDV: 16372)
+I: Sending Find Request (MsgID 1)
+I: ---------------------------
+I: Find Response: 1 (Pending)
+I:
+I: # Dicom-Data-Set
+I: (0008,0020) DA [20240101]                               #   8, 1 StudyDate
+I: (0010,0010) PN [HONG^GILDONG]                           #  12, 1 PatientName
+I: (0020,000d) UI [1.2.3.1]                                #   8, 1 StudyInstanceUID
+I: ---------------------------
+I: Find Response: 2 (Pending)
+I:
+I: # Dicom-Data-Set
+I: (0008,0020) DA [20240102]                               #   8, 1 StudyDate
+I: (0020,000D) UI [1.2.3.2]                                #   8, 1 StudyInstanceUID
+I: Received Final Find Response (Success)
+I: Releasing Association
+"""
+
+
+def test_parse_findscu_output_splits_responses():
+    parsed = parse_findscu_output(SAMPLE)
+    assert [r["0020,000D"] for r in parsed] == ["1.2.3.1", "1.2.3.2"]
+    assert parsed[0]["0010,0010"] == "HONG^GILDONG"
+
+
+def test_iter_findscu_responses_matches_batch_parser():
+    streamed = list(iter_findscu_responses(SAMPLE.splitlines(keepends=True)))
+    assert streamed == parse_findscu_output(SAMPLE)
+
+
+def test_iter_findscu_responses_yields_before_input_ends():
+    def lines():
+        yield from SAMPLE.splitlines(keepends=True)[:13]
+        raise AssertionError("첫 응답은 두 번째 블록 시작 시점에 이미 나와야 합니다")
+
+    first = next(iter_findscu_responses(lines()))
+    assert first["0020,000D"] == "1.2.3.1"
+
+
+def test_iter_findscu_responses_without_responses():
+    assert list(iter_findscu_responses(["I: Requesting Association\n"])) == []
+
+
+def test_study_record_is_compact_mapping_with_case_insensitive_lookup():
+    record = parse_findscu_output(SAMPLE)[0]
+    assert isinstance(record, StudyRecord)
+    assert not hasattr(record, "__dict__")
+    assert record["0020,000d"] == record["0020,000D"] == "1.2.3.1"
+    assert "0010,0010" in record and "0010,0010".lower() in record
+    assert record.study_instance_uid == "1.2.3.1"
+    assert dict(record) == {"0008,0020": "20240101", "0010,0010": "HONG^GILDONG", "0020,000D": "1.2.3.1"}
+
+
+def test_records_with_same_tags_share_schema():
+    a, b = parse_findscu_output(SAMPLE + SAMPLE)[1::2]
+    assert a._schema is b._schema
+
+
+def test_tag_lines_without_value_are_skipped():
+    text = (
+        "I: Find Response: 1 (Pending)\n"
+        "I: (0008,0050) SH (no value available)                  #   0, 0 AccessionNumber\n"
+        "I: (0020,000D) UI [1.2.3.9]\n"
+    )
+    assert dict(parse_findscu_output(text)[0]) == {"0020,000D": "1.2.3.9"}
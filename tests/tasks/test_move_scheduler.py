@@ -0,0 +1,117 @@
+# tests/tasks/test_move_scheduler.py
+
+import threading
+import time
+from types import SimpleNamespace
+
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+from nmdose.dimse import MoveResult
+from nmdose.dimse.progress import ProgressBus
+from nmdose.tasks.move_scheduler import MoveScheduler, get_move_workers
+
+CALLING = DicomEndpoint(aet="NMDOSE", ip="127.0.0.1", port=11113)
+CALLED = DicomEndpoint(aet="ORTHANC", ip="127.0.0.1", port=4242)
+
+
+class FakeBackend:
+    """동시 실행 수를 기록하고, fail_uids 에 대해서는 FAILURE 를 돌려주는 가짜 백엔드"""
+
+    def __init__(self, delay=0.02, fail_uids=()):
+        self.delay = delay
+        self.fail_uids = set(fail_uids)
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def move(self, calling, called, keys, on_progress=None):
+        uid = keys["StudyInstanceUID"]
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.calls.append(uid)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return MoveResult(status="FAILURE" if uid in self.fail_uids else "SUCCESS")
+
+
+def test_scheduler_runs_all_uids_within_worker_limit():
+    backend = FakeBackend()
+    uids = [f"1.2.{i}" for i in range(20)]
+
+    outcomes = list(MoveScheduler(backend, CALLING, CALLED, max_workers=4).run(uids))
+
+    assert sorted(o.uid for o in outcomes) == sorted(uids)
+    assert all(o.result.status == "SUCCESS" for o in outcomes)
+    assert 1 < backend.peak <= 4
+
+
+def test_scheduler_backs_off_after_failure():
+    backend = FakeBackend(fail_uids={"1.2.0"})
+    scheduler = MoveScheduler(backend, CALLING, CALLED, max_workers=4, backoff_sec=0.01)
+
+    outcomes = list(scheduler.run([f"1.2.{i}" for i in range(8)]))
+
+    assert len(outcomes) == 8
+    assert [o.uid for o in outcomes if o.result.status == "FAILURE"] == ["1.2.0"]
+    assert scheduler._consecutive_bad == 0  # 이후 성공으로 회복
+
+
+def test_scheduler_shrinks_limit_on_slow_moves():
+    backend = FakeBackend(delay=0.01)
+    scheduler = MoveScheduler(backend, CALLING, CALLED, max_workers=4,
+                              slow_threshold_ms=0, backoff_sec=0)
+    list(scheduler.run(["1.2.1", "1.2.2", "1.2.3"]))
+    assert scheduler._limiter.limit == 1
+
+
+def test_get_move_workers_uses_aet_then_default():
+    cfg = SimpleNamespace(move_workers={"default": 2, "ORTHANC": 6})
+    assert get_move_workers(cfg, CALLED) == 6
+    assert get_move_workers(cfg, CALLING) == 2
+    assert get_move_workers(SimpleNamespace(move_workers={}), CALLED) == 1
+
+
+def test_scheduler_starts_moves_while_input_is_still_streaming():
+    backend = FakeBackend(delay=0)
+    first_moved = threading.Event()
+    original_move = backend.move
+
+    def move(calling, called, keys, on_progress=None):
+        result = original_move(calling, called, keys)
+        first_moved.set()
+        return result
+
+    backend.move = move
+
+    def streaming_uids():
+        yield "1.2.1"
+        # 두 번째 UID 를 내놓기 전에 첫 C-MOVE 가 이미 끝나 있어야 함
+        assert first_moved.wait(timeout=5)
+        yield "1.2.2"
+
+    outcomes = list(MoveScheduler(backend, CALLING, CALLED, max_workers=2).run(streaming_uids()))
+    assert sorted(o.uid for o in outcomes) == ["1.2.1", "1.2.2"]
+
+
+def test_scheduler_turns_backend_exception_into_failure():
+    backend = FakeBackend(delay=0)
+    original_move = backend.move
+
+    def move(calling, called, keys, on_progress=None):
+        if keys["StudyInstanceUID"] == "1.2.1":
+            raise RuntimeError("association rejected")
+        return original_move(calling, called, keys)
+
+    backend.move = move
+    bus = ProgressBus()
+    scheduler = MoveScheduler(backend, CALLING, CALLED, max_workers=2, backoff_sec=0, progress=bus)
+
+    outcomes = {o.uid: o for o in scheduler.run(["1.2.1", "1.2.2"])}
+
+    assert outcomes["1.2.1"].result.status == "FAILURE"
+    assert "association rejected" in outcomes["1.2.1"].result.transcript
+    assert outcomes["1.2.2"].result.status == "SUCCESS"
+    assert bus.active() == []
+    assert bus.get("1.2.1")["status"] == "FAILURE"
@@ -0,0 +1,144 @@
+# tests/tasks/test_move_worker.py
+
+import threading
+from datetime import datetime
+
+from nmdose.config_loader.dicom_nodes_loader import DicomEndpoint
+from nmdose.dimse import MoveResult
+from nmdose.tasks import move_queue
+from nmdose.tasks.move_queue import MoveJob, MoveQueue
+from nmdose.tasks.move_scheduler import MoveOutcome
+from nmdose.tasks.move_worker import make_move_event, run_worker
+
+CALLING = DicomEndpoint(aet="NMDOSE", ip="127.0.0.1", port=11113)
+CALLED = DicomEndpoint(aet="ORTHANC", ip="127.0.0.1", port=4242)
+
+
+class FakeQueue:
+    """메모리 안에서 claim/complete 를 흉내 내는 MoveQueue 대역 (claim 은 스레드 안전)"""
+
+    worker_id = "test:1"
+    lease_sec = 1800
+
+    def __init__(self, uids):
+        self.waiting = [MoveJob(i, uid, 10 + i, "PT", 1 + i % 2) for i, uid in enumerate(uids)]
+        self.completed = {}
+        self._lock = threading.Lock()
+
+    def iter_claims(self, conn, batch=1, poll_interval=5.0, stop=None, drain=False):
+        while True:
+            with self._lock:
+                jobs, self.waiting = self.waiting[:batch], self.waiting[batch:]
+            if not jobs:
+                return
+            yield from jobs
+
+    def complete(self, conn, job, success, error=None):
+        assert job.study_instance_uid not in self.completed, "같은 작업이 두 번 완료됨"
+        self.completed[job.study_instance_uid] = success
+
+    def renew(self, conn, jobs):
+        return len(jobs)
+
+
+class FakeBackend:
+    def __init__(self, fail_uids=()):
+        self.fail_uids = set(fail_uids)
+
+    def move(self, calling, called, keys, on_progress=None):
+        uid = keys["StudyInstanceUID"]
+        return MoveResult(status="FAILURE" if uid in self.fail_uids else "SUCCESS",
+                          pending_count=2, transcript="E: refused" if uid in self.fail_uids else "")
+
+
+class FakeAudit:
+    def __init__(self):
+        self.moves = []
+        self.flushed = 0
+
+    def add_move(self, event):
+        self.moves.append(event)
+
+    def flush(self):
+        self.flushed += 1
+
+
+def test_worker_drains_queue_and_records_movescus_events():
+    queue = FakeQueue([f"1.2.{i}" for i in range(6)])
+    audit = FakeAudit()
+
+    counts = run_worker(FakeBackend(fail_uids={"1.2.3"}), CALLING, CALLED, queue,
+                        claim_conn=None, conn=None, audit=audit, max_workers=3, backoff_sec=0.01,
+                        drain=True)
+
+    assert counts == {"done": 5, "failed": 1}
+    assert queue.completed["1.2.3"] is False
+    assert sorted(e["study_instance_uid"] for e in audit.moves) == [f"1.2.{i}" for i in range(6)]
+    failed = next(e for e in audit.moves if e["study_instance_uid"] == "1.2.3")
+    assert failed["find_id"] == 13 and failed["error_detail"] == "E: refused"
+    assert failed["attempt"] == 2     # 재시도 claim 은 attempt 로 구분
+    assert audit.flushed == 1
+
+
+def test_series_move_event_keeps_study_uid_and_records_series():
+    outcome = MoveOutcome("1.2.1.3", MoveResult("SUCCESS", completed=1), datetime(2025, 1, 1), 5)
+    study = make_move_event(outcome, CALLING, CALLED, 7)
+    series = make_move_event(outcome, CALLING, CALLED, 7, study_uid="1.2.1", series_uid="1.2.1.3")
+    assert (study["study_instance_uid"], study["series_instance_uid"]) == ("1.2.1.3", None)
+    assert (series["study_instance_uid"], series["series_instance_uid"]) == ("1.2.1", "1.2.1.3")
+
+
+def test_claim_sql_skips_locked_rows_and_reclaims_expired_leases():
+    sql = move_queue._CLAIM
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "lease_until < now()" in sql
+    # lease 를 빼앗긴 워커의 결과는 반영하지 않음
+    assert "worker_id = %(worker_id)s" in move_queue._COMPLETE
+
+
+def test_claim_commits_immediately(fake_conn):
+    conn = fake_conn(rows=[(1, "1.2.1", 7, "PT", 1)])
+    jobs = MoveQueue(called_aet="ORTHANC", worker_id="w1").claim(conn, limit=2)
+    assert jobs == [MoveJob(1, "1.2.1", 7, "PT", 1)]
+    assert conn.executed[0][1]["limit"] == 2 and conn.commits == 1
+
+
+def test_worker_claims_one_job_per_free_slot_and_renews_leases():
+    release = threading.Event()
+    renewed = []
+
+    class SlowBackend(FakeBackend):
+        def move(self, calling, called, keys, on_progress=None):
+            assert release.wait(timeout=5)
+            return super().move(calling, called, keys)
+
+    class RenewingQueue(FakeQueue):
+        claimed = 0
+
+        def iter_claims(self, conn, batch=1, poll_interval=5.0, stop=None, drain=False):
+            assert batch == 1
+            for job in super().iter_claims(conn, batch, poll_interval, stop, drain):
+                self.claimed += 1
+                yield job
+
+        def renew(self, conn, jobs):
+            if not release.is_set():
+                renewed.append(sorted(j.study_instance_uid for j in jobs))
+                if len(jobs) == 2:
+                    release.set()
+            return len(jobs)
+
+    queue = RenewingQueue([f"1.2.{i}" for i in range(5)])
+    counts = run_worker(SlowBackend(), CALLING, CALLED, queue, claim_conn=None, conn=None,
+                        audit=FakeAudit(), max_workers=2, drain=True, heartbeat_sec=0.01)
+
+    assert counts == {"done": 5, "failed": 0}
+    # C-MOVE 가 멈춰 있는 동안 실행 자리(2) 만큼만 claim 하고, 그 작업들의 lease 를 연장
+    assert renewed[-1] == ["1.2.0", "1.2.1"]
+    assert all(len(uids) <= 2 for uids in renewed)
+
+
+def test_renew_extends_only_own_claimed_rows():
+    sql = move_queue._RENEW
+    assert "worker_id = %(worker_id)s" in sql and "state = 'CLAIMED'" in sql
+    assert "SKIP LOCKED" in sql
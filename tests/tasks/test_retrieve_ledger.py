@@ -0,0 +1,39 @@
+# tests/tasks/test_retrieve_ledger.py
+
+from datetime import date
+
+from nmdose.tasks.retrieve_ledger import FAILED, DONE, LedgerEntry, RetrieveLedger
+
+
+WINDOW = (date(2024, 1, 1), date(2024, 1, 5))
+
+
+def test_register_keeps_done_studies_untouched(fake_conn):
+    conn = fake_conn()
+    RetrieveLedger(conn).register("1.2.1", WINDOW, "PT", 7)
+    sql, (_, params) = conn.statements[0], conn.executed[0]
+    assert "ON CONFLICT (study_instance_uid) DO UPDATE" in sql
+    assert "WHERE retrieve_ledger.state <> 'DONE'" in sql
+    assert params == ("1.2.1", WINDOW[0], WINDOW[1], "PT", 7)
+    assert conn.commits == 0   # commit 은 AuditWriter.flush 에 맡김
+
+
+def test_mark_failure_counts_attempt_and_gives_up_at_limit(fake_conn):
+    conn = fake_conn()
+    ledger = RetrieveLedger(conn, max_attempts=3)
+    ledger.mark("1.2.1", False, "E: timeout")
+    ledger.mark("1.2.2", True, "ignored")
+
+    fail_sql = conn.statements[0]
+    (_, fail), (_, ok) = conn.executed
+    assert "THEN 'GAVE_UP'" in fail_sql and "attempts = attempts + 1" in fail_sql
+    assert fail == {"state": FAILED, "max_attempts": 3, "error": "E: timeout", "uid": "1.2.1"}
+    assert ok["state"] == DONE and ok["error"] is None
+
+
+def test_retryable_returns_entries(fake_conn):
+    conn = fake_conn(rows=[("1.2.1", "PT", 7, 2)])
+    entries = RetrieveLedger(conn).retryable(limit=10)
+    assert entries == [LedgerEntry("1.2.1", "PT", 7, 2)]
+    sql, params = conn.executed[0]
+    assert params == (("PENDING", "FAILED"), 10)
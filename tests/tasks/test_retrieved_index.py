@@ -0,0 +1,34 @@
+# tests/tasks/test_retrieved_index.py
+
+from datetime import date
+
+from nmdose.tasks.retrieved_index import RetrievedIndex
+
+
+def test_load_builds_set_of_successful_uids(fake_conn):
+    conn = fake_conn([("1.2.1",), ("1.2.2",), (None,)])
+    index = RetrievedIndex.load(conn)
+    assert len(index) == 2
+    assert "1.2.1" in index and "1.2.3" not in index
+    sql, params = conn.executed[0]
+    assert "status = 'SUCCESS'" in sql and params is None
+
+
+def test_load_since_restricts_to_overlapping_finds(fake_conn):
+    conn = fake_conn([])
+    RetrievedIndex.load(conn, since=date(2024, 1, 10))
+    sql, params = conn.executed[0]
+    assert "f.end_date >= %s" in sql and params == (date(2024, 1, 10),)
+
+
+def test_load_can_restrict_to_one_calling_aet(fake_conn):
+    conn = fake_conn([])
+    RetrievedIndex.load(conn, since=date(2024, 1, 10), calling_aet="ORTHANC")
+    sql, params = conn.executed[0]
+    assert "m.calling_aet = %s" in sql and params == (date(2024, 1, 10), "ORTHANC")
+
+
+def test_add_marks_uid_as_retrieved():
+    index = RetrievedIndex()
+    index.add("1.2.9")
+    assert "1.2.9" in index
@@ -0,0 +1,111 @@
+# tests/tasks/test_study_indexer.py
+
+import csv
+import io
+import os
+
+import pytest
+from pydicom.dataset import Dataset, FileMetaDataset
+from pydicom.uid import ExplicitVRLittleEndian
+
+from nmdose.tasks.study_indexer import STUDY_METADATA_COLUMNS, FileManifest, index_studies
+
+
+def write_dicom(path, study, series, sop, modality="PT", **extra):
+    meta = FileMetaDataset()
+    meta.MediaStorageSOPClassUID = "1.2.840.10008.5.1.4.1.1.128"
+    meta.MediaStorageSOPInstanceUID = sop
+    meta.TransferSyntaxUID = ExplicitVRLittleEndian
+    ds = Dataset()
+    ds.file_meta = meta
+    ds.SOPClassUID = meta.MediaStorageSOPClassUID
+    ds.StudyInstanceUID, ds.SeriesInstanceUID, ds.SOPInstanceUID = study, series, sop
+    ds.Modality = modality
+    ds.PatientID = "P1"
+    ds.StudyDate = "20250102"
+    ds.StudyTime = "1043"
+    for keyword, value in extra.items():
+        setattr(ds, keyword, value)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ds.save_as(path, enforce_file_format=True)
+
+
+def rows_by_uid(conn):
+    rows = {}
+    for sql, text in conn.copied:
+        assert sql.startswith("COPY study_metadata_stage")
+        rows.update((row[0], dict(zip(STUDY_METADATA_COLUMNS, row))) for row in csv.reader(io.StringIO(text)))
+    return rows
+
+
+def test_index_studies_aggregates_headers(tmp_path, fake_conn):
+    root = tmp_path / "received"
+    write_dicom(root / "s1" / "a", "1.1", "1.1.1", "1.1.1.1", "PT", BodyPartExamined="WHOLEBODY")
+    write_dicom(root / "s1" / "b", "1.1", "1.1.1", "1.1.1.2", "PT")
+    write_dicom(root / "s1" / "c", "1.1", "1.1.2", "1.1.2.1", "CT", PatientBirthDate="19470119")
+    write_dicom(root / "s2" / "a", "2.1", "2.1.1", "2.1.1.1", "NM")
+    (root / "README").write_text("not dicom")
+
+    conn = fake_conn()
+    with FileManifest(tmp_path / "manifest.sqlite3") as manifest:
+        counts = index_studies(conn, root, manifest, workers=1)
+    assert counts == {"files": 5, "read": 5, "not_dicom": 1, "studies": 2}
+
+    rows = rows_by_uid(conn)
+    study = rows["1.1"]
+    assert study["num_series"] == "2" and study["num_instances"] == "3"
+    assert study["modality"] == "CT,PT"
+    assert study["body_part_examined"] == "WHOLEBODY"
+    assert study["study_date"] == "2025-01-02" and study["study_time"] == "10:43:00"
+    assert study["patient_birth_date"] == "1947-01-19"
+    assert study["study_description"] == ""          # 빈 칸 → COPY csv 에서 NULL
+    assert rows["2.1"]["modality"] == "NM"
+    assert any("ON CONFLICT (study_instance_uid)" in sql for sql in conn.statements)
+
+
+def test_incremental_reads_only_new_or_changed_files(tmp_path, fake_conn):
+    root = tmp_path / "received"
+    write_dicom(root / "a", "1.1", "1.1.1", "1.1.1.1")
+    write_dicom(root / "b", "2.1", "2.1.1", "2.1.1.1")
+    manifest_path = tmp_path / "manifest.sqlite3"
+    with FileManifest(manifest_path) as manifest:
+        index_studies(fake_conn(), root, manifest, workers=1)
+
+    with FileManifest(manifest_path) as manifest:
+        conn = fake_conn()
+        counts = index_studies(conn, root, manifest, workers=1)
+        assert counts["read"] == 0 and counts["studies"] == 0 and rows_by_uid(conn) == {}
+
+        write_dicom(root / "c", "1.1", "1.1.2", "1.1.2.1", "CT")
+        conn = fake_conn()
+        counts = index_studies(conn, root, manifest, workers=1)
+        assert counts["read"] == 1
+        rows = rows_by_uid(conn)
+        assert list(rows) == ["1.1"]                     # 바뀐 Study 만 다시 COPY
+        assert rows["1.1"]["num_series"] == "2" and rows["1.1"]["num_instances"] == "2"
+
+        stat = os.stat(root / "b")
+        os.utime(root / "b", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        counts = index_studies(fake_conn(), root, manifest, workers=1)
+        assert counts["read"] == 1
+
+        counts = index_studies(fake_conn(), root, manifest, workers=1, incremental=False)
+        assert counts["read"] == 3 and counts["studies"] == 2
+
+
+def test_failed_copy_is_retried_by_next_incremental_run(tmp_path, fake_conn):
+    root = tmp_path / "received"
+    write_dicom(root / "a", "1.1", "1.1.1", "1.1.1.1")
+    manifest_path = tmp_path / "manifest.sqlite3"
+    with pytest.raises(RuntimeError, match="PG down"):
+        with FileManifest(manifest_path) as manifest:
+            index_studies(fake_conn(error=RuntimeError("PG down")), root, manifest, workers=1)
+
+    with FileManifest(manifest_path) as manifest:
+        conn = fake_conn()
+        counts = index_studies(conn, root, manifest, workers=1)
+        assert counts["read"] == 0 and counts["studies"] == 1   # 파일은 다시 읽지 않고 COPY 만 재시도
+        assert list(rows_by_uid(conn)) == ["1.1"]
+
+        counts = index_studies(fake_conn(), root, manifest, workers=1)
+        assert counts["studies"] == 0
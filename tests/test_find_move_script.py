@@ -0,0 +1,66 @@
+# tests/test_find_move_script.py
+
+import dataclasses
+import importlib.util
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from nmdose.config_loader import retrieve_options_loader
+from nmdose.env.init import AppEnvironment
+from nmdose.utils import date_utils
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "find_move.py"
+
+
+def load_find_move():
+    spec = importlib.util.spec_from_file_location("find_move_script", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_find_move_imports_and_plans_windows(tmp_path, monkeypatch):
+    find_move = load_find_move()
+
+    # 실제 retrieve_options.yaml 의 retrieve_to_research 를 읽되 날짜 계획은 고정
+    options = retrieve_options_loader.get_retrieve_config()
+    cfg = dataclasses.replace(options.retrieve_to_research,
+                              batch_start_date="20240101", daily_start_date="20240112",
+                              batch_days=5, batch_catch_up=True)
+    fixed = dataclasses.replace(options, retrieve_to_research=cfg)
+    monkeypatch.setattr(find_move, "get_retrieve_config", lambda: fixed)
+    monkeypatch.setattr(date_utils, "get_retrieve_config", lambda: fixed)
+    monkeypatch.setattr(date_utils, "get_last_processed_date", lambda: date(2024, 1, 6))
+    monkeypatch.setattr(find_move, "init_app_environment", lambda: AppEnvironment(tmp_path))
+
+    source, target, retrieve_cfg, log_sink = find_move.init_environment()
+    log_sink.close()
+    assert retrieve_cfg is cfg
+    assert source.aet and target.aet
+
+    date_ranges, _ = find_move.plan_windows(retrieve_cfg)
+    assert date_ranges == ["20240106-20240110", "20240111-20240112"]
+
+
+def test_retrieve_closes_backend_and_log_sink_on_error(monkeypatch, fake_conn):
+    find_move = load_find_move()
+    cfg = retrieve_options_loader.get_retrieve_config().retrieve_to_research
+    closed = []
+
+    class Closable:
+        def __init__(self, name):
+            self.name = name
+
+        def close(self):
+            closed.append(self.name)
+
+    endpoint = type("Endpoint", (), {"aet": "PACS", "ip": "127.0.0.1", "port": 104})
+    monkeypatch.setattr(find_move, "init_environment",
+                        lambda: (endpoint, endpoint, cfg, Closable("log_sink")))
+    monkeypatch.setattr(find_move, "get_dimse_backend", lambda: Closable("backend"))
+
+    with pytest.raises(RuntimeError, match="PG down"):
+        find_move._retrieve(fake_conn(error=RuntimeError("PG down")), resume_only=True)
+    assert sorted(closed) == ["backend", "log_sink"]
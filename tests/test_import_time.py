@@ -0,0 +1,55 @@
+# tests/test_import_time.py
+
+"""
+패키지 import 비용 회귀 테스트 (python -X importtime 출력 기반)
+
+nmdose.utils / nmdose.config_loader / nmdose.tasks 를 import 하거나 가벼운 이름 하나만 꺼낼 때
+DB 드라이버, YAML/날짜 라이브러리, 설정 로더가 함께 불려오지 않는지 확인합니다.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# 무거운(또는 설정 파일/DB 를 건드리는) 모듈: 아래 import 문에서는 불려오면 안 됨
+HEAVY = ("psycopg2", "yaml", "dateutil", "pydicom", "pynetdicom",
+         "nmdose.config_loader.retrieve_options_loader", "nmdose.utils.date_utils")
+
+# nmdose.* 누적 import 시간 상한 (µs, 느린 CI 여유분 포함)
+BUDGET_US = 50_000
+
+
+def importtime(statement: str) -> dict[str, int]:
+    """statement 실행 중 import 된 모듈 → 누적 import 시간(µs)"""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            check=True, capture_output=True, text=True).stderr
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cumulative.isdigit():
+            modules[name] = int(cumulative)
+    return modules
+
+
+@pytest.mark.parametrize("statement", [
+    "import nmdose.utils",
+    "import nmdose.config_loader",
+    "import nmdose.tasks",
+    "from nmdose.utils import sanitize_event",
+    "from nmdose.tasks import StudyRecord, MoveQueue, RetrieveLedger",
+])
+def test_package_imports_stay_light(statement):
+    modules = importtime(statement)
+    loaded = [name for name in modules if name.split(".")[0] in HEAVY or name in HEAVY]
+    assert loaded == []
+
+    nmdose_us = max(us for name, us in modules.items() if name.startswith("nmdose"))
+    assert nmdose_us < BUDGET_US
+
+
+def test_lazy_names_resolve_on_first_use():
+    modules = importtime("from nmdose.utils import db_connection")
+    assert "psycopg2" in modules and "nmdose.utils.db_pool" in modules
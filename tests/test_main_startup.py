@@ -0,0 +1,74 @@
+# tests/test_main_startup.py
+
+import json
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+# import nmdose.main 허용 시간 (fastapi/jinja2 import 포함, 느린 CI 여유분)
+IMPORT_BUDGET_SEC = 3.0
+
+_PROBE = """
+import json, sys, time
+import psycopg2
+
+def _no_db(*args, **kwargs):
+    raise AssertionError("import 중 DB 접속 시도")
+psycopg2.connect = _no_db
+
+t0 = time.perf_counter()
+import nmdose.main
+elapsed = time.perf_counter() - t0
+print(json.dumps({
+    "elapsed": elapsed,
+    "env_loaded": "nmdose.env.init" in sys.modules,
+    "date_utils_loaded": "nmdose.utils.date_utils" in sys.modules,
+}))
+"""
+
+
+def test_import_main_is_fast_and_touches_no_config_or_db():
+    out = subprocess.run([sys.executable, "-c", _PROBE], check=True,
+                         capture_output=True, text=True).stdout
+    probe = json.loads(out.strip().splitlines()[-1])
+    assert probe["elapsed"] < IMPORT_BUDGET_SEC
+    assert not probe["env_loaded"]
+    assert not probe["date_utils_loaded"]
+
+
+class FakeEnv:
+    modalities = ["PT"]
+
+    def __init__(self):
+        self.calls = 0
+
+    def endpoints(self):
+        class EP:
+            aet = "NMDOSE"
+        return EP(), EP()
+
+    def date_range(self):
+        self.calls += 1
+        return f"2025010{self.calls}-2025010{self.calls}"
+
+
+def test_lifespan_initializes_and_date_range_is_per_request(monkeypatch):
+    import nmdose.dimse
+    import nmdose.env.init
+    import nmdose.main
+
+    class NoBackend:
+        def close(self):
+            pass
+
+    env = FakeEnv()
+    monkeypatch.setattr(nmdose.env.init, "init_app_environment", lambda: env)
+    monkeypatch.setattr(nmdose.dimse, "get_dimse_backend", lambda: NoBackend())
+
+    with TestClient(nmdose.main.app) as client:
+        first = client.get("/api/date-range").json()
+        second = client.get("/api/date-range").json()
+
+    assert first == {"date_range": "20250101-20250101", "modalities": ["PT"]}
+    assert second["date_range"] == "20250102-20250102"
@@ -0,0 +1,107 @@
+# tests/utils/test_audit_writer.py
+
+import itertools
+from datetime import datetime
+
+import pytest
+
+from nmdose.utils import audit_writer
+from nmdose.utils.audit_writer import AuditWriter
+
+
+@pytest.fixture
+def conn(fake_conn):
+    """findscus/movescus 시퀀스 nextval 처럼 fetchone 마다 1, 2, 3... 을 돌려주는 커넥션"""
+    ids = itertools.count(1)
+    return fake_conn(fetchone=lambda: (next(ids),))
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """execute_values 호출을 (SQL, 행 목록) 으로 기록"""
+    calls = []
+    monkeypatch.setattr(audit_writer, "execute_values",
+                        lambda cur, sql, rows, page_size: calls.append((sql, list(rows))))
+    return calls
+
+
+def find_event(**overrides):
+    event = {
+        "ts": datetime(2025, 1, 1, 2, 0), "calling_aet": "NMDOSE", "called_aet": "ORTHANC",
+        "peer_host": "127.0.0.1", "peer_port": 4242, "query_retrieve_level": "STUDY",
+        "start_date": None, "end_date": None, "modalities_in_study": "PT",
+        "result_count": 0, "duration_ms": 0, "status": "RUNNING", "error_detail": None,
+    }
+    event.update(overrides)
+    return event
+
+
+def move_event(find_id, uid):
+    return {
+        "find_id": find_id, "ts": datetime(2025, 1, 1, 2, 1), "calling_aet": "NMDOSE",
+        "called_aet": "ORTHANC", "peer_host": "127.0.0.1", "peer_port": 4242,
+        "pending_count": 3, "completed_count": 3, "failed_count": 0, "warning_count": 0,
+        "remaining_count": 0, "duration_ms": 10, "status": "SUCCESS", "error_detail": None,
+        "study_instance_uid": uid, "attempt": 1, "series_instance_uid": None,
+    }
+
+
+def test_events_are_buffered_until_batch_size(conn, written):
+    writer = AuditWriter(conn, batch_size=4, flush_interval_sec=3600)
+
+    find_id = writer.begin_find(find_event())
+    writer.add_move(move_event(find_id, "1.2.1"))
+    writer.add_move(move_event(find_id, "1.2.2"))
+    assert conn.commits == 0 and written == []
+
+    writer.add_move(move_event(find_id, "1.2.3"))   # 4번째 이벤트에서 flush
+    assert conn.commits == 1
+    (find_sql, find_rows), (move_sql, move_rows) = written
+    assert "INSERT INTO findscus" in find_sql and find_rows[0][0] == find_id
+    assert "INSERT INTO movescus" in move_sql
+    assert [row[-1] for row in move_rows] == ["1.2.1", "1.2.2", "1.2.3"]
+    assert writer.pending == 0
+
+
+def test_finish_find_replaces_buffered_row(conn, written):
+    with AuditWriter(conn, batch_size=100, flush_interval_sec=3600) as writer:
+        find_id = writer.begin_find(find_event())
+        writer.finish_find(find_id, find_event(result_count=2, status="SUCCESS"))
+
+    (_, rows), = written
+    assert len(rows) == 1
+    assert rows[0][0] == find_id and rows[0][-4] == 2 and rows[0][-2] == "SUCCESS"
+    assert conn.commits == 1
+
+
+def test_flush_on_interval(conn, written):
+    writer = AuditWriter(conn, batch_size=100, flush_interval_sec=0)
+    writer.begin_find(find_event())
+    assert conn.commits == 1
+
+
+def test_failed_flush_keeps_buffer_for_retry(conn, monkeypatch):
+    writer = AuditWriter(conn, batch_size=100, flush_interval_sec=3600)
+    writer.add_move(move_event(1, "1.2.1"))
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(audit_writer, "execute_values", boom)
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert conn.rollbacks == 1 and writer.pending == 1
+
+    monkeypatch.setattr(audit_writer, "execute_values", lambda *args, **kwargs: None)
+    assert writer.flush() == 1
+    assert writer.pending == 0
+
+
+def test_add_move_assigns_move_id(conn, written):
+    with AuditWriter(conn, batch_size=100, flush_interval_sec=3600) as writer:
+        find_id = writer.begin_find(find_event())
+        move_id = writer.add_move(move_event(find_id, "1.2.1"))
+
+    assert move_id != find_id
+    (_, _), (_, move_rows) = written
+    assert move_rows[0][:2] == (move_id, find_id)
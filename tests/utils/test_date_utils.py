@@ -1,6 +1,7 @@
 # tests/test_date_utils.py
 
 import pytest
+from contextlib import contextmanager
 from datetime import date
 from unittest.mock import patch, MagicMock
 
@@ -22,35 +23,32 @@ def fake_retrieve_options():
     return FakeRetrieveOptions()
 
 
-@patch("nmdose.utils.date_utils.get_retrieve_options_config")
-@patch("nmdose.utils.date_utils.psycopg2.connect")
-def test_make_batch_date_range_with_last_processed_date(mock_connect, mock_get_config, fake_retrieve_options):
-    # 설정 Mock
-    mock_get_config.return_value = fake_retrieve_options
-
-    # DB 결과 Mock
-    mock_conn = MagicMock()
+def fake_db_connection(last_processed_row):
+    """db_connection() 대역: 커서의 fetchone 이 last_processed_row 를 돌려줌"""
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = [date(2024, 1, 10)]  # 마지막 처리일
+    mock_cursor.fetchone.return_value = last_processed_row
+    mock_conn = MagicMock()
     mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-    mock_connect.return_value.__enter__.return_value = mock_conn
 
-    result = make_batch_date_range()
-    assert result == "20240110-20240116"
+    @contextmanager
+    def db_connection(*args, **kwargs):
+        yield mock_conn
+    return db_connection
 
 
-@patch("nmdose.utils.date_utils.get_retrieve_options_config")
-@patch("nmdose.utils.date_utils.psycopg2.connect")
-def test_make_batch_date_range_without_last_processed_date(mock_connect, mock_get_config, fake_retrieve_options):
+@patch("nmdose.utils.date_utils.get_retrieve_config")
+def test_make_batch_date_range_with_last_processed_date(mock_get_config, fake_retrieve_options):
     mock_get_config.return_value = fake_retrieve_options
+    with patch("nmdose.utils.date_utils.db_connection", fake_db_connection([date(2024, 1, 10)])):
+        result = make_batch_date_range()
+    assert result == "20240110-20240116"
 
-    mock_conn = MagicMock()
-    mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = None  # 마지막 처리일 없음
-    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-    mock_connect.return_value.__enter__.return_value = mock_conn
 
-    result = make_batch_date_range()
+@patch("nmdose.utils.date_utils.get_retrieve_config")
+def test_make_batch_date_range_without_last_processed_date(mock_get_config, fake_retrieve_options):
+    mock_get_config.return_value = fake_retrieve_options
+    with patch("nmdose.utils.date_utils.db_connection", fake_db_connection(None)):   # 마지막 처리일 없음
+        result = make_batch_date_range()
     assert result == "20240101-20240107"
 
 
@@ -60,3 +58,56 @@ def test_parse_start_date():
 
 def test_parse_end_date():
     assert parse_end_date("20240101-20240107") == date(2024, 1, 7)
+
+
+# ───── catch-up 창 계획 ─────
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from nmdose.utils.date_utils import batch_slot_deadline, iter_windows_in_slot, plan_batch_windows
+
+PLAN_CFG = SimpleNamespace(
+    batch_start_date="20240101", batch_days=7, daily_start_date="20240120",
+    batch_start_time="02:00", batch_end_time="06:00",
+)
+
+
+def test_plan_batch_windows_covers_range_without_gaps():
+    windows = plan_batch_windows(None, cfg=PLAN_CFG)
+    assert windows == [
+        (date(2024, 1, 1), date(2024, 1, 7)),
+        (date(2024, 1, 8), date(2024, 1, 14)),
+        (date(2024, 1, 15), date(2024, 1, 20)),
+    ]
+
+
+def test_plan_batch_windows_starts_from_last_processed_date():
+    windows = plan_batch_windows(date(2024, 1, 10), cfg=PLAN_CFG)
+    assert windows[0] == (date(2024, 1, 10), date(2024, 1, 16))
+    assert windows[-1] == (date(2024, 1, 17), date(2024, 1, 20))
+
+
+def test_batch_slot_deadline_inside_and_outside_slot():
+    assert batch_slot_deadline(datetime(2024, 1, 1, 3, 0), cfg=PLAN_CFG) == datetime(2024, 1, 1, 6, 0)
+    assert batch_slot_deadline(datetime(2024, 1, 1, 7, 0), cfg=PLAN_CFG) is None
+
+    overnight = SimpleNamespace(batch_start_time="22:00", batch_end_time="06:00")
+    assert batch_slot_deadline(datetime(2024, 1, 1, 23, 0), cfg=overnight) == datetime(2024, 1, 2, 6, 0)
+    assert batch_slot_deadline(datetime(2024, 1, 2, 1, 0), cfg=overnight) == datetime(2024, 1, 2, 6, 0)
+
+
+def test_iter_windows_in_slot_stops_when_next_window_would_overrun():
+    now = [datetime(2024, 1, 1, 2, 0)]
+    deadline = datetime(2024, 1, 1, 5, 0)
+
+    processed = []
+    for window in iter_windows_in_slot(["w1", "w2", "w3", "w4"], deadline, clock=lambda: now[0]):
+        processed.append(window)
+        now[0] += timedelta(hours=1)   # 창 하나에 1시간
+
+    # 02:00, 03:00, 04:00 에 시작한 창은 05:00 안에 끝나고, 05:00 이후 시작은 불가
+    assert processed == ["w1", "w2", "w3"]
+
+
+def test_iter_windows_in_slot_processes_one_window_outside_slot():
+    assert list(iter_windows_in_slot(["w1", "w2"], None)) == ["w1"]
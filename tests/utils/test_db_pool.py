@@ -0,0 +1,131 @@
+# tests/utils/test_db_pool.py
+
+import threading
+
+import pytest
+from psycopg2.pool import PoolError
+
+from nmdose.utils import db_pool
+from nmdose.utils.db_pool import close_all_pools, db_connection, get_connection_pool
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = False
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakePool:
+    """ThreadedConnectionPool 대역: 생성 인자와 getconn/putconn 을 기록"""
+
+    created = []
+
+    def __init__(self, minconn, maxconn, **kwargs):
+        self.kwargs = kwargs
+        self.idle = []
+        self.returned = []
+        FakePool.created.append(self)
+
+    def getconn(self):
+        return self.idle.pop() if self.idle else FakeConnection()
+
+    def putconn(self, conn, close=False):
+        self.returned.append((conn, close))
+        if not close:
+            self.idle.append(conn)
+
+    def closeall(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_pool(monkeypatch):
+    FakePool.created = []
+    monkeypatch.setattr(db_pool, "ThreadedConnectionPool", FakePool)
+    close_all_pools()
+    yield
+    close_all_pools()
+
+
+def test_pool_is_created_once_and_shared_across_threads():
+    pools = []
+    threads = [threading.Thread(target=lambda: pools.append(get_connection_pool())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(FakePool.created) == 1
+    assert all(p is pools[0] for p in pools)
+    assert pools[0].kwargs["dbname"] == "rpacs"
+
+
+def test_pools_are_separated_by_target_and_dbname():
+    assert get_connection_pool("rpacs_admin") is not get_connection_pool("rpacs")
+    assert get_connection_pool("rpacs_admin", dbname="rpacs").kwargs["dbname"] == "rpacs"
+    assert len(FakePool.created) == 3
+
+
+def test_db_connection_commits_and_reuses_warm_connection():
+    with db_connection() as first:
+        pass
+    with db_connection() as second:
+        pass
+    assert second is first
+    assert first.commits == 2
+
+
+def test_db_connection_rolls_back_on_error_and_restores_autocommit():
+    with pytest.raises(ValueError):
+        with db_connection(autocommit=True) as conn:
+            assert conn.autocommit is True
+            raise ValueError("boom")
+    assert conn.rollbacks == 1 and conn.commits == 0
+    assert conn.autocommit is False
+
+
+def test_db_connection_discards_closed_connection():
+    with db_connection() as conn:
+        conn.closed = 1
+    pool = get_connection_pool()
+    assert pool.returned[-1] == (conn, True)
+    with db_connection() as fresh:
+        assert fresh is not conn
+
+
+def test_db_connection_waits_for_returned_connection_when_pool_is_exhausted(monkeypatch):
+    pool = get_connection_pool()
+    attempts = []
+    original = pool.getconn
+
+    def exhausted_twice():
+        attempts.append(1)
+        if len(attempts) <= 2:
+            raise PoolError("connection pool exhausted")
+        return original()
+
+    monkeypatch.setattr(pool, "getconn", exhausted_twice)
+    monkeypatch.setattr(db_pool, "_GETCONN_POLL_SEC", 0)
+    with db_connection() as conn:
+        assert conn is not None
+    assert len(attempts) == 3
+
+
+def test_db_connection_raises_pool_error_after_wait(monkeypatch):
+    pool = get_connection_pool()
+
+    def exhausted():
+        raise PoolError("connection pool exhausted")
+
+    monkeypatch.setattr(pool, "getconn", exhausted)
+    with pytest.raises(PoolError):
+        with db_connection(wait_sec=0):
+            pass
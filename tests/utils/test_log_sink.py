@@ -0,0 +1,78 @@
+# tests/utils/test_log_sink.py
+
+import gzip
+import json
+from datetime import datetime
+
+from nmdose.utils.log_sink import (
+    SegmentLogSink, find_records, iter_index, iter_records, read_record,
+)
+
+TS = datetime(2024, 5, 1, 9, 30)
+
+
+def test_records_round_trip_and_file_is_plain_gzip(tmp_path):
+    with SegmentLogSink(tmp_path, prefix="t") as sink:
+        sink.write("movescu", "1.2.3", "PT", TS, "move ok\n")
+        sink.write("movescu", "1.2.4", "CT", TS, "move 실패\x00\n")
+
+    segments = list(tmp_path.glob("*.log.gz"))
+    assert len(segments) == 1
+
+    records = list(iter_records(segments[0]))
+    assert [(r.uid, r.modality, r.text) for r in records] == [
+        ("1.2.3", "PT", "move ok\n"),
+        ("1.2.4", "CT", "move 실패\n"),
+    ]
+    # 연결된 gzip 멤버이므로 표준 gzip 으로도 전체를 읽을 수 있어야 함
+    payloads = gzip.decompress(segments[0].read_bytes()).decode("utf-8")
+    first, _ = json.JSONDecoder().raw_decode(payloads)
+    assert first["uid"] == "1.2.3"
+
+
+def test_read_record_by_index_offset(tmp_path):
+    with SegmentLogSink(tmp_path) as sink:
+        for i in range(5):
+            sink.write("movescu", f"1.2.{i}", "PT", TS, f"text {i}")
+
+    segment = next(tmp_path.glob("*.log.gz"))
+    index = list(iter_index(segment))
+    assert [uid for _, _, uid, _, _ in index] == [f"1.2.{i}" for i in range(5)]
+
+    offset = index[3][0]
+    record = read_record(segment, offset)
+    assert record.uid == "1.2.3" and record.text == "text 3"
+
+
+def test_rotates_segment_by_size(tmp_path):
+    with SegmentLogSink(tmp_path, max_segment_bytes=1, compresslevel=1) as sink:
+        for i in range(3):
+            sink.write("movescu", f"1.2.{i}", "PT", TS, "x" * 100)
+
+    segments = sorted(tmp_path.glob("*.log.gz"))
+    assert len(segments) == 3
+    assert [r.uid for s in segments for r in iter_records(s)] == ["1.2.0", "1.2.1", "1.2.2"]
+
+
+def test_chunked_transcript_and_find_by_uid(tmp_path):
+    with SegmentLogSink(tmp_path) as sink:
+        with sink.open_text("findscu", "no_uid", "PT", TS, chunk_bytes=10) as transcript:
+            for i in range(5):
+                transcript.write(f"line {i}\n")
+        sink.write("movescu", "1.2.9", "PT", TS, "first")
+        sink.write("movescu", "1.2.9", "PT", TS, "second")
+
+    chunks = find_records(tmp_path, "no_uid", kind="findscu")
+    assert [c.seq for c in chunks] == list(range(len(chunks)))
+    assert "".join(c.text for c in chunks) == "".join(f"line {i}\n" for i in range(5))
+
+    assert [r.text for r in find_records(tmp_path, "1.2.9")] == ["first", "second"]
+    assert find_records(tmp_path, "1.2.9", kind="findscu") == []
+
+
+def test_empty_transcript_still_recorded(tmp_path):
+    with SegmentLogSink(tmp_path) as sink:
+        sink.open_text("findscu", "no_uid", "CT", TS).close()
+
+    records = find_records(tmp_path, "no_uid")
+    assert len(records) == 1 and records[0].text == ""
@@ -0,0 +1,87 @@
+# tests/utils/test_metrics.py
+
+import time
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from nmdose.api.metrics import router
+from nmdose.dimse import MoveResult
+from nmdose.dimse.backends import FindStream
+from nmdose.tasks.move_scheduler import MoveOutcome
+from nmdose.utils import metrics
+from nmdose.utils.metrics import MetricsRegistry
+
+
+def test_render_counters_gauges_and_cumulative_buckets():
+    registry = MetricsRegistry()
+    moved = registry.counter("t_moved_total", "moved", ("endpoint",))
+    depth = registry.gauge("t_depth", "depth")
+    latency = registry.histogram("t_seconds", "latency", ("endpoint",), buckets=(0.1, 1))
+
+    moved.labels("ORTHANC").inc(3)
+    depth.set(2)
+    for value in (0.05, 0.5, 5):
+        latency.labels('A"B').observe(value)
+
+    text = registry.render()
+    assert "# TYPE t_moved_total counter" in text
+    assert 't_moved_total{endpoint="ORTHANC"} 3' in text
+    assert "t_depth 2" in text
+    assert 't_seconds_bucket{endpoint="A\\"B",le="0.1"} 1' in text
+    assert 't_seconds_bucket{endpoint="A\\"B",le="1"} 2' in text
+    assert 't_seconds_bucket{endpoint="A\\"B",le="+Inf"} 3' in text
+    assert 't_seconds_count{endpoint="A\\"B"} 3' in text
+    assert registry.counter("t_moved_total", "moved", ("endpoint",)) is moved
+
+
+def test_find_stream_and_observe_move_update_global_metrics():
+    def produce(stream):
+        yield {"0020,000D": "1.2.1"}
+        yield {"0020,000D": "1.2.2"}
+        stream.status = "SUCCESS"
+
+    assert len(list(FindStream(produce, "T_FIND", "PT"))) == 2
+    result = MoveResult("SUCCESS", completed=10, failed=1)
+    metrics.observe_move(MoveOutcome("1.2.1", result, datetime.now(), 2000), "T_MOVE", "PT")
+
+    text = metrics.registry.render()
+    assert 'nmdose_cfind_responses_total{endpoint="T_FIND",modality="PT"} 2' in text
+    assert 'nmdose_cfind_duration_seconds_count{endpoint="T_FIND",modality="PT",status="SUCCESS"} 1' in text
+    assert 'nmdose_instances_moved_total{endpoint="T_MOVE",modality="PT",result="completed"} 10' in text
+    assert 'nmdose_move_instances_per_second{endpoint="T_MOVE"} 5' in text
+
+
+class FakePool:
+    max_size = 4
+
+    def stats(self):
+        return {"NMDOSE->T_POOL": {"idle": 1, "in_use": 2}}
+
+
+def test_pool_utilization_is_read_at_render_time():
+    pool = FakePool()
+    metrics.track_pool(pool)
+    text = metrics.registry.render()
+    assert 'nmdose_association_pool_utilization{pair="NMDOSE->T_POOL"} 0.5' in text
+
+
+def test_hot_loop_instrumentation_is_cheap():
+    histogram = MetricsRegistry().histogram("t_hot_seconds", "hot", ("endpoint", "modality"))
+    t0 = time.perf_counter()
+    for i in range(100_000):
+        histogram.labels("ORTHANC", "PT").observe(i / 1000)
+    assert time.perf_counter() - t0 < 2.0
+
+
+def test_metrics_endpoint_serves_text_format(tmp_path):
+    app = FastAPI()
+    app.include_router(router)
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE nmdose_cmove_duration_seconds histogram" in response.text
+
+    metrics.registry.write_textfile(tmp_path / "nmdose.prom")
+    assert "nmdose_db_flushed_rows_total" in (tmp_path / "nmdose.prom").read_text()
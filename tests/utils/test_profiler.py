@@ -0,0 +1,98 @@
+# tests/utils/test_profiler.py
+
+import json
+import threading
+import time
+
+from nmdose.dimse.backends import FindStream
+from nmdose.utils import profiler as profiler_mod
+from nmdose.utils.profiler import Profiler, activate, profiled, save_profile, span
+
+
+@profiled("db.helper")
+def db_helper():
+    time.sleep(0.002)
+    return "ok"
+
+
+def test_nested_spans_aggregate_by_path(tmp_path):
+    prof = Profiler("batch")
+    with activate(prof):
+        for _ in range(3):
+            with span("window"):
+                with span("cfind"):
+                    time.sleep(0.001)
+                assert db_helper() == "ok"
+
+    tree = prof.summary()
+    window = tree["children"][0]
+    assert window["name"] == "window" and window["calls"] == 3
+    assert {c["name"] for c in window["children"]} == {"cfind", "db.helper"}
+    assert window["value"] >= sum(c["total_ms"] for c in window["children"])
+    assert set(prof.stages()) == {"window", "window/cfind", "window/db.helper"}
+
+    data = json.loads(prof.dump(tmp_path).read_text(encoding="utf-8"))
+    assert data["name"] == "batch" and data["tree"]["children"][0]["name"] == "window"
+
+
+def test_spans_are_noop_without_active_profiler():
+    assert profiler_mod._active is None
+    with span("anything"):
+        pass
+    assert db_helper() == "ok"
+
+
+def test_worker_thread_spans_attach_to_root():
+    prof = Profiler("batch")
+    with activate(prof):
+        with span("window"):
+            worker = threading.Thread(target=lambda: _run_span("cmove"))
+            worker.start()
+            worker.join()
+    assert {c["name"] for c in prof.summary()["children"]} == {"window", "cmove"}
+
+
+def test_find_stream_excludes_consumer_wait_from_cfind_time():
+    def produce(stream):
+        time.sleep(0.01)
+        yield {"0020,000D": "1.2.1"}
+        yield {"0020,000D": "1.2.2"}
+        stream.status = "SUCCESS"
+
+    prof = Profiler("batch")
+    with activate(prof):
+        for _ in FindStream(produce, "T_FIND", "PT"):
+            time.sleep(0.05)   # C-MOVE back-pressure 로 feeder 가 다음 응답을 늦게 요청
+
+    cfind = prof.summary()["children"][0]
+    assert cfind["name"] == "cfind.stream" and cfind["calls"] == 1
+    assert 10 <= cfind["total_ms"] < 50
+
+
+def test_add_records_measured_time_under_current_span():
+    prof = Profiler("batch")
+    with activate(prof):
+        with span("window"):
+            profiler_mod.add_time("cfind.stream", 0.25)
+            profiler_mod.add_time("cfind.stream", 0.5)
+    node = prof.summary()["children"][0]["children"][0]
+    assert (node["name"], node["calls"], node["total_ms"], node["max_ms"]) == ("cfind.stream", 2, 750.0, 500.0)
+
+
+def _run_span(name):
+    with span(name):
+        time.sleep(0.001)
+
+
+def test_save_profile_inserts_one_aggregate_row(fake_conn):
+    prof = Profiler("find_move")
+    with activate(prof):
+        with span("window"):
+            pass
+    conn = fake_conn(fetchone=lambda: (7,))
+
+    assert save_profile(conn, prof) == 7
+    sql, params = conn.executed[-1]
+    assert "INSERT INTO profile_runs" in sql
+    assert params[0] == "find_move" and json.loads(params[3]) == {"window": prof.stages()["window"]}
+    assert conn.commits == 1
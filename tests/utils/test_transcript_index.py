@@ -0,0 +1,71 @@
+# tests/utils/test_transcript_index.py
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from nmdose.utils.transcript_index import (
+    TranscriptIndex, extract_status_lines, summarize_transcript,
+)
+
+MOVE_FAILED = """\
+I: Requesting Association
+I: Association Accepted (Max Send PDV: 16372)
+I: Sending Move Request (MsgID 1)
+I: Received Move Response 1 (Pending)
+E: Move Response with error status (Refused: Out of Resources - Unable to perform sub-operations)
+I: Status: 0xA702
+I: Releasing Association
+"""
+
+MOVE_OK = """\
+I: Requesting Association
+I: Received Move Response 1 (Pending)
+I: Received Final Move Response (Success)
+I: Releasing Association
+"""
+
+
+def test_only_status_lines_are_kept():
+    lines = extract_status_lines(MOVE_FAILED)
+    assert lines == [
+        "I: Received Move Response 1 (Pending)",
+        "E: Move Response with error status (Refused: Out of Resources - Unable to perform sub-operations)",
+        "I: Status: 0xA702",
+    ]
+
+
+def test_summary_prefers_error_line_and_appends_failure_code():
+    summary = summarize_transcript(MOVE_FAILED)
+    assert summary.startswith("E: Move Response with error status (Refused")
+    assert summary.endswith("[0xA702]")
+    assert summarize_transcript(MOVE_OK) == "I: Received Final Move Response (Success)"
+    assert summarize_transcript("") is None
+    assert len(summarize_transcript("E: " + "x" * 1000)) == 300
+
+
+def test_lookup_by_ids_and_full_text_search(tmp_path):
+    ts = datetime(2025, 1, 1, 2, 0)
+    with TranscriptIndex(tmp_path / "t.sqlite3") as index:
+        index.add("findscu", "no_uid", "I: Received Final Find Response (Success)", "SUCCESS",
+                  find_id=7, modality="PT", ts=ts)
+        index.add("movescu", "1.2.1", MOVE_OK, "SUCCESS", find_id=7, move_id=100, modality="PT", ts=ts)
+        index.add("movescu", "1.2.2", MOVE_FAILED, "FAILURE", find_id=7, move_id=101, modality="PT", ts=ts)
+
+    with TranscriptIndex(tmp_path / "t.sqlite3") as index:
+        assert [h.uid for h in index.by_find_id(7)] == ["no_uid", "1.2.1", "1.2.2"]
+        (hit,) = index.by_uid("1.2.2")
+        assert hit.move_id == 101 and hit.codes == "0xA702" and "Requesting" not in hit.body
+        assert index.by_move_id(100)[0].uid == "1.2.1"
+
+        assert [h.uid for h in index.search("refused")] == ["1.2.2"]
+        assert [h.uid for h in index.search("codes:0xA702", raw=True)] == ["1.2.2"]
+        assert [h.uid for h in index.search("status:SUCCESS", kind="movescu", raw=True)] == ["1.2.1"]
+
+        # 기본은 구(phrase) 검색: FTS5 연산자 문자가 섞인 입력도 오류 없이 검색
+        assert [h.uid for h in index.search("E: Move Response")] == ["1.2.2"]
+        assert [h.uid for h in index.search("Status: 0xA702")] == ["1.2.2"]
+        assert index.search("C-MOVE-RSP") == [] and index.search('say "x" status=0xA701') == []
+        with pytest.raises(sqlite3.OperationalError):
+            index.search("C-MOVE-RSP", raw=True)